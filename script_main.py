@@ -5,18 +5,65 @@ It handles dynamic web elements and mimics human behavior to avoid bot detection
 Utilizes Selenium for web automation and PyAutoGUI for OS-level interactions.
 """
 
+from __future__ import annotations
+
 import os
+import sys
 import time
 import csv
 import subprocess
 import logging
 import random
-import pyautogui
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import sqlite3
+import hashlib
+import json
+import queue
+import threading
+import argparse
+import select
+import struct
+import re
+import html
+import tempfile
+import shutil
+import weakref
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from contextlib import contextmanager
+import contextvars
+from urllib.parse import urljoin, urlparse, unquote
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows locks the run lock file with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+# Selenium is imported by load_browser_modules() the first time a browser is started, and
+# PyAutoGUI, requests and cryptography where they are used, so commands that never open a
+# browser start in milliseconds and work without a display.
+webdriver = By = None
+
+class TimeoutException(Exception):
+    """
+    Raised by waits that time out before Selenium is loaded. load_browser_modules() replaces
+    it with Selenium's, so except clauses naming it work before and after.
+    """
+
+class WebDriverException(Exception):
+    """
+    Stands in for Selenium's base exception until load_browser_modules() replaces it. Nothing
+    raises it, it only keeps except clauses naming it valid before a browser is started.
+    """
+
+if TYPE_CHECKING:  # Only for annotations, the optional packages are imported where they are used
+    import http.client
+    import requests
+    from cryptography.fernet import Fernet
 
 
 """You can find your IMDb User ID by logging in to your IMDb account, navigating to your profile page, and then copying the string of characters from the URL. 
@@ -33,6 +80,16 @@ LETTERBOXD_PASSWORD = "your_letterboxd_password"  # Your Letterboxd login passwo
 IMDB_USER_ID = "your_imdb_user_id"  # Your IMDb user ID, found on your profile page URL.
 DOWNLOAD_DIR = r"downloads"  # The directory where downloaded files will be saved. Relative or absolute path.
 HEADLESS_MODE = True  # Set to True to run the browser in the background, False to see the browser window.
+IMDB_BASE_URL = "https://www.imdb.com"  # Site root of IMDb. Only changed to run against the local stand-in sites.
+LETTERBOXD_BASE_URL = "https://letterboxd.com"  # Site root of Letterboxd. Only changed to run against the local stand-in sites.
+
+# Browser Startup Configuration
+RESOURCE_BLOCKING = True  # Set to True to stop Firefox loading images, web fonts, media and prefetches that the automation does not need.
+PROFILE_TEMPLATE_DIR = r"profile_template"  # Prebuilt Firefox profile copied by every run (create it with the build-profile command), or None.
+BROWSER_DAEMON_PORT = None  # Marionette port of a warm browser started with the browser-daemon command. Runs attach to it instead of starting Firefox.
+BROWSER_DAEMON_PROFILE_DIR = r"browser_daemon_profile"  # Profile kept by the browser daemon between runs.
+FIREFOX_BINARY = "firefox"  # Firefox executable started by the browser daemon.
+OVERLAP_LETTERBOXD_LOGIN = False  # Set to True to log in to Letterboxd in a second browser while IMDb prepares the export.
 
 # Scheduled Task Configuration (Windows Only)
 TASK_NAME = "IMDb_to_Letterboxd_Task"  # The name of the scheduled task in Windows Task Scheduler.
@@ -40,20 +97,617 @@ PYTHON_EXECUTABLE = r"C:\Path\To\Your\python.exe"  # The full path to your Pytho
 SCRIPT_PATH = r"C:\Path\To\Your\Script.py"  # The full path to this Python script.
 SCHEDULED_TIME = "10:00"  # The time of day to run the scheduled task (in 24-hour format, e.g., "14:30").
 
+# In-Process Scheduler Configuration (any platform, replaces the scheduled task)
+SCHEDULE_CRON = "0 10 * * *"  # When the schedule command runs the sync, as a cron expression in local time (minute hour day month weekday).
+SCHEDULE_JITTER = 600  # Maximum random delay in seconds added to each scheduled start.
+SCHEDULER_LOCK_PATH = r"sync.lock"  # Lock file that keeps two syncs from running at the same time.
+
+# Incremental Sync Configuration
+INCREMENTAL_SYNC = True  # Set to True to upload only ratings that were added or changed since the last successful import.
+STATE_DB_PATH = r"sync_state.db"  # SQLite file that remembers which ratings have already been imported to Letterboxd.
+
+# Match Cache Configuration
+MATCH_CACHE_PATH = r"match_cache.db"  # SQLite cache of Letterboxd match results by IMDb id, shared by all accounts. None disables the preflight.
+MATCH_CACHE_MAX_AGE = 30 * 86400  # Seconds a title stays known as unmatchable before it is offered to Letterboxd again.
+UNMATCHED_REPORT_PATH = r"unmatched_titles.csv"  # Titles the preflight held back because Letterboxd could not match them before.
+
+# Session Cache Configuration
+SESSION_CACHE_DIR = r"session_cache"  # Directory for encrypted login cookies, reused until they expire. Set to None to always log in.
+SESSION_CACHE_KEY_ENV = "IMDB_LETTERBOXD_SESSION_KEY"  # Environment variable holding the encryption key. If unset, a key file is created in SESSION_CACHE_DIR.
+
+# Export Polling Configuration
+EXPORT_POLL_STRATEGY = "adaptive"  # "adaptive" backs off based on how long past exports took, "fixed" checks every 10-15 seconds.
+EXPORT_POLL_TIMEOUT = 600  # Maximum time in seconds to wait for IMDb to prepare the export.
+EXPORT_HISTORY_PATH = r"export_history.json"  # File recording how long past exports took to become ready.
+HTTP_FAST_PATH = False  # Set to True to check and download the export over HTTP with the browser's cookies instead of through Firefox. Requires the requests package.
+
+# Multi-List Configuration
+IMDB_EXTRA_LISTS = ()  # IMDb lists exported in the same session as the ratings: "watchlist" and/or list ids such as "ls012345678".
+LETTERBOXD_IMPORT_PATHS = {"ratings": "/import/", "watchlist": "/watchlist/import/", "list": "/list/import/"}  # Letterboxd importer for each kind of IMDb list.
+
+# Upload Normalization Configuration
+NORMALIZE_UPLOAD = True  # Set to True to drop TV series, episodes, video games, duplicates and malformed rows before uploading.
+ALLOWED_TITLE_TYPES = ("Movie", "TV Movie", "Short", "Video", "TV Special", "TV Short")  # IMDb title types kept for Letterboxd.
+LETTERBOXD_CSV_FORMAT = True  # Set to True to upload in Letterboxd's own import columns (imdbID, Title, Year, Rating10, WatchedDate) instead of IMDb's.
+
+# Import Timeout Configuration
+IMPORT_THROUGHPUT_PATH = r"import_throughput.json"  # Observed Letterboxd matching and saving durations by row count, used to size the import timeouts.
+IMPORT_DEFAULT_ROWS_PER_SECOND = 20  # Assumed matching and saving speed until a speed has been observed.
+IMPORT_TIMEOUT_MARGIN = 3  # Matching and saving may take this many times longer than the observed speed predicts.
+IMPORT_TIMEOUT_MIN = 60  # Shortest matching or saving timeout in seconds, covering the page's own overhead on small uploads.
+IMPORT_STALL_TIMEOUT = 45  # Seconds the import page may show no progress, once the expected time has passed, before the wait gives up early.
+
+# Chunked Import Configuration
+IMPORT_CHUNK_SIZE = 0  # Upload at most this many ratings per Letterboxd import. 0 uploads the whole file at once.
+IMPORT_PROGRESS_PATH = r"import_progress.json"  # Records imported chunks so a failed run only retries the chunks that did not finish.
+
+# Pacing Configuration
+HUMANIZATION_BUDGET = 60  # Maximum total seconds of deliberate human-like pauses per run, or None for no limit.
+HUMANIZATION_DISTRIBUTION = "triangular"  # "triangular" favours short pauses, "uniform" spreads them evenly over each pause's range.
+
+# Checkpoint Configuration
+CHECKPOINT_PATH = r"run_checkpoint.json"  # Records finished pipeline stages so the resume command can continue a failed run. None deletes the files of failed runs instead.
+CHECKPOINT_MAX_AGE = 6 * 3600  # Seconds a checkpointed export or file stays fresh enough to be reused by the resume command.
+
+# Metrics Configuration
+METRICS_REPORT_PATH = r"run_report.json"  # JSON report of the time spent in each stage of the last run, or None to disable.
+PROMETHEUS_TEXTFILE_PATH = None  # Path of a Prometheus textfile (e.g. in node_exporter's textfile directory) to write run metrics to, or None.
+
+# Multi-Account Configuration
+ACCOUNTS_MANIFEST = None  # Path to a JSON file listing several accounts to sync in one batch, or None for the single account above.
+DRIVER_POOL_SIZE = 2  # Number of Firefox instances kept open and reused across accounts in batch mode.
+
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+@dataclass
+class AccountConfig:
+    """
+    Credentials and per-account settings for one IMDb/Letterboxd account pair.
+
+    Attributes:
+        name: A short label used in logs and batch reports.
+        imdb_email: IMDb login email address.
+        imdb_password: IMDb login password.
+        letterboxd_email: Letterboxd login email address.
+        letterboxd_password: Letterboxd login password.
+        imdb_user_id: IMDb user ID, found on the profile page URL.
+        download_dir: Directory the browser downloads the export into.
+        state_db_path: SQLite file remembering this account's imported ratings.
+        extra_lists: IMDb lists exported and imported along with the ratings ("watchlist" or list ids).
+    """
+    name: str
+    imdb_email: str
+    imdb_password: str
+    letterboxd_email: str
+    letterboxd_password: str
+    imdb_user_id: str
+    download_dir: str = DOWNLOAD_DIR
+    state_db_path: str = STATE_DB_PATH
+    extra_lists: tuple = IMDB_EXTRA_LISTS
+
+def default_account() -> AccountConfig:
+    """
+    Build the account described by the Configuration Section.
+
+    Returns:
+        The AccountConfig for the single configured account.
+    """
+    return AccountConfig(
+        name="default",
+        imdb_email=IMDB_EMAIL,
+        imdb_password=IMDB_PASSWORD,
+        letterboxd_email=LETTERBOXD_EMAIL,
+        letterboxd_password=LETTERBOXD_PASSWORD,
+        imdb_user_id=IMDB_USER_ID,
+        download_dir=DOWNLOAD_DIR,
+        state_db_path=STATE_DB_PATH,
+        extra_lists=IMDB_EXTRA_LISTS,
+    )
+
+# Run Metrics
+class RunMetrics:
+    """
+    Per-stage timings of one sync run.
+
+    Every stage records its total wall time and, separately, the time spent in deliberate
+    humanization pauses (random delays, scrolls and clicks) inside it. The rest is time spent
+    waiting for the sites or doing work. Stages can be nested, nested names are joined with "/".
+    Stages opened on different threads run side by side and do not nest.
+    """
+
+    def __init__(self, account_name: str):
+        """
+        Args:
+            account_name: The account the run belongs to.
+        """
+        self.account_name = account_name
+        self.started_at = time.time()
+        self.stages = []
+        self.humanization_seconds = 0.0
+        self.success = None
+        self.waits = None  # Summary of the run's WaitEngine, added when the run ends
+        self.navigations = []
+        self.locators = {}  # Lookup counts and timings by locator name
+        self._start = time.perf_counter()
+        self._open_stages = {}  # Open stages by thread id
+        self._lock = threading.Lock()
+
+    def _thread_stages(self) -> list:
+        """
+        Get the stages open on the calling thread, outermost first.
+
+        Returns:
+            The list of open stage entries.
+        """
+        return self._open_stages.setdefault(threading.get_ident(), [])
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a stage of the run. The stage counts as failed if it raises.
+
+        Args:
+            name: The stage name.
+        """
+        open_stages = self._thread_stages()
+        entry = {
+            "name": "/".join([open_stage["name"] for open_stage in open_stages] + [name]),
+            "start": time.perf_counter(),
+            "humanization": 0.0,
+        }
+        open_stages.append(entry)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            open_stages.remove(entry)
+            seconds = time.perf_counter() - entry["start"]
+            self.stages.append({
+                "name": entry["name"],
+                "seconds": round(seconds, 3),
+                "site_seconds": round(seconds - entry["humanization"], 3),
+                "humanization_seconds": round(entry["humanization"], 3),
+                "success": success,
+            })
+
+    def add_humanization(self, seconds: float) -> None:
+        """
+        Attribute a deliberate pause to the run and to every stage open on the calling thread.
+
+        Args:
+            seconds: Length of the pause.
+        """
+        self.humanization_seconds += seconds
+        for entry in self._thread_stages():
+            entry["humanization"] += seconds
+
+    def add_navigation(self, navigation: dict) -> None:
+        """
+        Record a page load of the run.
+
+        Args:
+            navigation: The URL, wall time, load time, transferred bytes and resource count of the page load.
+        """
+        self.navigations.append(navigation)
+
+    def add_locator_lookup(self, name: str, selectors: tuple, hit: int or None, seconds: float, queries: list, waited: bool = True) -> None:
+        """
+        Record a lookup of a page element.
+
+        Args:
+            name: The locator name.
+            selectors: The locator's selectors, in the order they were tried.
+            hit: Index of the selector that found the element, or None if none did.
+            seconds: Wall time of the lookup, including waiting for the element to appear.
+            queries: [count, seconds] of the queries run for each selector.
+            waited: False for a single check, where a miss is an answer rather than a failure.
+        """
+        with self._lock:
+            entry = self.locators.setdefault(name, {
+                "lookups": 0, "found": 0, "timeouts": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "selectors": [{"selector": " | ".join(map(str, selector)), "hits": 0, "queries": 0, "query_seconds": 0.0} for selector in selectors],
+            })
+            entry["lookups"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            if hit is not None:
+                entry["found"] += 1
+                entry["selectors"][hit]["hits"] += 1
+            elif waited:
+                entry["timeouts"] += 1
+            for selector_entry, (count, query_seconds) in zip(entry["selectors"], queries):
+                selector_entry["queries"] += count
+                selector_entry["query_seconds"] += query_seconds
+
+    def locator_report(self) -> dict:
+        """
+        Summarize the element lookups of the run.
+
+        Returns:
+            A JSON-serializable dict by locator name, with the hit rate, the lookups that only
+            a fallback selector answered, and the lookup and per-query latencies.
+        """
+        report = {}
+        for name, entry in sorted(self.locators.items()):
+            report[name] = {
+                "lookups": entry["lookups"],
+                "hit_rate": round(entry["found"] / entry["lookups"], 3),
+                "fallback_hits": entry["found"] - entry["selectors"][0]["hits"],
+                "timeouts": entry["timeouts"],
+                "mean_ms": round(entry["seconds"] / entry["lookups"] * 1000, 1),
+                "max_ms": round(entry["max_seconds"] * 1000, 1),
+                "selectors": [{
+                    "selector": selector["selector"],
+                    "hits": selector["hits"],
+                    "queries": selector["queries"],
+                    "mean_query_ms": round(selector["query_seconds"] / selector["queries"] * 1000, 2) if selector["queries"] else None,
+                } for selector in entry["selectors"]],
+            }
+        return report
+
+    def report(self) -> dict:
+        """
+        Build the machine-readable run report.
+
+        Returns:
+            A JSON-serializable dict.
+        """
+        total = time.perf_counter() - self._start
+        return {
+            "account": self.account_name,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+            "success": self.success,
+            "total_seconds": round(total, 3),
+            "site_seconds": round(total - self.humanization_seconds, 3),
+            "humanization_seconds": round(self.humanization_seconds, 3),
+            "waits": self.waits,
+            "page_bytes": sum(navigation["bytes"] for navigation in self.navigations),
+            "page_load_seconds": round(sum(navigation["seconds"] for navigation in self.navigations), 3),
+            "stages": self.stages,
+            "navigations": self.navigations,
+            "locators": self.locator_report(),
+        }
+
+    def write_json(self, path: str) -> None:
+        """
+        Write the run report as JSON.
+
+        Args:
+            path: The report file.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write the run metrics in the Prometheus text exposition format.
+
+        The file is replaced atomically so a collector never reads a partial file.
+
+        Args:
+            path: The textfile to write.
+        """
+        report = self.report()
+        account = self.account_name.replace('\\', '\\\\').replace('"', '\\"')
+        lines = [
+            "# HELP imdb_letterboxd_run_success Whether the last sync run succeeded.",
+            "# TYPE imdb_letterboxd_run_success gauge",
+            f'imdb_letterboxd_run_success{{account="{account}"}} {int(bool(report["success"]))}',
+            "# HELP imdb_letterboxd_run_timestamp_seconds Start time of the last sync run.",
+            "# TYPE imdb_letterboxd_run_timestamp_seconds gauge",
+            f'imdb_letterboxd_run_timestamp_seconds{{account="{account}"}} {self.started_at:.0f}',
+            "# HELP imdb_letterboxd_run_seconds Wall time of the last sync run.",
+            "# TYPE imdb_letterboxd_run_seconds gauge",
+            f'imdb_letterboxd_run_seconds{{account="{account}",kind="total"}} {report["total_seconds"]}',
+            f'imdb_letterboxd_run_seconds{{account="{account}",kind="site"}} {report["site_seconds"]}',
+            f'imdb_letterboxd_run_seconds{{account="{account}",kind="humanization"}} {report["humanization_seconds"]}',
+            "# HELP imdb_letterboxd_page_bytes Bytes transferred by the page loads of the last sync run.",
+            "# TYPE imdb_letterboxd_page_bytes gauge",
+            f'imdb_letterboxd_page_bytes{{account="{account}"}} {report["page_bytes"]}',
+            "# HELP imdb_letterboxd_page_loads Number of page loads of the last sync run.",
+            "# TYPE imdb_letterboxd_page_loads gauge",
+            f'imdb_letterboxd_page_loads{{account="{account}"}} {len(report["navigations"])}',
+            "# HELP imdb_letterboxd_stage_seconds Wall time of each stage of the last sync run.",
+            "# TYPE imdb_letterboxd_stage_seconds gauge",
+        ]
+        for stage in report["stages"]:
+            for kind in ("site", "humanization"):
+                lines.append(
+                    f'imdb_letterboxd_stage_seconds{{account="{account}",stage="{stage["name"]}",kind="{kind}"}} '
+                    f'{stage[kind + "_seconds"]}'
+                )
+        for metric, key, description in (
+            ("locator_hit_ratio", "hit_rate", "Share of element lookups that found the element"),
+            ("locator_fallback_hits", "fallback_hits", "Element lookups only a fallback selector answered"),
+            ("locator_lookup_seconds", "mean_ms", "Mean wall time of the element lookups"),
+        ):
+            lines.append(f"# HELP imdb_letterboxd_{metric} {description} in the last sync run.")
+            lines.append(f"# TYPE imdb_letterboxd_{metric} gauge")
+            for name, locator in report["locators"].items():
+                value = round(locator[key] / 1000, 4) if key == "mean_ms" else locator[key]
+                lines.append(f'imdb_letterboxd_{metric}{{account="{account}",locator="{name}"}} {value}')
+
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+
+    def log_summary(self) -> None:
+        """
+        Log where the run's time went.
+        """
+        report = self.report()
+        logging.info(
+            f"Run took {report['total_seconds']:.1f}s: {report['site_seconds']:.1f}s waiting for the sites or working, "
+            f"{report['humanization_seconds']:.1f}s in humanization pauses."
+        )
+        if self.waits and self.waits.get("sleeps"):
+            logging.info(f"{self.waits['sleep_seconds']:.1f}s went to {self.waits['sleeps']} timed sleeps, such as the export back-off.")
+        if self.waits and self.waits["humanization_skipped_seconds"] > 0:
+            logging.info(
+                f"Humanization budget of {self.waits['humanization_budget']}s saved "
+                f"{self.waits['humanization_skipped_seconds']:.1f}s of pauses."
+            )
+        if report["navigations"]:
+            logging.info(
+                f"{len(report['navigations'])} page loads transferred {report['page_bytes'] / 1024:.0f} KiB "
+                f"and took {report['page_load_seconds']:.1f}s."
+            )
+        for stage in report["stages"]:
+            logging.info(
+                f"  {stage['name']}: {stage['seconds']:.1f}s "
+                f"({stage['humanization_seconds']:.1f}s humanization){'' if stage['success'] else ' FAILED'}"
+            )
+        for name, locator in report["locators"].items():
+            if locator["fallback_hits"] or locator["timeouts"]:
+                logging.warning(
+                    f"Locator '{name}': {locator['fallback_hits']} lookups needed a fallback selector and "
+                    f"{locator['timeouts']} timed out, its first selector may be out of date."
+                )
+
+current_metrics = contextvars.ContextVar("current_metrics", default=None)  # Metrics of the run on this thread
+
+@contextmanager
+def timed_stage(name: str):
+    """
+    Time a stage in the current run's metrics, if a run is being measured.
+
+    Args:
+        name: The stage name.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+    else:
+        with metrics.stage(name):
+            yield
+
+def record_humanization(seconds: float) -> None:
+    """
+    Attribute a deliberate pause to the current run's metrics, if a run is being measured.
+
+    Args:
+        seconds: Length of the pause.
+    """
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.add_humanization(seconds)
+
+def metrics_path_for(path: str, account_name: str) -> str:
+    """
+    Get the metrics file for an account. Accounts other than the default one get their own file.
+
+    Args:
+        path: The configured metrics file.
+        account_name: The account the metrics belong to.
+
+    Returns:
+        The metrics file path for the account.
+    """
+    if account_name == "default":
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}_{account_name}{extension}"
+
+def write_run_reports(metrics: RunMetrics) -> None:
+    """
+    Log the run summary and write the configured JSON and Prometheus reports.
+
+    Args:
+        metrics: The finished run's metrics.
+    """
+    metrics.log_summary()
+    try:
+        if METRICS_REPORT_PATH:
+            metrics.write_json(metrics_path_for(METRICS_REPORT_PATH, metrics.account_name))
+        if PROMETHEUS_TEXTFILE_PATH:
+            metrics.write_prometheus(metrics_path_for(PROMETHEUS_TEXTFILE_PATH, metrics.account_name))
+    except OSError as e:
+        logging.error(f"Error writing run report: {e}")
+
+# Wait Engine
+class WaitEngine:
+    """
+    Central place for every deliberate pause and condition wait of a run.
+
+    Human-like pauses are drawn from HUMANIZATION_DISTRIBUTION and stop once the run's
+    humanization budget is used up, so the pacing cannot dominate the run time. Waits for
+    the page or the file system poll an explicit condition instead of sleeping blindly.
+    The few timed sleeps left, such as the back-off between export checks, still go
+    through the engine so they show up in its report.
+    """
+
+    def __init__(self, budget: float = HUMANIZATION_BUDGET, distribution: str = HUMANIZATION_DISTRIBUTION):
+        """
+        Args:
+            budget: Maximum total seconds of human-like pauses, or None for no limit.
+            distribution: "triangular" or "uniform".
+        """
+        self.budget = budget
+        self.distribution = distribution
+        self.requested_seconds = 0.0
+        self.paused_seconds = 0.0
+        self.pauses = 0
+        self.condition_seconds = 0.0
+        self.conditions = 0
+        self.sleep_seconds = 0.0
+        self.sleeps = 0
+        self._lock = threading.Lock()  # The Letterboxd login can pause on a second thread
+
+    def draw(self, min_delay: float, max_delay: float) -> float:
+        """
+        Draw a pause length from the configured distribution.
+
+        Args:
+            min_delay: The shortest pause in seconds.
+            max_delay: The longest pause in seconds.
+
+        Returns:
+            The pause length in seconds.
+        """
+        if self.distribution == "uniform":
+            return random.uniform(min_delay, max_delay)
+        return random.triangular(min_delay, max_delay, min_delay)
+
+    def pause(self, min_delay: float, max_delay: float) -> float:
+        """
+        Pause like a human would, within what is left of the budget.
+
+        Args:
+            min_delay: The shortest pause in seconds.
+            max_delay: The longest pause in seconds.
+
+        Returns:
+            The seconds actually paused.
+        """
+        delay = self.draw(min_delay, max_delay)
+        with self._lock:
+            self.requested_seconds += delay
+            if self.budget is not None:
+                delay = max(0.0, min(delay, self.budget - self.paused_seconds))
+            if delay > 0:
+                # Reserve the pause before sleeping so concurrent pauses cannot overrun the budget
+                self.paused_seconds += delay
+                self.pauses += 1
+        if delay > 0:
+            time.sleep(delay)
+            record_humanization(delay)
+        return delay
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Sleep for a set time that is not a humanization pause, such as a polling back-off.
+
+        Args:
+            seconds: How long to sleep.
+        """
+        if seconds <= 0:
+            return
+        start_time = time.perf_counter()
+        try:
+            time.sleep(seconds)
+        finally:
+            with self._lock:
+                self.sleep_seconds += time.perf_counter() - start_time
+                self.sleeps += 1
+
+    def until(self, condition, timeout: float, poll_interval: float = 0.2, message: str = ""):
+        """
+        Wait until a condition holds.
+
+        Args:
+            condition: Callable returning a truthy value once the wait is over. Exceptions count as not ready.
+            timeout: Maximum time to wait in seconds.
+            poll_interval: Seconds between checks.
+            message: Text of the TimeoutException.
+
+        Returns:
+            The condition's truthy result.
+
+        Raises:
+            TimeoutException: If the condition does not hold within the timeout.
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + timeout
+        try:
+            while True:
+                try:
+                    result = condition()
+                except WebDriverException:
+                    result = None
+                if result:
+                    return result
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutException(message or f"Condition not met within {timeout}s")
+                time.sleep(min(poll_interval, remaining))
+        finally:
+            with self._lock:
+                self.condition_seconds += time.perf_counter() - start_time
+                self.conditions += 1
+
+    def report(self) -> dict:
+        """
+        Summarize the time spent pausing and waiting.
+
+        Returns:
+            A JSON-serializable dict.
+        """
+        return {
+            "humanization_budget": self.budget,
+            "humanization_requested_seconds": round(self.requested_seconds, 3),
+            "humanization_seconds": round(self.paused_seconds, 3),
+            "humanization_skipped_seconds": round(self.requested_seconds - self.paused_seconds, 3),
+            "pauses": self.pauses,
+            "condition_wait_seconds": round(self.condition_seconds, 3),
+            "condition_waits": self.conditions,
+            "sleep_seconds": round(self.sleep_seconds, 3),
+            "sleeps": self.sleeps,
+        }
+
+current_wait_engine = contextvars.ContextVar("current_wait_engine", default=None)  # Wait engine of the run on this thread
+
+def wait_engine() -> WaitEngine:
+    """
+    Get the current run's wait engine, or an unlimited one outside of a run.
+
+    Returns:
+        A WaitEngine instance.
+    """
+    engine = current_wait_engine.get()
+    if engine is None:
+        engine = WaitEngine(budget=None)
+        current_wait_engine.set(engine)
+    return engine
+
 # Helper Functions
+def load_browser_modules() -> None:
+    """
+    Import Selenium into the module namespace, once.
+    """
+    global webdriver, By, TimeoutException, WebDriverException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as selenium_webdriver
+    from selenium.webdriver.common.by import By as selenium_by
+    from selenium.common import exceptions as selenium_exceptions
+
+    By = selenium_by
+    TimeoutException = selenium_exceptions.TimeoutException
+    WebDriverException = selenium_exceptions.WebDriverException
+    webdriver = selenium_webdriver  # Set last, it marks the modules as loaded
+
 def random_delay(min_delay: int = 2, max_delay: int = 5) -> None:
     """
-    Introduce random delays to mimic human behavior.
+    Introduce random delays to mimic human behavior, within the run's humanization budget.
 
     Args:
         min_delay: The minimum delay in seconds.
         max_delay: The maximum delay in seconds.
     """
-    delay = random.uniform(min_delay, max_delay)
-    time.sleep(delay)
+    wait_engine().pause(min_delay, max_delay)
 
 def random_scroll(driver: webdriver.Firefox) -> None:
     """
@@ -86,500 +740,3778 @@ def random_clicks(driver: webdriver.Firefox) -> None:
         except Exception as e:
             logging.error(f"Error during random click: {e}")
 
-def setup_driver() -> webdriver.Firefox:
+NAVIGATION_TIMING_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    document_bytes: navigation ? navigation.transferSize : 0,
+    resource_bytes: resources.reduce((total, resource) => total + (resource.transferSize || 0), 0),
+    resources: resources.length,
+    load_ms: navigation && navigation.loadEventEnd ? navigation.loadEventEnd - navigation.startTime : null,
+};
+"""
+
+def navigate(driver: webdriver.Firefox, url: str = None) -> None:
     """
-    Setup Selenium WebDriver (Firefox) with specified options and extensions.
+    Open a page, or reload the current one, and record its weight and load time in the run's metrics.
 
-    Returns:
-        The configured Firefox WebDriver instance.
+    Byte counts come from the Resource Timing API. Cross-origin resources that do not send
+    Timing-Allow-Origin count as 0 bytes, so the totals are a lower bound on the real sites.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        url: The page to open, or None to reload the current page.
     """
-    extension_path = 'ublock_origin-1.61.2.xpi'  # Path to the uBlock Origin extension.
-    options = webdriver.FirefoxOptions()
-    profile = webdriver.FirefoxProfile()
+    start_time = time.perf_counter()
+    if url is None:
+        driver.refresh()
+    else:
+        driver.get(url)
+    seconds = time.perf_counter() - start_time
 
-    if HEADLESS_MODE:
-        options.add_argument("--headless")
+    metrics = current_metrics.get()
+    if metrics is None:
+        return
+    try:
+        timing = driver.execute_script(NAVIGATION_TIMING_SCRIPT) or {}
+    except WebDriverException:
+        timing = {}
+    metrics.add_navigation({
+        "url": driver.current_url if url is None else url,
+        "seconds": round(seconds, 3),
+        "load_ms": timing.get("load_ms"),
+        "bytes": (timing.get("document_bytes") or 0) + (timing.get("resource_bytes") or 0),
+        "resources": timing.get("resources", 0),
+    })
 
-    # Configure download preferences to avoid prompts
-    profile.set_preference("browser.download.folderList", 2)  # Use custom download directory
-    profile.set_preference("browser.download.manager.showWhenStarting", False)  # Don't show download manager
-    profile.set_preference("browser.download.dir", os.path.abspath(DOWNLOAD_DIR))  # Set download directory
-    profile.set_preference("browser.helperApps.neverAsk.saveToDisk", "text/csv")  # Auto-save CSV files
-    options.profile = profile
-    driver = webdriver.Firefox(options=options)
-    driver.install_addon(extension_path, temporary=True)  # Install uBlock Origin
-    return driver
+STATE_FILE_LOCK = threading.Lock()  # Guards the JSON state files that batch accounts share
 
-def login_to_imdb(driver: webdriver.Firefox) -> bool:
+def update_state_file(path: str, update) -> None:
     """
-    Log in to IMDb using the provided credentials.
+    Change a JSON state file shared by all accounts.
+
+    The file is read, changed and written back under STATE_FILE_LOCK, through a temp file
+    of this writer's own, so accounts synced in parallel do not lose each other's entries.
 
     Args:
-        driver: The Selenium WebDriver instance.
+        path: The JSON file, holding an object.
+        update: Callable receiving the file's dict and changing it in place.
 
-    Returns:
-        True if login is successful, False otherwise.
+    Raises:
+        OSError: If the file cannot be written.
     """
-    logging.info("Navigating to IMDb login page...")
-    driver.get("https://www.imdb.com/registration/signin")
-    random_delay()
-
-    try:
-        # Find and click the IMDb sign-in button
-        signin_imdb_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CLASS_NAME, "list-group-item"))
-        )
-        signin_imdb_button.click()
-        random_delay()
+    with STATE_FILE_LOCK:
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                data = {}
+        except (OSError, ValueError):
+            data = {}
 
-        # Enter email
-        email_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "ap_email"))
-        )
-        email_input.send_keys(IMDB_EMAIL)
-        random_delay()
+        update(data)
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
 
-        # Enter password
-        password_input = driver.find_element(By.ID, "ap_password")
-        password_input.send_keys(IMDB_PASSWORD)
-        random_delay()
+# Page Locators
+# Every element the automation looks for, with its selectors in the order they are tried.
+# Each selector is a (strategy, selector) pair using Selenium's By values, so the table does
+# not need Selenium to be imported. A CSS selector may add a text the element must contain,
+# which is checked in the page in one call. Fast, scoped CSS and ID lookups come first and the
+# old whole-page XPath scans are only a fallback, so a page change shows up as fallback hits
+# in the run report before it breaks the run.
+LOCATORS = {
+    "imdb_signin_choice": (("css selector", "a.list-group-item", "IMDb"), ("class name", "list-group-item")),
+    "imdb_email": (("id", "ap_email"),),
+    "imdb_password": (("id", "ap_password"),),
+    "imdb_signin_submit": (("id", "signInSubmit"),),
+    # Shown instead of a redirect for a wrong password, a captcha or a verification prompt
+    "imdb_signin_problem": (("id", "auth-error-message-box"), ("id", "auth-warning-message-box")),
+    "imdb_list_title": (("css selector", "h1.ipc-title__text"), ("css selector", "h1")),
+    "imdb_export_button": (("css selector", "button span", "Export"), ("xpath", "//span[contains(text(),'Export')]")),
+    "imdb_exports_list": (("css selector", 'div[data-testid="list-page-mc-list-content"]'),),
+    "imdb_export_items": (("css selector", 'li[data-testid="user-ll-item"]'),),
+    "imdb_export_ready": (("css selector", 'button[data-testid="export-status-button"].READY'),),
+    "letterboxd_username": (("id", "field-username"),),
+    "letterboxd_password": (("id", "field-password"),),
+    "letterboxd_submit": (("css selector", "form button[type='submit']"), ("xpath", "//button[@type='submit']")),
+    "letterboxd_login_error": (("css selector", ".form-error"), ("css selector", ".jnotify-message"), ("css selector", ".error-message")),
+    "letterboxd_settings_title": (
+        ("css selector", "h1.title-hero", "Account Settings"),
+        ("xpath", "//h1[@class='title-hero -textleft js-hide-in-app' and text()='Account Settings']"),
+    ),
+    # The Continue button only has hashed CSS module classes, which change with every deploy
+    "letterboxd_continue": (("css selector", "#interstitial button", "Continue"), ("css selector", "button", "Continue")),
+    "letterboxd_select_file": (("css selector", 'a[href="#imdb-import"]'), ("xpath", "//a[contains(@href, '#imdb-import')]")),
+    "letterboxd_file_input": (("css selector", "#imdb-import input[type='file']"), ("css selector", "input[type='file']")),
+    "letterboxd_matching_complete": (
+        ("css selector", "#import-status strong", "Matching complete"),
+        ("xpath", "//strong[contains(text(), 'Matching complete')]"),
+    ),
+    "letterboxd_import_films": (
+        ("css selector", "#import-films"),
+        ("css selector", "#import-status a", "Import Films"),
+        ("xpath", "//a[contains(text(), 'Import Films')]"),
+    ),
+    "letterboxd_saved": (("css selector", "#import-status strong", "Saved"), ("xpath", "//strong[contains(text(), 'Saved')]")),
+    # One row per uploaded title once matching is complete, with a film link unless it went unmatched
+    "letterboxd_match_rows": (
+        ("css selector", ".import-table tr.import-film"),
+        ("css selector", ".import-table tbody tr"),
+        ("css selector", "[data-imdb-id]"),
+    ),
+}
 
-        # Submit login form
-        signin_submit_button = driver.find_element(By.ID, "signInSubmit")
-        signin_submit_button.click()
-        random_delay()
-        logging.info("Logged in to IMDb successfully.")
-        return True
-    except TimeoutException:
-        logging.error("Login to IMDb failed: Could not find login elements.")
-        return False
+FIND_BY_TEXT_SCRIPT = """
+const root = arguments[0] || document;
+return Array.from(root.querySelectorAll(arguments[1])).filter(element => element.textContent.includes(arguments[2]));
+"""
 
-def navigate_to_imdb_ratings(driver: webdriver.Firefox) -> None:
+def query_selector(root, selector: tuple) -> list:
     """
-    Navigate to the user ratings page on IMDb.
+    Run one selector of a locator.
 
     Args:
-        driver: The Selenium WebDriver instance.
+        root: The driver, or an element to search inside.
+        selector: A (strategy, selector) or (strategy, CSS selector, text) tuple.
+
+    Returns:
+        The matching elements.
     """
-    ratings_url = f"https://www.imdb.com/user/{IMDB_USER_ID}/ratings/"
-    logging.info(f"Navigating to IMDb ratings page: {ratings_url}")
-    driver.get(ratings_url)
-    random_delay()
+    if len(selector) == 2:
+        return root.find_elements(selector[0], selector[1])
+    if hasattr(root, "execute_script"):
+        return root.execute_script(FIND_BY_TEXT_SCRIPT, None, selector[1], selector[2]) or []
+    return root.parent.execute_script(FIND_BY_TEXT_SCRIPT, root, selector[1], selector[2]) or []  # An element's parent is its driver
 
-def initiate_imdb_export(driver: webdriver.Firefox) -> bool:
+def race_states(root, candidates: list, timeout: float, clickable: bool = False, poll_interval: float = 0.5, on_miss=None) -> tuple:
     """
-    Initiate the export of IMDb ratings.
+    Check several alternative page states on every poll and return the first one reached.
+
+    Each lookup is recorded in the run's locator stats. The states that lost the race are
+    recorded as plain misses, so only a wait where no state appeared counts as a timeout.
 
     Args:
-        driver: The Selenium WebDriver instance.
+        root: The driver, or an element to search inside.
+        candidates: (name, selectors, condition) tuples, checked in order. A state is either
+            selectors tried fastest first, or a condition callable returning a truthy value.
+        timeout: Maximum time to wait in seconds. 0 checks once.
+        clickable: Only accept elements that are displayed and enabled.
+        poll_interval: Seconds between checks.
+        on_miss: Optional callable run after every check that found nothing. It may raise TimeoutError to give up early.
 
     Returns:
-        True if export initiation is successful, False otherwise.
+        A (name, result) tuple. The result is the list of matching elements for a selector
+        state, and the condition's value otherwise.
+
+    Raises:
+        TimeoutException: If no state is reached within the timeout.
     """
-    logging.info("Initiating IMDb ratings export...")
+    queries = {name: [[0, 0.0] for _ in selectors] for name, selectors, _ in candidates if selectors}  # Count and seconds per selector
+    hit = {}
+
+    def attempt():
+        for name, selectors, condition in candidates:
+            if condition is not None:
+                result = condition()
+                if result:
+                    return name, result
+                continue
+            for index, selector in enumerate(selectors):
+                query_start = time.perf_counter()
+                try:
+                    elements = query_selector(root, selector)
+                finally:
+                    queries[name][index][0] += 1
+                    queries[name][index][1] += time.perf_counter() - query_start
+                if clickable:
+                    elements = [element for element in elements if element.is_displayed() and element.is_enabled()]
+                if elements:
+                    hit[name] = index
+                    return name, elements
+        if on_miss:
+            on_miss()
+        return None
+
+    names = " or ".join(f"'{name}'" for name, _, _ in candidates)
+    start_time = time.perf_counter()
     try:
-        # Find and click the export button
-        export_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//span[contains(text(),'Export')]"))
-        )
-        export_button.click()
-        random_delay()
-        logging.info("Export initiated.")
-        return True
-    except TimeoutException:
-        logging.error("Failed to initiate IMDb export: Export button not found.")
-        return False
+        return wait_engine().until(attempt, timeout, poll_interval, message=f"None of {names} appeared within {timeout}s")
+    finally:
+        metrics = current_metrics.get()
+        if metrics is not None:
+            seconds = time.perf_counter() - start_time
+            for name, selectors, _ in candidates:
+                if selectors:
+                    metrics.add_locator_lookup(name, selectors, hit.get(name), seconds, queries[name], waited=timeout > 0 and not hit)
 
-def wait_for_download_completion(download_dir: str, timeout: int = 60) -> str:
+def find_with_selectors(root, name: str, selectors: tuple, timeout: float, clickable: bool = False, poll_interval: float = 0.5, on_miss=None) -> list:
     """
-    Wait for a .csv file to complete downloading in the specified directory.
+    Wait for an element, trying the selectors in order on every check, and record the lookup.
 
     Args:
-        download_dir: Directory to monitor for downloads.
-        timeout: Maximum time to wait in seconds.
+        root: The driver, or an element to search inside.
+        name: Name of the lookup in the run report.
+        selectors: The selectors to try, fastest first.
+        timeout: Maximum time to wait in seconds. 0 checks once.
+        clickable: Only accept elements that are displayed and enabled.
+        poll_interval: Seconds between checks.
+        on_miss: Optional callable run after every check that found nothing. It may raise TimeoutError to give up early.
 
     Returns:
-        The path to the downloaded file.
+        The elements matched by the first selector that matches any.
 
     Raises:
-        TimeoutError: If the download does not complete within the timeout.
+        TimeoutException: If no selector finds the element within the timeout.
     """
-    logging.info(f"Waiting for download to complete in: {download_dir}")
+    return race_states(root, [(name, selectors, None)], timeout, clickable, poll_interval, on_miss)[1]
 
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        # Look for both .csv and .csv.part files
-        files = os.listdir(download_dir)
-        csv_files = [f for f in files if f.endswith('.csv')]
-        part_files = [f for f in files if f.endswith('.csv.part')]
-
-        # If we find a complete CSV file and no .part files, download is done
-        if csv_files and not part_files:
-            # Get the most recent CSV file
-            latest_csv = max(
-                [os.path.join(download_dir, f) for f in csv_files],
-                key=os.path.getmtime
-            )
+def wait_for_any(root, states: tuple, timeout: float = 10, clickable: bool = False, poll_interval: float = 0.5) -> tuple:
+    """
+    Wait for whichever of several alternative page states appears first.
 
-            # Ensure file size has stabilized to confirm download completion
-            size = os.path.getsize(latest_csv)
-            time.sleep(1)  # Wait a second
-            if size == os.path.getsize(latest_csv):
-                logging.info(f"Download completed: {latest_csv}")
-                return latest_csv
+    Use it wherever the flow branches, so no run waits out a timeout for a state that
+    does not occur.
 
-        time.sleep(0.5)  # Check every half second
+    Args:
+        root: The driver, or an element to search inside.
+        states: Keys of LOCATORS, or (name, condition) pairs whose condition is a callable
+            returning a truthy value once that state is reached.
+        timeout: Maximum time to wait in seconds.
+        clickable: Only accept elements that are displayed and enabled.
+        poll_interval: Seconds between checks.
+
+    Returns:
+        A (name, result) tuple with the state that appeared. The result is the element
+        for a locator, and the condition's value otherwise.
 
-    raise TimeoutError("Download did not complete within the specified timeout")
+    Raises:
+        TimeoutException: If none of the states appears within the timeout.
+    """
+    candidates = [(state, LOCATORS[state], None) if isinstance(state, str) else (state[0], None, state[1]) for state in states]
+    name, result = race_states(root, candidates, timeout, clickable, poll_interval)
+    is_locator = any(candidate_name == name and selectors for candidate_name, selectors, _ in candidates)
+    return name, result[0] if is_locator else result
 
-def monitor_imdb_export_status(driver: webdriver.Firefox) -> str or None:
+def locate(root, name: str, timeout: float = 10, clickable: bool = False, poll_interval: float = 0.5, on_miss=None):
     """
-    Monitor the export status on IMDb and wait for the download to become ready.
+    Wait for a registered element.
 
     Args:
-        driver: The Selenium WebDriver instance.
+        root: The driver, or an element to search inside.
+        name: Key of the locator in LOCATORS.
+        timeout: Maximum time to wait in seconds. 0 checks once.
+        clickable: Only accept an element that is displayed and enabled.
+        poll_interval: Seconds between checks. Long waits use a longer interval so the fallback selectors run less often.
+        on_miss: Optional callable run after every check that found nothing. It may raise TimeoutError to give up early.
 
     Returns:
-        The path to the downloaded CSV file if successful, None otherwise.
+        The element.
+
+    Raises:
+        TimeoutException: If the element does not appear within the timeout.
     """
-    exports_url = "https://www.imdb.com/exports/"
-    logging.info(f"Monitoring IMDb export status at: {exports_url}")
-    driver.get(exports_url)
-    random_delay()
+    return find_with_selectors(root, name, LOCATORS[name], timeout, clickable, poll_interval, on_miss)[0]
 
-    max_attempts = 30
-    attempt = 0
+def locate_all(root, name: str) -> list:
+    """
+    Find every match of a registered element without waiting.
 
-    while attempt < max_attempts:
-        try:
-            # Wait for the list of exports to load
-            list_content = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div[data-testid="list-page-mc-list-content"]'))
-            )
+    Args:
+        root: The driver, or an element to search inside.
+        name: Key of the locator in LOCATORS.
 
-            # Find all export items
-            export_items = list_content.find_elements(By.CSS_SELECTOR, 'li[data-testid="user-ll-item"]')
+    Returns:
+        The elements matched by the first selector that matches any, or an empty list.
+    """
+    try:
+        return find_with_selectors(root, name, LOCATORS[name], timeout=0)
+    except TimeoutException:
+        return []
 
-            if export_items:
-                first_item = export_items[0]
-                try:  # Try to find the Ready button
-                    ready_button = first_item.find_element(
-                        By.CSS_SELECTOR,
-                        'button[data-testid="export-status-button"].READY'
-                    )
+# Browser Startup
+UBLOCK_EXTENSION_PATH = 'ublock_origin-1.61.2.xpi'  # Path to the uBlock Origin extension.
+UBLOCK_EXTENSION_ID = "uBlock0@raymondhill.net"  # Add-on id, used as the file name of a permanently installed extension.
+TEMPLATE_PREFERENCES = {
+    "extensions.autoDisableScopes": 0,  # Enable the add-on dropped into the profile without asking
+    "extensions.enabledScopes": 15,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",  # Skip the "what's new" page
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.reportingpolicy.firstRun": False,
+}
 
-                    logging.info("Found Ready button. Initiating download...")
-                    random_delay()
-                    ready_button.click()
+BLOCKING_PREFERENCES = {
+    "permissions.default.image": 2,  # No images
+    "gfx.downloadable_fonts.enabled": False,  # No web fonts
+    "browser.display.use_document_fonts": 0,
+    "media.autoplay.default": 5,  # No autoplaying audio or video
+    "media.autoplay.blocking_policy": 2,
+    "media.preload.default": 0,  # Don't buffer media that is not played
+    "network.prefetch-next": False,  # No link prefetching
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,  # No speculative connections on hover
+    "browser.urlbar.speculativeConnect.enabled": False,
+    "permissions.default.desktop-notification": 2,
+}
 
-                    # Wait for download to complete
-                    try:
-                        downloaded_file = wait_for_download_completion(DOWNLOAD_DIR)
-                        if downloaded_file:
-                            return downloaded_file
-                    except TimeoutError as e:
-                        logging.error(f"Download timeout: {e}")
-                        return None
+def browser_preferences(download_dir: str) -> dict:
+    """
+    Get every Firefox preference a run applies: downloads and, if enabled, resource blocking.
 
-                except NoSuchElementException:
-                    print("Ready button not available yet, Trying again")
+    Args:
+        download_dir: Directory the browser saves downloads into.
 
-            else:  # Handle case where no exports are listed
-                print("Ready button not available yet, Trying again")
+    Returns:
+        A mapping of preference name to value.
+    """
+    return {**(BLOCKING_PREFERENCES if RESOURCE_BLOCKING else {}), **download_preferences(download_dir)}
 
-            attempt += 1
-            logging.info(f"Export not ready yet. Attempt {attempt}/{max_attempts}")
-            random_delay(10, 15)
-            driver.refresh()  # Refresh the page to check for updates
-            random_delay()
+def download_preferences(download_dir: str) -> dict:
+    """
+    Get the Firefox preferences that save CSV downloads to a directory without prompting.
 
-        except Exception as e:
-            logging.error(f"Error checking export status: {e}")
-            attempt += 1
-            random_delay(5, 10)
-            driver.refresh()
+    Args:
+        download_dir: Directory the browser saves downloads into.
 
-    logging.error("Maximum attempts reached without finding a ready export")
-    return None
+    Returns:
+        A mapping of preference name to value.
+    """
+    return {
+        "browser.download.folderList": 2,  # Use custom download directory
+        "browser.download.manager.showWhenStarting": False,  # Don't show download manager
+        "browser.download.dir": os.path.abspath(download_dir),  # Set download directory
+        "browser.helperApps.neverAsk.saveToDisk": "text/csv",  # Auto-save CSV files
+    }
 
-def login_to_letterboxd(driver: webdriver.Firefox) -> bool:
+def setup_driver(download_dir: str = DOWNLOAD_DIR, attach: bool = True) -> webdriver.Firefox:
     """
-    Log in to Letterboxd using the provided credentials.
+    Setup Selenium WebDriver (Firefox) with specified options and extensions.
+
+    Attaches to the warm browser daemon if one is configured and downloads into the same
+    directory. Otherwise a new Firefox is started, from a copy of the prebuilt profile
+    template if it exists, which already has uBlock Origin installed.
 
     Args:
-        driver: The Selenium WebDriver instance.
+        download_dir: Directory the browser saves downloads into.
+        attach: Set to False to always start a new browser, e.g. next to one attached to the daemon.
 
     Returns:
-        True if login is successful, False otherwise.
+        The configured Firefox WebDriver instance.
     """
-    logging.info("Navigating to Letterboxd login page...")
-    driver.get("https://letterboxd.com/settings/data/")
-    random_delay()
-
-    try:
-        # Find and enter the username
-        username_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "field-username"))
-        )
-        logging.info("Found username input field.")
-        username_input.send_keys(LETTERBOXD_EMAIL)
-        random_delay(1, 2)
+    load_browser_modules()
+    if attach and BROWSER_DAEMON_PORT and os.path.abspath(download_dir) == os.path.abspath(DOWNLOAD_DIR):
+        try:
+            return attach_to_browser_daemon(BROWSER_DAEMON_PORT)
+        except WebDriverException as e:
+            logging.warning(f"Could not attach to the browser daemon, starting a new browser: {e}")
 
-        # Find and enter the password
-        password_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "field-password"))
-        )
-        logging.info("Found password input field.")
-        password_input.send_keys(LETTERBOXD_PASSWORD)
-        random_delay(1, 2)
+    options = webdriver.FirefoxOptions()
+    use_template = bool(PROFILE_TEMPLATE_DIR) and os.path.isfile(os.path.join(PROFILE_TEMPLATE_DIR, "user.js"))
+
+    if HEADLESS_MODE:
+        options.add_argument("--headless")
+
+    if use_template:
+        # Start Firefox directly on a private copy of the template. A FirefoxProfile would be
+        # zipped and base64 encoded into the session request, and unpacked again, on every start.
+        profile_dir = copy_profile_template(PROFILE_TEMPLATE_DIR)
+        write_user_js(profile_dir, {**TEMPLATE_PREFERENCES, **browser_preferences(download_dir)})
+        options.add_argument("-profile")
+        options.add_argument(profile_dir)
+        driver = webdriver.Firefox(options=options)
+        weakref.finalize(driver, shutil.rmtree, os.path.dirname(profile_dir), ignore_errors=True)
+        return driver
+
+    # Configure download preferences to avoid prompts, and block resources the automation does not need
+    profile = webdriver.FirefoxProfile()
+    for name, value in browser_preferences(download_dir).items():
+        profile.set_preference(name, value)
+    options.profile = profile
+    driver = webdriver.Firefox(options=options)
+    driver.install_addon(UBLOCK_EXTENSION_PATH, temporary=True)  # Install uBlock Origin
+    return driver
+
+def copy_profile_template(template_dir: str) -> str:
+    """
+    Copy the profile template to a new temporary directory for one browser.
+
+    Args:
+        template_dir: The profile template built by build_profile_template().
+
+    Returns:
+        The copied profile directory. Its parent directory is removed once the driver is gone.
+    """
+    profile_dir = os.path.join(tempfile.mkdtemp(prefix="imdb_letterboxd_profile_"), "profile")
+    shutil.copytree(template_dir, profile_dir)
+    return profile_dir
+
+def write_user_js(profile_dir: str, preferences: dict) -> None:
+    """
+    Write preferences into a profile's user.js, which Firefox applies on every start.
+
+    Args:
+        profile_dir: The Firefox profile directory.
+        preferences: A mapping of preference name to value.
+    """
+    with open(os.path.join(profile_dir, "user.js"), 'w', encoding='utf-8') as f:
+        for name, value in preferences.items():
+            f.write(f"user_pref({json.dumps(name)}, {json.dumps(value)});\n")
+
+def build_profile_template(template_dir: str = PROFILE_TEMPLATE_DIR, download_dir: str = DOWNLOAD_DIR) -> None:
+    """
+    Bake a reusable Firefox profile with uBlock Origin and the download preferences applied.
+
+    Firefox is started once on the new profile so the extension is unpacked and the
+    first-run work is done before any sync run copies the profile.
+
+    Args:
+        template_dir: Where to create the profile template. An existing template is replaced.
+        download_dir: Default download directory stored in the template.
+    """
+    load_browser_modules()
+    shutil.rmtree(template_dir, ignore_errors=True)
+    os.makedirs(os.path.join(template_dir, "extensions"))
+    shutil.copyfile(UBLOCK_EXTENSION_PATH, os.path.join(template_dir, "extensions", f"{UBLOCK_EXTENSION_ID}.xpi"))
+    write_user_js(template_dir, {**TEMPLATE_PREFERENCES, **download_preferences(download_dir)})
+
+    # Start Firefox on the template itself, not a copy, so the first-run state is kept
+    options = webdriver.FirefoxOptions()
+    options.add_argument("--headless")
+    options.add_argument("-profile")
+    options.add_argument(os.path.abspath(template_dir))
+    driver = webdriver.Firefox(options=options)
+    try:
+        driver.get("about:blank")
+        time.sleep(5)  # Let the extension finish its first start
+    finally:
+        driver.quit()
+
+    # Runtime files that must not be shared between copies
+    for name in ("lock", ".parentlock", "parent.lock", "sessionstore-backups"):
+        path = os.path.join(template_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.lexists(path):
+            os.remove(path)
+    logging.info(f"Built Firefox profile template in {template_dir}")
+
+def attach_to_browser_daemon(port: int) -> webdriver.Firefox:
+    """
+    Start a WebDriver session on the already running browser daemon.
+
+    Args:
+        port: Marionette port of the browser daemon.
+
+    Returns:
+        A WebDriver instance controlling the daemon's browser. Quitting it leaves the browser running.
+
+    Raises:
+        WebDriverException: If no browser is listening on the port.
+    """
+    load_browser_modules()
+    from selenium.webdriver.firefox.service import Service
+
+    service = Service(service_args=["--connect-existing", "--marionette-port", str(port)])
+    driver = webdriver.Firefox(options=webdriver.FirefoxOptions(), service=service)
+    logging.info(f"Attached to the browser daemon on port {port}.")
+    return driver
+
+def run_browser_daemon(port: int, profile_dir: str = BROWSER_DAEMON_PROFILE_DIR, download_dir: str = DOWNLOAD_DIR) -> None:
+    """
+    Keep a Firefox running with Marionette enabled for scheduled runs to attach to.
+
+    The profile is copied from the template once and then kept, so logins and caches
+    carry over between runs. Runs until interrupted.
+
+    Args:
+        port: Marionette port to listen on.
+        profile_dir: Profile directory of the daemon's browser.
+        download_dir: Directory the daemon's browser saves downloads into.
+    """
+    if not os.path.isdir(profile_dir):
+        if PROFILE_TEMPLATE_DIR and os.path.isdir(PROFILE_TEMPLATE_DIR):
+            shutil.copytree(PROFILE_TEMPLATE_DIR, profile_dir)
+        else:
+            os.makedirs(os.path.join(profile_dir, "extensions"))
+            shutil.copyfile(UBLOCK_EXTENSION_PATH, os.path.join(profile_dir, "extensions", f"{UBLOCK_EXTENSION_ID}.xpi"))
+    os.makedirs(download_dir, exist_ok=True)
+    write_user_js(profile_dir, {**TEMPLATE_PREFERENCES, **browser_preferences(download_dir), "marionette.port": port})
+
+    command = [FIREFOX_BINARY, "-marionette", "-no-remote", "-profile", os.path.abspath(profile_dir)]
+    if HEADLESS_MODE:
+        command.append("-headless")
+    logging.info(f"Starting browser daemon on Marionette port {port}...")
+    process = subprocess.Popen(command)
+    try:
+        process.wait()
+        logging.error(f"Browser daemon exited with code {process.returncode}")
+    except KeyboardInterrupt:
+        logging.info("Stopping browser daemon.")
+        process.terminate()
+        process.wait(timeout=30)
+
+# Session Cache
+def get_session_cipher() -> Optional["Fernet"]:
+    """
+    Get the cipher used to encrypt cached sessions.
+
+    The key is read from the SESSION_CACHE_KEY_ENV environment variable, or from a key file
+    in SESSION_CACHE_DIR that is created on first use and readable only by the current user.
+    A key that is not a valid Fernet key disables the cache, so the run logs in instead.
+
+    Returns:
+        A Fernet instance, or None if session caching is disabled or unavailable.
+    """
+    if not SESSION_CACHE_DIR:
+        return None
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:  # Session caching is disabled without the cryptography package
+        logging.warning("The cryptography package is not installed, session caching is disabled.")
+        return None
+
+    key = os.environ.get(SESSION_CACHE_KEY_ENV)
+    try:
+        if key:
+            return Fernet(key.encode())
+
+        os.makedirs(SESSION_CACHE_DIR, exist_ok=True)
+        key_path = os.path.join(SESSION_CACHE_DIR, "session.key")
+        if not os.path.exists(key_path):
+            # Write the key in full before it appears under its name, so a parallel account never reads it half written
+            fd, temp_path = tempfile.mkstemp(prefix="session.key.", suffix=".tmp", dir=SESSION_CACHE_DIR)  # Readable only by the current user
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(Fernet.generate_key())
+                try:
+                    os.link(temp_path, key_path)  # Fails if another account published its key first, which is then used
+                except FileExistsError:
+                    pass
+                except OSError:  # File systems without hard links
+                    if not os.path.exists(key_path):
+                        os.replace(temp_path, key_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        with open(key_path, 'rb') as f:
+            return Fernet(f.read().strip())
+    except (OSError, ValueError) as e:
+        logging.warning(f"Session cache key is unusable, session caching is disabled: {e}")
+        return None
+
+def session_cache_path(account: AccountConfig, site: str) -> str:
+    """
+    Get the cache file for an account's session on a site.
+
+    Args:
+        account: The account the session belongs to.
+        site: "imdb" or "letterboxd".
+
+    Returns:
+        The path of the encrypted cookie file.
+    """
+    login = account.imdb_email if site == "imdb" else account.letterboxd_email
+    digest = hashlib.sha1(login.strip().lower().encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SESSION_CACHE_DIR, f"{site}-{digest}.session")
+
+def save_session(driver: webdriver.Firefox, account: AccountConfig, site: str) -> None:
+    """
+    Encrypt the current cookies of the driver and store them for later runs.
+
+    Args:
+        driver: The Selenium WebDriver instance, currently on a page of the site.
+        account: The account the session belongs to.
+        site: "imdb" or "letterboxd".
+    """
+    cipher = get_session_cipher()
+    if cipher is None:
+        return
+
+    try:
+        token = cipher.encrypt(json.dumps(driver.get_cookies()).encode("utf-8"))
+        cache_path = session_cache_path(account, site)
+        temp_path = cache_path + ".tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(token)
+        os.replace(temp_path, cache_path)
+        logging.info(f"Cached {site} session for later runs.")
+    except (OSError, WebDriverException) as e:
+        logging.error(f"Error caching {site} session: {e}")
+
+def discard_session(account: AccountConfig, site: str) -> None:
+    """
+    Delete a cached session that is no longer valid.
+
+    Args:
+        account: The account the session belongs to.
+        site: "imdb" or "letterboxd".
+    """
+    try:
+        os.remove(session_cache_path(account, site))
+    except OSError:
+        pass
+
+def restore_session(driver: webdriver.Firefox, account: AccountConfig, site: str, home_url: str) -> bool:
+    """
+    Load cached cookies for a site into the driver.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account the session belongs to.
+        site: "imdb" or "letterboxd".
+        home_url: A page on the site's domain, needed before cookies can be added.
+
+    Returns:
+        True if cached cookies were loaded, False if there is no usable cache.
+    """
+    cipher = get_session_cipher()
+    if cipher is None:
+        return False
+
+    cache_path = session_cache_path(account, site)
+    if not os.path.exists(cache_path):
+        return False
+
+    from cryptography.fernet import InvalidToken  # Installed, or there would be no cipher
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cookies = json.loads(cipher.decrypt(f.read()))
+    except (OSError, ValueError, InvalidToken) as e:
+        logging.warning(f"Discarding unreadable {site} session cache: {e}")
+        discard_session(account, site)
+        return False
+
+    navigate(driver, home_url)
+    for cookie in cookies:
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            pass  # Cookies of other subdomains cannot be set from this page
+    logging.info(f"Loaded cached {site} session.")
+    return True
+
+def is_logged_in_to_imdb(driver: webdriver.Firefox) -> bool:
+    """
+    Check whether the driver has a logged-in IMDb session.
+
+    The exports page is only available to signed-in users, anonymous visitors are sent to sign in.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+
+    Returns:
+        True if the session is logged in, False otherwise.
+    """
+    navigate(driver, f"{IMDB_BASE_URL}/exports/")
+    return "signin" not in driver.current_url
+
+def is_logged_in_to_letterboxd(driver: webdriver.Firefox) -> bool:
+    """
+    Check whether the driver has a logged-in Letterboxd session.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+
+    Returns:
+        True if the account settings page opens without a login form, False otherwise.
+    """
+    navigate(driver, f"{LETTERBOXD_BASE_URL}/settings/data/")
+    return not locate_all(driver, "letterboxd_username") and bool(locate_all(driver, "letterboxd_settings_title"))
+
+def login_to_imdb(driver: webdriver.Firefox, account: AccountConfig) -> bool:
+    """
+    Log in to IMDb using the provided credentials.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account whose credentials are used.
+
+    Returns:
+        True if login is successful, False otherwise.
+    """
+    if restore_session(driver, account, "imdb", f"{IMDB_BASE_URL}/"):
+        if is_logged_in_to_imdb(driver):
+            logging.info("Reused cached IMDb session, skipping login.")
+            return True
+        logging.info("Cached IMDb session has expired.")
+        discard_session(account, "imdb")
+
+    logging.info("Navigating to IMDb login page...")
+    navigate(driver, f"{IMDB_BASE_URL}/registration/signin")
+    random_delay()
+
+    try:
+        # Find and click the IMDb sign-in button
+        signin_imdb_button = locate(driver, "imdb_signin_choice", clickable=True)
+        signin_imdb_button.click()
+        random_delay()
+
+        # Enter email
+        email_input = locate(driver, "imdb_email")
+        email_input.send_keys(account.imdb_email)
+        random_delay()
+
+        # Enter password
+        password_input = locate(driver, "imdb_password", timeout=0)
+        password_input.send_keys(account.imdb_password)
+        random_delay()
+
+        # Submit login form and wait until IMDb leaves the sign-in pages or reports a problem
+        signin_submit_button = locate(driver, "imdb_signin_submit", timeout=0)
+        signin_submit_button.click()
+        state, result = wait_for_any(
+            driver,
+            (("signed_in", lambda: "signin" not in driver.current_url), "imdb_signin_problem"),
+            timeout=30,
+        )
+        if state == "imdb_signin_problem":
+            logging.error(f"Login to IMDb failed: {result.text.strip() or 'IMDb rejected the sign-in.'}")
+            return False
+        logging.info("Logged in to IMDb successfully.")
+        save_session(driver, account, "imdb")
+        return True
+    except TimeoutException:
+        logging.error("Login to IMDb failed: Could not find login elements.")
+        return False
+
+def navigate_to_imdb_ratings(driver: webdriver.Firefox, account: AccountConfig) -> None:
+    """
+    Navigate to the user ratings page on IMDb.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account whose ratings are exported.
+    """
+    navigate_to_imdb_list(driver, account, "ratings")
+
+def imdb_list_kind(source: str) -> str:
+    """
+    Get the kind of an IMDb list, which decides its Letterboxd importer.
+
+    Args:
+        source: "ratings", "watchlist" or a list id such as "ls012345678".
+
+    Returns:
+        "ratings", "watchlist" or "list".
+
+    Raises:
+        ValueError: If the source is none of these.
+    """
+    if source in ("ratings", "watchlist"):
+        return source
+    if re.fullmatch(r"ls\d+", source):
+        return "list"
+    raise ValueError(f"Unknown IMDb list '{source}', expected 'ratings', 'watchlist' or a list id like 'ls012345678'")
+
+def navigate_to_imdb_list(driver: webdriver.Firefox, account: AccountConfig, source: str) -> None:
+    """
+    Navigate to the page of an IMDb list, which has the list's Export button.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account the list belongs to.
+        source: "ratings", "watchlist" or a list id.
+    """
+    if imdb_list_kind(source) == "list":
+        list_url = f"{IMDB_BASE_URL}/list/{source}/"
+    else:
+        list_url = f"{IMDB_BASE_URL}/user/{account.imdb_user_id}/{source}/"
+    logging.info(f"Navigating to IMDb {source} page: {list_url}")
+    navigate(driver, list_url)
+    random_delay()
+
+IMDB_EXPORT_LABELS = {"ratings": "Ratings", "watchlist": "Watchlist"}  # Names to look for when a list page had no heading
+
+def read_imdb_list_title(driver: webdriver.Firefox, source: str) -> str:
+    """
+    Read the name of the open IMDb list, which the exports page shows on the list's export.
+
+    Args:
+        driver: The Selenium WebDriver instance, on the list's page.
+        source: "ratings", "watchlist" or a list id.
+
+    Returns:
+        The list's heading, or a name derived from the source if the page has none.
+    """
+    headings = locate_all(driver, "imdb_list_title")
+    title = headings[0].text.strip() if headings else ""
+    return title or IMDB_EXPORT_LABELS.get(source, source)
+
+def initiate_imdb_export(driver: webdriver.Firefox) -> bool:
+    """
+    Initiate the export of IMDb ratings.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+
+    Returns:
+        True if export initiation is successful, False otherwise.
+    """
+    logging.info("Initiating IMDb ratings export...")
+    try:
+        # Find and click the export button
+        export_button = locate(driver, "imdb_export_button", clickable=True)
+        export_button.click()
+        random_delay()
+        logging.info("Export initiated.")
+        return True
+    except TimeoutException:
+        logging.error("Failed to initiate IMDb export: Export button not found.")
+        return False
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+def open_inotify_watch(directory: str) -> int or None:
+    """
+    Start watching a directory for finished file writes and renames using Linux inotify.
+
+    Args:
+        directory: The directory to watch.
+
+    Returns:
+        A non-blocking inotify file descriptor, or None if inotify is not available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+    import ctypes.util
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+class DownloadWatcher:
+    """
+    Detect a CSV download that finishes in a directory after the watcher was created.
+
+    On Linux, inotify reports the moment Firefox renames the finished .csv.part file to .csv.
+    Elsewhere the directory is polled. In both cases, files that were already in the
+    directory when the watcher was created are ignored, so old exports cannot be mistaken
+    for the new one.
+
+    Create the watcher before clicking the download button, and use it as a context manager
+    so the inotify descriptor is closed.
+    """
+
+    def __init__(self, download_dir: str):
+        """
+        Args:
+            download_dir: Directory the browser downloads into.
+        """
+        self.download_dir = download_dir
+        self._inotify_fd = open_inotify_watch(download_dir)  # Watch before snapshotting so no event is missed
+        self._existing = self._snapshot()
+
+    def __enter__(self) -> "DownloadWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the inotify descriptor, if any.
+        """
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def _snapshot(self) -> dict:
+        """
+        Record the CSV files currently in the download directory.
+
+        Returns:
+            A mapping of file name to (modification time, size).
+        """
+        snapshot = {}
+        for name in os.listdir(self.download_dir):
+            if name.endswith('.csv'):
+                try:
+                    stat = os.stat(os.path.join(self.download_dir, name))
+                    snapshot[name] = (stat.st_mtime, stat.st_size)
+                except OSError:
+                    pass  # File vanished between listing and stat
+        return snapshot
+
+    def _completed_file(self, name: str) -> str or None:
+        """
+        Check whether a CSV written since the watcher started has finished downloading.
+
+        Args:
+            name: The file name within the download directory.
+
+        Returns:
+            The full path if the download is complete, None otherwise.
+        """
+        if not name.endswith('.csv'):
+            return None
+        path = os.path.join(self.download_dir, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if self._existing.get(name) == (stat.st_mtime, stat.st_size):
+            return None  # Left over from an earlier run
+        # Firefox creates an empty placeholder .csv while the data goes to .csv.part
+        if stat.st_size == 0 or os.path.exists(path + '.part'):
+            return None
+        return path
+
+    def _read_inotify_names(self) -> list:
+        """
+        Read the file names of all pending inotify events.
+
+        Returns:
+            The names of files that were closed after writing or renamed into the directory.
+        """
+        names = []
+        try:
+            data = os.read(self._inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+            _, _, _, length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def wait(self, timeout: float = 60) -> str:
+        """
+        Wait for a new CSV file to finish downloading.
+
+        Args:
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            The path to the downloaded file.
+
+        Raises:
+            TimeoutError: If the download does not complete within the timeout.
+        """
+        logging.info(f"Waiting for download to complete in: {self.download_dir}")
+        deadline = time.time() + timeout
+
+        # A download that finished before wait() was called is still found here
+        candidates = [name for name in os.listdir(self.download_dir) if name.endswith('.csv')]
+        last_sizes = {}
+
+        while True:
+            for name in candidates:
+                path = self._completed_file(name)
+                if path is None:
+                    continue
+                if self._inotify_fd is None:
+                    # Without rename events, require the size to be unchanged since the last poll
+                    size = os.path.getsize(path)
+                    if last_sizes.get(name) != size:
+                        last_sizes[name] = size
+                        continue
+                logging.info(f"Download completed: {path}")
+                return path
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError("Download did not complete within the specified timeout")
+
+            if self._inotify_fd is not None:
+                readable, _, _ = select.select([self._inotify_fd], [], [], remaining)
+                candidates = self._read_inotify_names() if readable else []
+            else:
+                time.sleep(min(0.5, remaining))  # Check every half second
+                candidates = [name for name in os.listdir(self.download_dir) if name.endswith('.csv')]
+
+# Export Polling
+EXPORT_HISTORY_SIZE = 20  # Number of past export durations kept per account.
+
+def load_export_history(account: AccountConfig) -> list:
+    """
+    Load how long past exports of an account took to become ready.
+
+    Args:
+        account: The account whose history is loaded.
+
+    Returns:
+        A list of durations in seconds, oldest first.
+    """
+    try:
+        with open(EXPORT_HISTORY_PATH, encoding='utf-8') as f:
+            return list(json.load(f).get(account.name, []))
+    except (OSError, ValueError, AttributeError):
+        return []
+
+def record_export_duration(account: AccountConfig, seconds: float) -> None:
+    """
+    Append an export's time-to-ready to the history used by the adaptive poller.
+
+    Args:
+        account: The account the export belongs to.
+        seconds: Time from the start of monitoring until the export was ready.
+    """
+    def update(history):
+        durations = list(history.get(account.name, [])) + [round(seconds, 1)]
+        history[account.name] = durations[-EXPORT_HISTORY_SIZE:]
+
+    try:
+        update_state_file(EXPORT_HISTORY_PATH, update)
+    except OSError as e:
+        logging.error(f"Error saving export history: {e}")
+
+class FixedPollStrategy:
+    """
+    Check the export status every 10-15 seconds.
+    """
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        """
+        Args:
+            attempt: Number of checks that found the export not ready yet.
+            elapsed: Seconds since monitoring started.
+
+        Returns:
+            Seconds to wait before the next check.
+        """
+        return random.uniform(10, 15)
+
+class AdaptivePollStrategy:
+    """
+    Jittered exponential backoff around the time past exports usually became ready.
+
+    With history, the first check waits until shortly before the median past time-to-ready,
+    then backs off from min_delay. Without history it backs off from the start.
+    """
+
+    def __init__(self, history: list, min_delay: float = 2, max_delay: float = 30, factor: float = 1.6):
+        """
+        Args:
+            history: Past time-to-ready durations in seconds.
+            min_delay: First delay of the backoff.
+            max_delay: Upper bound for any single delay.
+            factor: Growth factor of the backoff.
+        """
+        import statistics
+
+        self.expected = statistics.median(history) if history else None
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self._backoff_step = 0
+
+    def next_delay(self, attempt: int, elapsed: float) -> float:
+        """
+        Args:
+            attempt: Number of checks that found the export not ready yet.
+            elapsed: Seconds since monitoring started.
+
+        Returns:
+            Seconds to wait before the next check.
+        """
+        if self.expected is not None and elapsed < self.expected * 0.8:
+            return max(self.min_delay, min(self.expected * 0.8 - elapsed, self.max_delay))
+
+        delay = min(self.min_delay * self.factor ** self._backoff_step, self.max_delay)
+        self._backoff_step += 1
+        return random.uniform(delay / 2, delay)  # Jitter so checks are not evenly spaced
+
+def make_export_poll_strategy(account: AccountConfig):
+    """
+    Create the export polling strategy selected by EXPORT_POLL_STRATEGY.
+
+    Args:
+        account: The account whose export history informs the strategy.
+
+    Returns:
+        An object with a next_delay(attempt, elapsed) method.
+    """
+    if EXPORT_POLL_STRATEGY == "fixed":
+        return FixedPollStrategy()
+    return AdaptivePollStrategy(load_export_history(account))
+
+FETCH_EXPORT_STATUS_SCRIPT = """
+const count = arguments[0];
+const done = arguments[arguments.length - 1];
+fetch(window.location.href, {credentials: 'include', cache: 'no-store'})
+    .then(response => response.text())
+    .then(html => {
+        const page = new DOMParser().parseFromString(html, 'text/html');
+        const items = page.querySelectorAll('div[data-testid="list-page-mc-list-content"] li[data-testid="user-ll-item"]');
+        const statuses = [];
+        for (let index = 0; index < count; index++) {
+            const button = items[index] && items[index].querySelector('button[data-testid="export-status-button"]');
+            const status = !button ? 'UNKNOWN' : button.classList.contains('READY') ? 'READY' : 'PENDING';
+            statuses.push([items[index] ? items[index].textContent.trim() : '', status]);
+        }
+        done(statuses);
+    })
+    .catch(() => done([]));
+"""
+
+def fetch_export_statuses(driver: webdriver.Firefox, count: int) -> list:
+    """
+    Check the status of the newest exports by fetching the exports page in the background.
+
+    This avoids a full page reload and re-render for every check.
+
+    Args:
+        driver: The Selenium WebDriver instance, on the IMDb exports page.
+        count: Number of exports to check, newest first.
+
+    Returns:
+        A list of (text, status) tuples, with the text of the export's entry and "READY",
+        "PENDING", or "UNKNOWN" if the status could not be read this way.
+    """
+    try:
+        driver.set_script_timeout(30)
+        statuses = driver.execute_async_script(FETCH_EXPORT_STATUS_SCRIPT, count) or []
+    except WebDriverException as e:
+        logging.warning(f"In-page export status check failed: {e}")
+        statuses = []
+    return ([tuple(status) for status in statuses] + [("", "UNKNOWN")] * count)[:count]
+
+def fetch_export_status(driver: webdriver.Firefox) -> str:
+    """
+    Check the latest export's status by fetching the exports page in the background.
+
+    Args:
+        driver: The Selenium WebDriver instance, on the IMDb exports page.
+
+    Returns:
+        "READY", "PENDING", or "UNKNOWN" if the status could not be read this way.
+    """
+    return fetch_export_statuses(driver, 1)[0][1]
+
+class SignedOutError(RuntimeError):
+    """Raised when IMDb shows the sign-in page where a signed in page was expected."""
+
+def list_export_items(driver: webdriver.Firefox) -> list:
+    """
+    Get the entries of the loaded exports page, newest first.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+
+    Returns:
+        The export entries.
+
+    Raises:
+        SignedOutError: If IMDb shows the sign-in page instead of the exports.
+    """
+    # Wait for the list of exports to load, or stop at once if IMDb sent us to sign in again
+    state, list_content = wait_for_any(driver, ("imdb_exports_list", "imdb_signin_choice", "imdb_email"))
+    if state != "imdb_exports_list":
+        raise SignedOutError("The IMDb session ended while checking the exports.")
+    return locate_all(list_content, "imdb_export_items")
+
+def find_ready_export_button(driver: webdriver.Firefox, index: int = 0) -> webdriver.remote.webelement.WebElement or None:
+    """
+    Find the Ready button of an export on the loaded exports page.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        index: Position of the export in the list, 0 for the latest.
+
+    Returns:
+        The Ready button if the export is ready, None otherwise.
+
+    Raises:
+        SignedOutError: If IMDb shows the sign-in page instead of the exports.
+    """
+    export_items = list_export_items(driver)
+    if len(export_items) <= index:  # Handle case where the export is not listed
+        return None
+
+    # Try to find the Ready button
+    ready_buttons = locate_all(export_items[index], "imdb_export_ready")
+    return ready_buttons[0] if ready_buttons else None
+
+def match_exports(texts: list, exports: dict) -> dict:
+    """
+    Tell apart exports by the list name their entries show.
+
+    Longer names pick first, so a list called "Ratings 2024" is not taken for the ratings.
+    Each entry goes to one list, the newest matching entry first.
+
+    Args:
+        texts: Text of each export entry, newest first.
+        exports: Maps each list to the name the exports page shows for it.
+
+    Returns:
+        A dict mapping each list found to the position of its entry.
+    """
+    positions = {}
+    for source, label in sorted(exports.items(), key=lambda item: -len(item[1])):
+        label = label.casefold()
+        index = next((index for index, text in enumerate(texts) if index not in positions.values() and label in text.casefold()), None)
+        if index is not None:
+            positions[source] = index
+    return positions
+
+# HTTP Fast Path
+EXPORT_ITEM_PATTERN = re.compile(r'<li[^>]*data-testid="user-ll-item".*?</li>', re.DOTALL)
+CSV_URL_PATTERN = re.compile(r'(?:href|data-url|"url")\s*[=:]\s*"([^"]+?\.csv(?:\?[^"]*)?)"')
+FILENAME_PATTERN = re.compile(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?')
+
+def create_http_session(driver: webdriver.Firefox) -> Optional["requests.Session"]:
+    """
+    Create a connection-pooled HTTP session that shares the browser's login cookies.
+
+    Args:
+        driver: The Selenium WebDriver instance, logged in to IMDb.
+
+    Returns:
+        A requests Session, or None if the requests package is not installed.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+    except ImportError:  # The HTTP download fast path is disabled without the requests package
+        logging.warning("The requests package is not installed, downloading the export through Firefox.")
+        return None
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain", ""),
+            path=cookie.get("path", "/"),
+        )
+    return session
+
+def find_export_download_url(page_html: str, page_url: str) -> tuple:
+    """
+    Read the status and download link of the latest export from the exports page HTML.
+
+    Args:
+        page_html: HTML of the exports page.
+        page_url: URL the HTML was fetched from, used to resolve relative links.
+
+    Returns:
+        A (status, url) tuple. status is "READY", "PENDING" or "UNKNOWN", and url is the
+        absolute CSV link when the export is ready, None otherwise.
+    """
+    item = EXPORT_ITEM_PATTERN.search(page_html)
+    if not item or 'data-testid="export-status-button"' not in item.group(0):
+        return "UNKNOWN", None
+    if not re.search(r'data-testid="export-status-button"[^>]*class="[^"]*\bREADY\b|class="[^"]*\bREADY\b[^"]*"[^>]*data-testid="export-status-button"', item.group(0)):
+        return "PENDING", None
+
+    # The link may sit in the item's markup or in page data, where "&" is escaped
+    for source in (item.group(0), page_html):
+        match = CSV_URL_PATTERN.search(source.replace("\\u0026", "&"))
+        if match:
+            return "READY", urljoin(page_url, html.unescape(match.group(1)))
+    return "READY", None
+
+def stream_download(session: "requests.Session", url: str, download_dir: str) -> str:
+    """
+    Stream a CSV to disk without holding it in memory.
+
+    The data is written to a .part file that is renamed once complete, like a browser download.
+    A download that fails partway removes its .part file, so the browser fallback starts clean.
+
+    Args:
+        session: The HTTP session to use.
+        url: The CSV URL.
+        download_dir: Directory to save the file in.
+
+    Returns:
+        The path to the downloaded file.
+
+    Raises:
+        requests.RequestException: If the request fails.
+    """
+    with session.get(url, stream=True, timeout=(10, 60)) as response:
+        response.raise_for_status()
+        match = FILENAME_PATTERN.search(response.headers.get("Content-Disposition", ""))
+        filename = unquote(match.group(1)) if match else os.path.basename(urlparse(url).path)
+        filename = os.path.basename(filename) or "imdb_export.csv"
+        if not filename.endswith('.csv'):
+            filename += '.csv'
+
+        path = os.path.join(download_dir, filename)
+        if os.path.exists(path):
+            path = os.path.join(download_dir, f"{os.path.splitext(filename)[0]}_{int(time.time())}.csv")
+        try:
+            with open(path + '.part', 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+            os.replace(path + '.part', path)
+        except BaseException:
+            try:
+                os.remove(path + '.part')
+            except OSError:
+                pass
+            raise
+    logging.info(f"Download completed: {path}")
+    return path
+
+def check_export_over_http(session: "requests.Session", exports_url: str, download_dir: str) -> tuple:
+    """
+    Check the export status over HTTP and download the export if it is ready.
+
+    Args:
+        session: HTTP session holding the IMDb login cookies.
+        exports_url: URL of the IMDb exports page.
+        download_dir: Directory to save the export in.
+
+    Returns:
+        A (status, path) tuple. path is the downloaded file, or None if the export is not
+        ready or could not be fetched over HTTP.
+    """
+    import requests  # Installed, or there would be no session
+
+    try:
+        response = session.get(exports_url, timeout=(10, 30))
+        response.raise_for_status()
+        status, download_url = find_export_download_url(response.text, response.url)
+        if status == "READY" and download_url:
+            logging.info("Export ready. Downloading over HTTP...")
+            return status, stream_download(session, download_url, download_dir)
+        if status == "READY":
+            logging.warning("Export is ready but no download link was found, falling back to the browser.")
+        return status, None
+    except (requests.RequestException, OSError) as e:
+        logging.error(f"HTTP export check failed, falling back to the browser: {e}")
+        return "UNKNOWN", None
+
+def report_export_ready(account: AccountConfig, start_time: float, attempt: int) -> None:
+    """
+    Log and record how long the export took to become ready.
+
+    Args:
+        account: The account the export belongs to.
+        start_time: When monitoring started.
+        attempt: Number of checks that found the export not ready.
+    """
+    time_to_ready = time.time() - start_time
+    logging.info(f"Export ready after {time_to_ready:.1f}s and {attempt} status checks.")
+    record_export_duration(account, time_to_ready)
+
+def monitor_imdb_export_status(driver: webdriver.Firefox, account: AccountConfig) -> str or None:
+    """
+    Monitor the export status on IMDb and wait for the download to become ready.
+
+    Between checks the status is fetched in the background, and the page is only reloaded
+    once the export is ready or the background check cannot read the status.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account whose download directory receives the export.
+
+    Returns:
+        The path to the downloaded CSV file if successful, None otherwise.
+    """
+    exports_url = f"{IMDB_BASE_URL}/exports/"
+    logging.info(f"Monitoring IMDb export status at: {exports_url}")
+    navigate(driver, exports_url)
+    random_delay()
+
+    strategy = make_export_poll_strategy(account)
+    http_session = create_http_session(driver) if HTTP_FAST_PATH else None
+    try:
+        return poll_export_until_ready(driver, account, exports_url, strategy, http_session)
+    finally:
+        if http_session is not None:
+            http_session.close()
+
+def reload_page(driver: webdriver.Firefox) -> None:
+    """
+    Reload the current page, logging instead of raising on failure.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+    """
+    try:
+        navigate(driver)
+    except WebDriverException as e:
+        logging.error(f"Error reloading the page: {e}")
+
+def poll_export_until_ready(driver: webdriver.Firefox, account: AccountConfig, exports_url: str, strategy, http_session: "requests.Session" = None) -> str or None:
+    """
+    Check the latest export until it is ready, then download it.
+
+    Args:
+        driver: The Selenium WebDriver instance, on the IMDb exports page.
+        account: The account whose download directory receives the export.
+        exports_url: URL of the IMDb exports page.
+        strategy: Polling strategy deciding the delay between checks.
+        http_session: If given, status checks and the download go over HTTP, with the browser as fallback.
+
+    Returns:
+        The path to the downloaded CSV file if successful, None otherwise.
+    """
+    start_time = time.time()
+    attempt = 0
+    status = "UNKNOWN"
+
+    while True:
+        if http_session is not None:
+            with timed_stage("http_check"):
+                status, downloaded_file = check_export_over_http(http_session, exports_url, account.download_dir)
+            if downloaded_file:
+                report_export_ready(account, start_time, attempt)
+                return downloaded_file
+            if status != "PENDING" and attempt:
+                reload_page(driver)  # Fall back to reading the status in the browser
+
+        try:
+            if status != "PENDING":
+                ready_button = find_ready_export_button(driver)
+                if ready_button:
+                    report_export_ready(account, start_time, attempt)
+
+                    logging.info("Found Ready button. Initiating download...")
+                    random_delay()
+
+                    # Start watching before the click so only this run's download is picked up
+                    with timed_stage("download"), DownloadWatcher(account.download_dir) as watcher:
+                        ready_button.click()
+                        try:
+                            return watcher.wait()
+                        except TimeoutError as e:
+                            logging.error(f"Download timeout: {e}")
+                            return None
+        except SignedOutError as e:
+            logging.error(e)
+            discard_session(account, "imdb")
+            return None
+        except Exception as e:
+            logging.error(f"Error checking export status: {e}")
+
+        elapsed = time.time() - start_time
+        if elapsed >= EXPORT_POLL_TIMEOUT:
+            logging.error(f"Export was not ready within {EXPORT_POLL_TIMEOUT}s")
+            return None
+
+        attempt += 1
+        delay = min(strategy.next_delay(attempt, elapsed), EXPORT_POLL_TIMEOUT - elapsed)
+        logging.info(f"Export not ready yet after {elapsed:.0f}s. Checking again in {delay:.1f}s (check {attempt}).")
+        wait_engine().sleep(delay)
+
+        if http_session is None:
+            status = fetch_export_status(driver)
+            if status != "PENDING":
+                reload_page(driver)  # Reload to click the Ready button, or to read the status the slow way
+
+def monitor_imdb_exports(driver: webdriver.Firefox, account: AccountConfig, exports: dict, window: int = None) -> dict:
+    """
+    Wait for several exports together and download each one as soon as it is ready.
+
+    The exports are told apart by the list name their entries show, among the newest
+    entries only, so an older export of the same list is never taken for this run's.
+    One background check covers all of them, and the page is only reloaded once one of the
+    exports is ready or the background check cannot read the statuses.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account whose download directory receives the exports.
+        exports: Maps each exported list to the name the exports page shows for it.
+        window: Number of newest entries that belong to this run, len(exports) by default.
+
+    Returns:
+        A dict mapping each downloaded list to its CSV file. Lists that were not ready within
+        EXPORT_POLL_TIMEOUT or failed to download are left out.
+    """
+    sources = list(exports)
+    window = window or len(exports)
+    exports_url = f"{IMDB_BASE_URL}/exports/"
+    logging.info(f"Monitoring {len(sources)} IMDb exports at: {exports_url}")
+    navigate(driver, exports_url)
+    random_delay()
+
+    strategy = make_export_poll_strategy(account)
+    start_time = time.time()
+    attempt = 0
+    statuses = dict.fromkeys(sources, "UNKNOWN")
+    downloads = {}
+    failed = set()
+
+    while True:
+        for source in sources:
+            if source in downloads or source in failed or statuses[source] == "PENDING":
+                continue
+            try:
+                export_items = list_export_items(driver)[:window]
+                index = match_exports([item.text for item in export_items], exports).get(source)
+                if index is None:
+                    continue
+                ready_buttons = locate_all(export_items[index], "imdb_export_ready")
+                if not ready_buttons:
+                    continue
+                ready_button = ready_buttons[0]
+                logging.info(f"Export of IMDb {source} ready after {time.time() - start_time:.1f}s. Initiating download...")
+                if source == "ratings":
+                    record_export_duration(account, time.time() - start_time)
+
+                with timed_stage(f"download_{source}"), DownloadWatcher(account.download_dir) as watcher:
+                    ready_button.click()
+                    downloads[source] = watcher.wait()
+            except TimeoutError as e:
+                logging.error(f"Download timeout for IMDb {source}: {e}")
+                failed.add(source)
+            except SignedOutError as e:
+                logging.error(e)
+                discard_session(account, "imdb")
+                return downloads
+            except Exception as e:
+                logging.error(f"Error checking the export status of IMDb {source}: {e}")
+
+        waiting = [source for source in sources if source not in downloads and source not in failed]
+        if not waiting:
+            return downloads
+
+        elapsed = time.time() - start_time
+        if elapsed >= EXPORT_POLL_TIMEOUT:
+            logging.error(f"Exports of IMDb {', '.join(waiting)} were not ready within {EXPORT_POLL_TIMEOUT}s")
+            return downloads
+
+        attempt += 1
+        delay = min(strategy.next_delay(attempt, elapsed), EXPORT_POLL_TIMEOUT - elapsed)
+        logging.info(f"{len(waiting)} of {len(sources)} exports not ready yet after {elapsed:.0f}s. Checking again in {delay:.1f}s (check {attempt}).")
+        wait_engine().sleep(delay)
+
+        checked = fetch_export_statuses(driver, window)
+        positions = match_exports([text for text, _ in checked], exports)
+        statuses = {source: checked[positions[source]][1] if source in positions else "UNKNOWN" for source in sources}
+        if any(statuses[source] != "PENDING" for source in waiting):
+            reload_page(driver)  # Reload to click the Ready buttons, or to read the statuses the slow way
+
+def login_to_letterboxd(driver: webdriver.Firefox, account: AccountConfig) -> bool:
+    """
+    Log in to Letterboxd using the provided credentials.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account whose credentials are used.
+
+    Returns:
+        True if login is successful, False otherwise.
+    """
+    if restore_session(driver, account, "letterboxd", f"{LETTERBOXD_BASE_URL}/"):
+        if is_logged_in_to_letterboxd(driver):
+            logging.info("Reused cached Letterboxd session, skipping login.")
+            navigate(driver, f"{LETTERBOXD_BASE_URL}/import/")
+            logging.info("Navigated to Letterboxd import page.")
+            return True
+        logging.info("Cached Letterboxd session has expired.")
+        discard_session(account, "letterboxd")
+
+    logging.info("Navigating to Letterboxd login page...")
+    navigate(driver, f"{LETTERBOXD_BASE_URL}/settings/data/")
+    random_delay()
+
+    try:
+        # Find and enter the username
+        username_input = locate(driver, "letterboxd_username")
+        logging.info("Found username input field.")
+        username_input.send_keys(account.letterboxd_email)
+        random_delay(1, 2)
+
+        # Find and enter the password
+        password_input = locate(driver, "letterboxd_password")
+        logging.info("Found password input field.")
+        password_input.send_keys(account.letterboxd_password)
+        random_delay(1, 2)
 
         # Find and click the login button
-        login_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']"))
+        login_button = locate(driver, "letterboxd_submit", clickable=True)
+        logging.info("Clicking login button.")
+        login_button.click()
+        random_delay(2, 3)
+
+        # Wait for the account settings page, or stop at once if Letterboxd rejects the login
+        state, element = wait_for_any(driver, ("letterboxd_settings_title", "letterboxd_login_error"), clickable=True)
+        if state == "letterboxd_login_error":
+            logging.error(f"Failed to login to Letterboxd: {element.text.strip() or 'Letterboxd rejected the sign-in.'}")
+            return False
+
+        logging.info("Successfully logged into Letterboxd")
+        save_session(driver, account, "letterboxd")
+
+        # Navigate to the import page after successful login
+        navigate(driver, f"{LETTERBOXD_BASE_URL}/import/")
+        logging.info("Navigated to Letterboxd import page.")
+
+        return True
+
+    except Exception as e:
+        logging.exception(f"Failed to login to Letterboxd: {e}")
+        return False
+
+class BackgroundLetterboxdLogin:
+    """
+    Logs in to Letterboxd in a second browser on its own thread, while IMDb prepares the export.
+
+    The thread starts the browser, logs in and opens the import page, then hands the driver
+    over through a queue. The run only blocks on the handoff once the export has landed and
+    the file to upload is ready, so the login is off the critical path unless it is slower
+    than the export.
+    The thread runs in a copy of the run's context, so its stages and pauses count towards
+    the same metrics and humanization budget.
+
+    In batch mode the second browser is borrowed from the driver pool, and only if the pool
+    has one to spare, so the pool never runs more browsers than its size.
+    """
+
+    def __init__(self, account: AccountConfig, pool: DriverPool = None):
+        """
+        Args:
+            account: The account whose Letterboxd credentials are used.
+            pool: The batch's driver pool to borrow the browser from, or None to start one.
+        """
+        self.account = account
+        self.pool = pool
+        self._handoff = queue.Queue(maxsize=1)
+        self._pool_entry = None
+        self._driver = None
+        self._logged_in = False
+        self._taken = False
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._login,),
+            name=f"{threading.current_thread().name}-letterboxd",
+            daemon=True,
+        )
+
+    def start(self) -> "BackgroundLetterboxdLogin":
+        """
+        Start the login thread.
+
+        Returns:
+            This instance.
+        """
+        self._thread.start()
+        return self
+
+    def _login(self) -> None:
+        """
+        Start the second browser and log in. Runs on the login thread.
+        """
+        driver = None
+        try:
+            with timed_stage("letterboxd_login"):
+                if self.pool is not None:
+                    self._pool_entry = self.pool.acquire(block=False)
+                    if self._pool_entry is None:
+                        raise Exception("No pooled browser to spare")
+                    driver = self._pool_entry[1]
+                else:
+                    # Never attach to the daemon, the IMDb side of the run may already be using it
+                    driver = setup_driver(self.account.download_dir, attach=False)
+                if not login_to_letterboxd(driver, self.account):
+                    raise Exception("Failed to log in to Letterboxd")
+        except Exception as e:
+            logging.error(f"Background Letterboxd login failed: {e}")
+            self._handoff.put((driver, False))
+        else:
+            self._handoff.put((driver, True))
+
+    def driver(self) -> webdriver.Firefox or None:
+        """
+        Wait for the login to finish and take over its browser.
+
+        Returns:
+            The logged in driver on the import page, or None if the login failed.
+        """
+        if not self._taken:
+            self._driver, self._logged_in = self._handoff.get()
+            self._taken = True
+        return self._driver if self._logged_in else None
+
+    def close(self) -> None:
+        """
+        Wait for the login thread, if it was started, and quit its browser or return it to the pool.
+        """
+        if self._thread.ident is not None:
+            self.driver()
+        if self._pool_entry is not None:
+            self.pool.release(self._pool_entry)
+            self._pool_entry = None
+        elif self._driver is not None:
+            try:
+                self._driver.quit()
+            except WebDriverException as e:
+                logging.error(f"Error closing the Letterboxd browser: {e}")
+        self._driver = None
+
+def get_latest_csv_from_downloads(download_dir: str = DOWNLOAD_DIR) -> str or None:
+    """
+    Get the path of the most recently downloaded CSV file from the downloads directory.
+
+    Args:
+        download_dir: Directory to search for CSV files.
+
+    Returns:
+        The path to the latest CSV file, or None if no CSV files are found.
+    """
+    try:
+        csv_files = [f for f in os.listdir(download_dir) if f.endswith('.csv')]
+        if not csv_files:
+            logging.error("No CSV files found in downloads directory")
+            return None
+
+        # Find the CSV file with the most recent modification time
+        latest_csv = max([os.path.join(download_dir, f) for f in csv_files],
+                            key=os.path.getmtime)
+        logging.info(f"Found latest CSV file: {latest_csv}")
+        return latest_csv
+    except Exception as e:
+        logging.error(f"Error finding latest CSV file: {e}")
+        return None
+
+def wait_for_element_with_text(driver: webdriver.Firefox, text: str, timeout: int = 10, scope: str = "strong, a, button, h1, h2, h3, label") -> webdriver.remote.webelement.WebElement or None:
+    """
+    Wait for an element containing specific text to appear.
+
+    The elements matching the scope are checked first, the whole page only if none of them has the text.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        text: The text to search for within the element.
+        timeout: The maximum time to wait in seconds.
+        scope: CSS selector of the elements that usually hold the text.
+
+    Returns:
+        The WebElement if found, None otherwise.
+    """
+    selectors = (("css selector", scope, text), ("xpath", f"//*[contains(text(), '{text}')]"))
+    try:
+        return find_with_selectors(driver, f"text:{text}", selectors, timeout)[0]
+    except TimeoutException:
+        return None
+
+# Import Timeouts
+IMPORT_THROUGHPUT_HISTORY_SIZE = 20  # Number of observed durations kept per import phase.
+
+# The status and row selectors end in generic fallbacks (live regions, any table row or film
+# entry), so an importer whose markup differs still shows progress as its page grows.
+IMPORT_PROGRESS_SCRIPT = """
+const status = document.querySelector('#import-status') || document.querySelector('[role="status"], [aria-live]');
+const bar = document.querySelector('progress, [role="progressbar"]');
+const rows = document.querySelectorAll('.import-table tr').length || document.querySelectorAll('table tr, [data-film-slug], [data-imdb-id]').length;
+return [
+    status ? status.textContent.trim() : '',
+    rows ? String(rows) : '',
+    bar ? (bar.getAttribute('value') || bar.getAttribute('aria-valuenow') || '') : '',
+].join('|');
+"""
+
+def count_csv_rows(csv_path: str) -> int:
+    """
+    Count the data rows of a CSV file without loading it.
+
+    Args:
+        csv_path: The CSV file.
+
+    Returns:
+        The number of rows after the header.
+    """
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+def load_import_throughput() -> dict:
+    """
+    Load the observed Letterboxd matching and saving durations.
+
+    Returns:
+        A dict mapping "matching" and "saving" to lists of [rows, seconds] samples, oldest first.
+    """
+    try:
+        with open(IMPORT_THROUGHPUT_PATH, encoding='utf-8') as f:
+            history = json.load(f)
+        return history if isinstance(history, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def record_import_throughput(phase: str, rows: int, seconds: float) -> None:
+    """
+    Append an observed duration to the history used to size the import timeouts.
+
+    Args:
+        phase: "matching" or "saving".
+        rows: Rows in the upload.
+        seconds: How long the phase took.
+    """
+    if rows <= 0 or seconds <= 0:
+        return
+
+    def update(history):
+        samples = list(history.get(phase, [])) + [[rows, round(seconds, 2)]]
+        history[phase] = samples[-IMPORT_THROUGHPUT_HISTORY_SIZE:]
+
+    try:
+        update_state_file(IMPORT_THROUGHPUT_PATH, update)
+    except OSError as e:
+        logging.error(f"Error saving import throughput: {e}")
+
+def fit_import_duration(samples: list) -> tuple:
+    """
+    Fit an import phase's duration as a fixed overhead plus a time per row.
+
+    The time per row is the median slope between every two samples with different row
+    counts, and the overhead the median of what each sample leaves over. Page load and
+    matching setup dominate small uploads, so they go into the overhead instead of making
+    the page look slow per row, and a single stalled run does not move either median.
+
+    Args:
+        samples: Observed (rows, seconds) pairs.
+
+    Returns:
+        An (overhead, seconds per row) tuple. Without samples of two different sizes the
+        overhead is 0 and the time per row is the median observed, or the default speed.
+    """
+    import statistics
+    from itertools import combinations
+
+    slopes = [(seconds_b - seconds_a) / (rows_b - rows_a) for (rows_a, seconds_a), (rows_b, seconds_b) in combinations(samples, 2) if rows_a != rows_b]
+    if slopes:
+        per_row = max(statistics.median(slopes), 0.0001)
+        return max(0.0, statistics.median(seconds - rows * per_row for rows, seconds in samples)), per_row
+    if samples:
+        return 0.0, statistics.median(seconds / rows for rows, seconds in samples)
+    return 0.0, 1 / IMPORT_DEFAULT_ROWS_PER_SECOND
+
+def import_timeouts(phase: str, rows: int) -> tuple:
+    """
+    Size the wait for an import phase from the upload's row count and the observed durations.
+
+    The duration is predicted by fit_import_duration. Small uploads get at least
+    IMPORT_TIMEOUT_MIN, everything else IMPORT_TIMEOUT_MARGIN times the prediction.
+
+    Args:
+        phase: "matching" or "saving".
+        rows: Rows in the upload.
+
+    Returns:
+        An (expected, timeout) tuple in seconds.
+    """
+    # Speeds recorded by older versions carry no row count and are left out
+    samples = [sample for sample in load_import_throughput().get(phase, []) if isinstance(sample, list) and len(sample) == 2 and sample[0] > 0]
+    overhead, per_row = fit_import_duration(samples)
+    expected = overhead + rows * per_row
+    return expected, max(IMPORT_TIMEOUT_MIN, expected * IMPORT_TIMEOUT_MARGIN)
+
+def wait_for_import_phase(driver: webdriver.Firefox, name: str, phase: str, rows: int):
+    """
+    Wait for the element that ends an import phase, giving up early if the page stalls.
+
+    The import page's status text, result table and progress bar are checked between
+    lookups. Stall detection only starts once one of them has been seen changing, since
+    a page without these indicators would otherwise look stalled from the start. From then
+    on, once the expected duration has passed, the wait gives up if none of them changed
+    for IMPORT_STALL_TIMEOUT seconds, instead of waiting for the full timeout.
+    The phase's speed is recorded when it completes.
+
+    Args:
+        driver: The Selenium WebDriver instance, on the import page.
+        name: Key of the element in LOCATORS that appears when the phase is done.
+        phase: "matching" or "saving".
+        rows: Rows in the upload.
+
+    Returns:
+        The element.
+
+    Raises:
+        TimeoutError: If the page stalls.
+        TimeoutException: If the phase does not finish within its timeout.
+    """
+    expected, timeout = import_timeouts(phase, rows)
+    logging.info(f"Waiting up to {timeout:.0f}s for Letterboxd {phase} of {rows} rows (expected {expected:.0f}s).")
+    start_time = time.perf_counter()
+    progress = {"signature": None, "changed_at": start_time, "armed": False}
+
+    def check_progress():
+        now = time.perf_counter()
+        try:
+            signature = driver.execute_script(IMPORT_PROGRESS_SCRIPT) or ""
+        except WebDriverException:
+            signature = progress["signature"]  # A page mid-update counts as no change
+        if signature != progress["signature"]:
+            # The first reading is only a baseline, and a page without indicators never arms the check
+            progress["armed"] = progress["armed"] or (progress["signature"] is not None and bool(signature.strip("|")))
+            progress["signature"], progress["changed_at"] = signature, now
+        elif progress["armed"] and now - start_time >= expected and now - progress["changed_at"] >= IMPORT_STALL_TIMEOUT:
+            raise TimeoutError(
+                f"Letterboxd {phase} stalled: no progress for {now - progress['changed_at']:.0f}s "
+                f"after {now - start_time:.0f}s (expected {expected:.0f}s)"
+            )
+
+    element = locate(driver, name, timeout=timeout, poll_interval=1, on_miss=check_progress)
+    record_import_throughput(phase, rows, time.perf_counter() - start_time)
+    return element
+
+def import_to_letterboxd(driver: webdriver.Firefox, csv_path: str, on_matches=None, kind: str = "ratings") -> bool:
+    """
+    Import ratings to Letterboxd using the downloaded CSV file.
+
+    With LETTERBOXD_CSV_FORMAT the file is converted to Letterboxd's import columns first.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        csv_path: The path to the downloaded IMDb ratings CSV file.
+        on_matches: Optional callable receiving the (IMDb id, Letterboxd slug or None) match results shown on the page.
+        kind: The kind of IMDb list in the file, which picks the importer from LETTERBOXD_IMPORT_PATHS.
+
+    Returns:
+        True if the import is successful, False otherwise.
+    """
+    logging.info(f"Starting Letterboxd {kind} import process...")
+    upload_path = csv_path
+
+    try:
+        rows = count_csv_rows(csv_path)  # Sizes the matching and saving timeouts
+        if LETTERBOXD_CSV_FORMAT:
+            upload_path = os.path.splitext(csv_path)[0] + "_letterboxd.csv"
+            with timed_stage("convert"):
+                convert_to_letterboxd_csv(csv_path, upload_path, ratings=kind == "ratings")
+
+        # Navigate to the IMDb import section on the import page
+        navigate(driver, f"{LETTERBOXD_BASE_URL}{LETTERBOXD_IMPORT_PATHS[kind]}#imdb-import")
+        random_delay(2, 3)
+
+        # An intermittent "Continue" button may come before the import link, wait for whichever shows first
+        state, select_file_button = wait_for_any(driver, ("letterboxd_continue", "letterboxd_select_file"), clickable=True)
+        if state == "letterboxd_continue":
+            logging.info("Found the 'Continue' button. Clicking it.")
+            try:
+                select_file_button.click()
+                random_delay(1, 2)
+            except WebDriverException as e:
+                logging.error(f"Error while handling the 'Continue' button: {e}")
+            select_file_button = locate(driver, "letterboxd_select_file", clickable=True)
+        else:
+            logging.info("The 'Continue' button was not shown, proceeding with import.")
+
+        # Click the link to select the IMDb CSV file
+        select_file_button.click()
+        random_delay()
+
+        with timed_stage("upload"):
+            # Locate the file input element and send the path to the CSV file
+            file_input = locate(driver, "letterboxd_file_input")
+            file_input.send_keys(os.path.abspath(upload_path))
+            wait_engine().until(
+                lambda: driver.execute_script("return arguments[0].files.length > 0;", file_input),
+                timeout=10,
+                message="The CSV file was not attached to the upload field",
+            )
+            logging.info("CSV file selected for upload")
+
+            if not HEADLESS_MODE:
+                # A visible browser opens the native file dialog, which the page cannot observe
+                import pyautogui  # Needs a display, so only imported when one is used
+
+                wait_engine().sleep(2)  # Give time for the file dialog to open
+                pyautogui.press('enter')  # Simulate pressing Enter to close the file dialog
+                wait_engine().sleep(1)
+                pyautogui.press('enter')
+
+        with timed_stage("matching"):
+            # Wait for the matching process to complete
+            wait_for_import_phase(driver, "letterboxd_matching_complete", "matching", rows)
+            logging.info("Film matching process completed")
+            if on_matches:
+                try:
+                    on_matches(scrape_match_results(driver, csv_path))
+                except (WebDriverException, OSError, sqlite3.Error) as e:
+                    logging.error(f"Error recording match results: {e}")
+        random_delay(2, 3)
+
+        with timed_stage("importing"):
+            # Find and click the "Import Films" button
+            import_button = locate(driver, "letterboxd_import_films", clickable=True)
+            import_button.click()
+            logging.info("Started importing films")
+
+            # Wait for the import completion message
+            saved_films_element = wait_for_import_phase(driver, "letterboxd_saved", "saving", rows)
+
+        # Extract the number of saved films from the completion message
+        saved_films_text = saved_films_element.text
+        num_films = ''.join(filter(str.isdigit, saved_films_text))
+        logging.info(f"Successfully imported {num_films} films to Letterboxd")
+
+        return True
+    except Exception as e:
+        logging.error(f"Error during Letterboxd import: {e}")
+        return False
+    finally:
+        if upload_path != csv_path and os.path.exists(upload_path):
+            try:
+                os.remove(upload_path)
+            except OSError as e:
+                logging.error(f"Error deleting file: {e}")
+
+# Match Cache
+MATCH_RESULTS_SCRIPT = """
+return arguments[0].map(row => {
+    const link = row.querySelector('a[href*="/film/"]');
+    const slug = link ? (link.getAttribute('href').match(/\\/film\\/([^\\/]+)/) || [])[1] : null;
+    const imdbLink = row.querySelector('a[href*="imdb.com/title/"]');
+    const imdbId = row.getAttribute('data-imdb-id')
+        || (imdbLink ? (imdbLink.getAttribute('href').match(/title\\/(tt\\d+)/) || [])[1] : null);
+    return [imdbId || null, row.classList.contains('-unmatched') ? null : (slug || null)];
+});
+"""
+
+def scrape_match_results(driver: webdriver.Firefox, csv_path: str) -> list:
+    """
+    Read the match results Letterboxd shows after matching an upload.
+
+    The result rows are found through the "letterboxd_match_rows" locator, so fallback hits
+    and misses show up in the run report. Rows without an IMDb id attribute or IMDb link are
+    paired with the uploaded CSV by position, which is only done when the page lists exactly
+    one row per uploaded rating.
+
+    Args:
+        driver: The Selenium WebDriver instance, on the matched import page.
+        csv_path: The uploaded CSV.
+
+    Returns:
+        A list of (IMDb id, Letterboxd slug) tuples. The slug is None for unmatched titles.
+    """
+    elements = locate_all(driver, "letterboxd_match_rows")
+    if not elements:
+        logging.warning("Found no match results on the Letterboxd import page, the match cache is not updated. "
+                        "Check the 'letterboxd_match_rows' locator against the page.")
+        return []
+    rows = driver.execute_script(MATCH_RESULTS_SCRIPT, elements) or []
+    if any(not imdb_id for imdb_id, _ in rows):
+        with open(csv_path, newline='', encoding='utf-8-sig') as source:
+            uploaded = [(row.get("Const") or "").strip() for row in csv.DictReader(source)]
+        if len(uploaded) != len(rows):
+            logging.warning("Could not pair the match results with the uploaded ratings, not caching them.")
+            return [(imdb_id, slug) for imdb_id, slug in rows if imdb_id]
+        rows = [(imdb_id or const, slug) for (imdb_id, slug), const in zip(rows, uploaded)]
+    return [(imdb_id, slug) for imdb_id, slug in rows if imdb_id]
+
+def open_match_cache(db_path: str) -> sqlite3.Connection:
+    """
+    Open the cache of Letterboxd match results, creating it if needed.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        An open SQLite connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS match_cache ("
+        "const TEXT PRIMARY KEY, "
+        "slug TEXT, "  # NULL when Letterboxd found no film
+        "checked_at REAL NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS match_cache_unmatched ON match_cache (checked_at) WHERE slug IS NULL")
+    conn.commit()
+    return conn
+
+def record_match_results(conn: sqlite3.Connection, results: list) -> None:
+    """
+    Store the match results of an import.
+
+    Args:
+        conn: Connection to the match cache.
+        results: (IMDb id, Letterboxd slug or None) tuples.
+    """
+    checked_at = time.time()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO match_cache (const, slug, checked_at) VALUES (?, ?, ?)",
+            ((const, slug, checked_at) for const, slug in results)
+        )
+    unmatched = sum(1 for _, slug in results if slug is None)
+    logging.info(f"Cached {len(results)} match results ({unmatched} unmatched).")
+
+def preflight_unmatched(conn: sqlite3.Connection, csv_path: str, output_path: str, report_path: str = None) -> tuple:
+    """
+    Hold back ratings of titles Letterboxd recently failed to match, so it does not match them again.
+
+    Args:
+        conn: Connection to the match cache.
+        csv_path: The CSV about to be uploaded.
+        output_path: Where to write the ratings that should still be uploaded.
+        report_path: Optional CSV listing the held back titles.
+
+    Returns:
+        A (written, held back) tuple of row counts.
+    """
+    since = time.time() - MATCH_CACHE_MAX_AGE
+    unmatched = dict(conn.execute("SELECT const, checked_at FROM match_cache WHERE slug IS NULL AND checked_at >= ?", (since,)))
+    written = 0
+    held_back = []
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as source:
+        reader = csv.DictReader(source)
+        with open(output_path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.DictWriter(target, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            for row in reader:
+                const = (row.get("Const") or "").strip()
+                if const in unmatched:
+                    held_back.append((const, row.get("Title", ""), row.get("Year", ""), date.fromtimestamp(unmatched[const]).isoformat()))
+                    continue
+                writer.writerow(row)
+                written += 1
+
+    if held_back:
+        logging.info(f"Held back {len(held_back)} titles that Letterboxd could not match before:")
+        for const, title, year, _ in held_back:
+            logging.info(f"  {const} {title} ({year})")
+        if report_path:
+            try:
+                with open(report_path, 'w', newline='', encoding='utf-8') as f:
+                    report = csv.writer(f)
+                    report.writerow(["Const", "Title", "Year", "Last Checked"])
+                    report.writerows(held_back)
+            except OSError as e:
+                logging.error(f"Error writing unmatched titles report: {e}")
+    return written, len(held_back)
+
+# Incremental Sync
+RATING_STATE_FIELDS = ("Your Rating", "Date Rated")  # Columns whose change means a rating must be re-imported.
+
+def open_state_store(db_path: str) -> sqlite3.Connection:
+    """
+    Open the local snapshot store of already imported ratings, creating it if needed.
+
+    Args:
+        db_path: Path to the SQLite database file.
+
+    Returns:
+        An open SQLite connection.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS imported_ratings ("
+        "const TEXT PRIMARY KEY, "
+        "rating_hash TEXT NOT NULL, "
+        "imported_at REAL NOT NULL)"
+    )
+    conn.commit()
+    return conn
+
+def rating_fingerprint(row: dict) -> str:
+    """
+    Compute a stable fingerprint of the rating-relevant columns of an IMDb export row.
+
+    Args:
+        row: A row of the IMDb export as returned by csv.DictReader.
+
+    Returns:
+        A hex digest that changes whenever the rating or its date changes.
+    """
+    payload = "|".join((row.get(field) or "").strip() for field in RATING_STATE_FIELDS)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def write_rating_delta(conn: sqlite3.Connection, csv_path: str, delta_path: str) -> int:
+    """
+    Write the ratings that are new or changed since the last successful import to a separate CSV.
+
+    Args:
+        conn: Connection to the snapshot store.
+        csv_path: The full IMDb ratings export.
+        delta_path: Where to write the CSV containing only the pending ratings.
+
+    Returns:
+        The number of ratings written to delta_path.
+
+    Raises:
+        ValueError: If the export has no header row.
+    """
+    known = dict(conn.execute("SELECT const, rating_hash FROM imported_ratings"))
+    pending = 0
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as source:
+        reader = csv.DictReader(source)
+        if not reader.fieldnames:
+            raise ValueError(f"IMDb export has no header row: {csv_path}")
+
+        with open(delta_path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.DictWriter(target, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            for row in reader:
+                const = (row.get("Const") or "").strip()
+                if const and known.get(const) != rating_fingerprint(row):
+                    writer.writerow(row)
+                    pending += 1
+
+    logging.info(f"{pending} new or changed ratings out of {len(known)} previously imported.")
+    return pending
+
+def record_imported_ratings(conn: sqlite3.Connection, csv_path: str) -> None:
+    """
+    Remember the ratings of a successfully imported CSV so later runs can skip them.
+
+    Args:
+        conn: Connection to the snapshot store.
+        csv_path: The CSV file that was imported to Letterboxd.
+    """
+    imported_at = time.time()
+    with open(csv_path, newline='', encoding='utf-8-sig') as source:
+        rows = (
+            (row["Const"].strip(), rating_fingerprint(row), imported_at)
+            for row in csv.DictReader(source)
+            if (row.get("Const") or "").strip()
         )
-        logging.info("Clicking login button.")
-        login_button.click()
-        random_delay(2, 3)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO imported_ratings (const, rating_hash, imported_at) VALUES (?, ?, ?)",
+                rows
+            )
+    logging.info(f"Recorded imported ratings from {csv_path} in the local state store.")
+
+# Upload Normalization
+CONST_PATTERN = re.compile(r"^tt\d+$")
+
+@lru_cache(maxsize=64)
+def title_type_key(title_type: str) -> str:
+    """
+    Normalize an IMDb title type so "TV Movie", "tvMovie" and "tv movie" compare equal.
+
+    Args:
+        title_type: The Title Type value from the export.
+
+    Returns:
+        The lowercase title type without spaces or punctuation.
+    """
+    return re.sub(r"[^a-z]", "", title_type.lower())
+
+def filter_title_types(rows, allowed_types, stats: Counter):
+    """
+    Drop rows whose Title Type Letterboxd cannot match, such as TV series or video games.
+
+    Args:
+        rows: Iterable of export rows.
+        allowed_types: Title types to keep.
+        stats: Counter that receives the number of dropped rows.
+
+    Yields:
+        Rows with an allowed title type. Rows without a Title Type column pass through.
+    """
+    allowed = {title_type_key(title_type) for title_type in allowed_types}
+    for row in rows:
+        title_type = row.get("Title Type")
+        if title_type is not None and title_type_key(title_type) not in allowed:
+            stats["wrong_title_type"] += 1
+            continue
+        yield row
+
+def dedupe_by_const(rows, stats: Counter):
+    """
+    Keep only the first row for each IMDb Const id.
+
+    Only the numeric part of each id is held in memory, never the rows themselves.
+
+    Args:
+        rows: Iterable of validated export rows.
+        stats: Counter that receives the number of dropped duplicates.
+
+    Yields:
+        Rows with an id not seen before.
+    """
+    seen = set()
+    for row in rows:
+        key = int(row["Const"][2:])
+        if key in seen:
+            stats["duplicate"] += 1
+            continue
+        seen.add(key)
+        yield row
+
+def validate_ratings(rows, stats: Counter):
+    """
+    Drop rows with a malformed id, a rating outside 1-10, or an invalid rating date.
+
+    Values are stripped of surrounding whitespace in place.
+
+    Args:
+        rows: Iterable of export rows.
+        stats: Counter that receives the number of dropped malformed rows.
+
+    Yields:
+        Valid rows.
+    """
+    for row in rows:
+        const = (row.get("Const") or "").strip()
+        rating = (row.get("Your Rating") or "").strip()
+        date_rated = (row.get("Date Rated") or "").strip()
+        try:
+            if not CONST_PATTERN.match(const) or not 1 <= int(rating) <= 10:
+                raise ValueError
+            if date_rated:
+                date.fromisoformat(date_rated)
+        except ValueError:
+            stats["malformed"] += 1
+            continue
+        row["Const"], row["Your Rating"], row["Date Rated"] = const, rating, date_rated
+        yield row
+
+def normalize_imdb_export(csv_path: str, output_path: str, allowed_types=ALLOWED_TITLE_TYPES) -> Counter:
+    """
+    Stream an IMDb export through validation, title type filtering and de-duplication into a trimmed upload file.
+
+    Rows are processed one at a time, so memory use does not grow with the size of the export.
+
+    Args:
+        csv_path: The IMDb export.
+        output_path: Where to write the rows that should be uploaded.
+        allowed_types: IMDb title types to keep.
+
+    Returns:
+        A Counter with "read" and "written" totals and the number of rows dropped per reason.
+
+    Raises:
+        ValueError: If the export has no header row or no Const column.
+    """
+    stats = Counter()
+    with open(csv_path, newline='', encoding='utf-8-sig') as source:
+        reader = csv.DictReader(source)
+        if not reader.fieldnames or "Const" not in reader.fieldnames:
+            raise ValueError(f"IMDb export has no Const column: {csv_path}")
+
+        with open(output_path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.DictWriter(target, fieldnames=reader.fieldnames, extrasaction='ignore')
+            writer.writeheader()
+
+            def counted(rows):
+                for row in rows:
+                    stats["read"] += 1
+                    yield row
+
+            rows = validate_ratings(counted(reader), stats)
+            rows = filter_title_types(rows, allowed_types, stats)
+            for row in dedupe_by_const(rows, stats):
+                writer.writerow(row)
+                stats["written"] += 1
+
+    logging.info(
+        f"Normalized export: kept {stats['written']} of {stats['read']} rows "
+        f"({stats['wrong_title_type']} other title types, {stats['duplicate']} duplicates, {stats['malformed']} malformed)."
+    )
+    return stats
+
+# Letterboxd import columns and the IMDb export columns they are filled from
+LETTERBOXD_CSV_COLUMNS = {"imdbID": "Const", "Title": "Title", "Year": "Year", "Rating10": "Your Rating", "WatchedDate": "Date Rated"}
+LETTERBOXD_LIST_COLUMNS = ("imdbID", "Title", "Year")  # Watchlists and lists carry no ratings
+
+def convert_to_letterboxd_csv(csv_path: str, output_path: str, ratings: bool = True) -> int:
+    """
+    Stream an IMDb export into Letterboxd's own import CSV format.
+
+    The IMDb id is carried through as imdbID so Letterboxd can match on it directly, and
+    the columns Letterboxd ignores are dropped. Every row is written in order, so the match
+    results can still be paired with the IMDb export by position.
+
+    Args:
+        csv_path: The IMDb export.
+        output_path: Where to write the Letterboxd CSV.
+        ratings: Include the rating and the date rated. False for watchlists and lists.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        ValueError: If the export has no header row or no Const column.
+    """
+    columns = LETTERBOXD_CSV_COLUMNS if ratings else {name: LETTERBOXD_CSV_COLUMNS[name] for name in LETTERBOXD_LIST_COLUMNS}
+    written = 0
+    with open(csv_path, newline='', encoding='utf-8-sig') as source:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if not header or "Const" not in header:
+            raise ValueError(f"IMDb export has no Const column: {csv_path}")
+        indexes = [header.index(imdb_column) if imdb_column in header else None for imdb_column in columns.values()]
+
+        with open(output_path, 'w', newline='', encoding='utf-8') as target:
+            writer = csv.writer(target)
+            writer.writerow(columns)
+            for row in reader:
+                writer.writerow([row[index].strip() if index is not None and index < len(row) else "" for index in indexes])
+                written += 1
+    return written
+
+def write_synthetic_export(csv_path: str, rows: int, seed: int = 0) -> None:
+    """
+    Write a synthetic IMDb export with a realistic mix of title types, duplicates and bad rows.
+
+    Args:
+        csv_path: Where to write the export.
+        rows: Number of data rows.
+        seed: Random seed, so runs are comparable.
+    """
+    rng = random.Random(seed)
+    title_types = ["Movie"] * 16 + ["TV Series", "TV Episode", "Video Game", "Short", "TV Movie"]
+    header = ["Const", "Your Rating", "Date Rated", "Title", "Original Title", "URL", "Title Type",
+              "IMDb Rating", "Runtime (mins)", "Year", "Genres", "Num Votes", "Release Date", "Directors"]
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            const = f"tt{rng.randrange(rows) if rng.random() < 0.03 else i:07d}"  # Some duplicates
+            rating = str(rng.randint(1, 10)) if rng.random() > 0.01 else "n/a"  # Some malformed ratings
+            writer.writerow([
+                const, rating, f"20{rng.randint(10, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                f"Film {i}", f"Film {i}", f"https://www.imdb.com/title/{const}/", rng.choice(title_types),
+                f"{rng.uniform(1, 10):.1f}", str(rng.randint(60, 200)), str(rng.randint(1920, 2024)),
+                "Drama, Comedy", str(rng.randint(10, 2000000)), "2001-01-01", "Some Director",
+            ])
+
+def benchmark_normalizer(rows: int = 100000) -> dict:
+    """
+    Measure normalizer throughput and peak memory on a synthetic export.
+
+    Args:
+        rows: Number of rows in the synthetic export.
+
+    Returns:
+        A dict with the row counts, elapsed seconds, rows per second and peak traced memory in bytes.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = os.path.join(temp_dir, "export.csv")
+        target = os.path.join(temp_dir, "upload.csv")
+        write_synthetic_export(source, rows)
+
+        start_time = time.perf_counter()
+        stats = normalize_imdb_export(source, target)
+        elapsed = time.perf_counter() - start_time
+
+        # Measure memory in a second pass, tracing slows the first one down too much
+        import tracemalloc
+
+        tracemalloc.start()
+        normalize_imdb_export(source, target)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {
+            "rows_read": stats["read"],
+            "rows_written": stats["written"],
+            "input_bytes": os.path.getsize(source),
+            "output_bytes": os.path.getsize(target),
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(stats["read"] / elapsed) if elapsed else None,
+            "peak_memory_bytes": peak,
+        }
+    logging.info(f"Normalizer benchmark: {json.dumps(result)}")
+    return result
+
+# Chunked Import
+IMPORT_PROGRESS_SIZE = 500  # Number of imported chunk fingerprints remembered per account.
+
+def split_csv_into_chunks(csv_path: str, chunk_size: int, output_dir: str) -> list:
+    """
+    Split a CSV into files of at most chunk_size rows, each with the original header.
+
+    Args:
+        csv_path: The CSV to split.
+        chunk_size: Maximum number of data rows per chunk.
+        output_dir: Directory for the chunk files.
+
+    Returns:
+        A list of (chunk path, row count) tuples in file order.
+    """
+    chunks = []
+    target = None
+    try:
+        with open(csv_path, newline='', encoding='utf-8-sig') as source:
+            reader = csv.reader(source)
+            header = next(reader, None)
+            for row in reader:
+                if target is None or chunks[-1][1] >= chunk_size:
+                    if target is not None:
+                        target.close()
+                    chunk_path = os.path.join(output_dir, f"chunk_{len(chunks) + 1:04d}.csv")
+                    target = open(chunk_path, 'w', newline='', encoding='utf-8')
+                    writer = csv.writer(target)
+                    writer.writerow(header)
+                    chunks.append([chunk_path, 0])
+                writer.writerow(row)
+                chunks[-1][1] += 1
+    finally:
+        if target is not None:
+            target.close()
+    return [tuple(chunk) for chunk in chunks]
+
+def file_fingerprint(path: str) -> str:
+    """
+    Compute a content hash of a file.
+
+    Args:
+        path: The file to hash.
+
+    Returns:
+        The SHA-1 hex digest of the file contents.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_import_progress(account: AccountConfig) -> set:
+    """
+    Load the fingerprints of chunks already imported for an account.
+
+    Args:
+        account: The account being imported.
+
+    Returns:
+        A set of chunk fingerprints.
+    """
+    try:
+        with open(IMPORT_PROGRESS_PATH, encoding='utf-8') as f:
+            return set(json.load(f).get(account.name, []))
+    except (OSError, ValueError, AttributeError):
+        return set()
+
+def mark_chunk_imported(account: AccountConfig, fingerprint: str) -> None:
+    """
+    Record that a chunk was imported, so a retry after a later failure skips it.
+
+    Args:
+        account: The account being imported.
+        fingerprint: The chunk's content fingerprint.
+    """
+    def update(progress):
+        fingerprints = [value for value in progress.get(account.name, []) if value != fingerprint] + [fingerprint]
+        progress[account.name] = fingerprints[-IMPORT_PROGRESS_SIZE:]
+
+    try:
+        update_state_file(IMPORT_PROGRESS_PATH, update)
+    except OSError as e:
+        logging.error(f"Error saving import progress: {e}")
+
+def import_in_chunks(driver: webdriver.Firefox, account: AccountConfig, csv_path: str, chunk_size: int, on_chunk_imported=None, on_matches=None) -> bool:
+    """
+    Import a CSV to Letterboxd in batches of rows, one import per batch.
+
+    Chunks imported by an earlier run are skipped, so after a failure only the failed chunk
+    and the ones after it are imported again. The time taken by each chunk is logged to
+    help tune the chunk size.
+
+    Args:
+        driver: The Selenium WebDriver instance, logged in to Letterboxd.
+        account: The account being imported.
+        csv_path: The CSV file to upload.
+        chunk_size: Maximum number of ratings per import.
+        on_chunk_imported: Optional callable receiving the path of each imported chunk.
+        on_matches: Optional callable passed on to import_to_letterboxd for each chunk.
+
+    Returns:
+        True if every chunk was imported, False otherwise.
+    """
+    chunk_dir = tempfile.mkdtemp(prefix="chunks_", dir=os.path.dirname(os.path.abspath(csv_path)))
+    try:
+        chunks = split_csv_into_chunks(csv_path, chunk_size, chunk_dir)
+        imported = load_import_progress(account)
+        logging.info(f"Importing {sum(rows for _, rows in chunks)} ratings in {len(chunks)} chunks of up to {chunk_size}.")
+
+        for index, (chunk_path, rows) in enumerate(chunks, start=1):
+            fingerprint = file_fingerprint(chunk_path)
+            if fingerprint in imported:
+                logging.info(f"Chunk {index}/{len(chunks)} was already imported, skipping.")
+                continue
+
+            start_time = time.time()
+            if not import_to_letterboxd(driver, chunk_path, on_matches=on_matches):
+                logging.error(f"Chunk {index}/{len(chunks)} failed, it will be retried on the next run.")
+                return False
+            elapsed = time.time() - start_time
+
+            mark_chunk_imported(account, fingerprint)
+            if on_chunk_imported:
+                on_chunk_imported(chunk_path)
+            rate = rows / elapsed if elapsed > 0 else 0.0
+            logging.info(f"Chunk {index}/{len(chunks)}: {rows} ratings in {elapsed:.1f}s ({rate:.1f} ratings/s).")
+        return True
+    finally:
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+
+def schedule_task(task_name: str, python_path: str, script_path: str, scheduled_time: str, task_action: str = "create") -> None:
+    """
+    Schedule or modify a task in Windows Task Scheduler.
+
+    Args:
+        task_name: The name of the scheduled task.
+        python_path: The path to the Python executable.
+        script_path: The path to the Python script.
+        scheduled_time: The time to run the task (HH:MM).
+        task_action: "create" to create, "update" to modify, "delete" to remove the task.
+    """
+    task_command = f'"{python_path}" "{script_path}" run'  # Run without the interactive prompts
+    if task_action == "create":
+        command = ["schtasks", "/create", "/tn", task_name, "/tr", task_command, "/sc", "daily", "/st", scheduled_time, "/f"]
+    elif task_action == "update":
+        command = ["schtasks", "/change", "/tn", task_name, "/tr", task_command, "/st", scheduled_time]
+    elif task_action == "delete":
+        command = ["schtasks", "/delete", "/tn", task_name, "/f"]  # Command to delete the task
+    else:
+        logging.error(f"Invalid task action: {task_action}")
+        return
+
+    try:
+        subprocess.run(command, check=True)  # Execute the schtasks command
+        if task_action == "delete":
+            print(f"Task '{task_name}' deleted successfully.")
+        elif task_action == "create":
+            print(f"Task '{task_name}' created successfully.")
+        elif task_action == "update":
+            print(f"Task '{task_name}' updated successfully.")
+
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"Error scheduling task: {e}")
+        logging.error(f"Error scheduling task: {e}")
+
+def check_if_task_exists(task_name: str) -> bool:
+    """
+    Check if a scheduled task with the given name exists.
+
+    Args:
+        task_name: The name of the scheduled task to check.
+
+    Returns:
+        True if the task exists, False otherwise.
+    """
+    try:
+        command = ["schtasks", "/query", "/tn", task_name]
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)  # Suppress output
+        return True  # Task exists
+
+    except (subprocess.CalledProcessError, OSError):
+        return False  # Task does not exist, or schtasks is not available on this system
+
+# In-Process Scheduler
+CRON_FIELDS = (("minute", 0, 59), ("hour", 0, 23), ("day of month", 1, 31), ("month", 1, 12), ("day of week", 0, 7))
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+def parse_cron_field(spec: str, name: str, low: int, high: int) -> set:
+    """
+    Parse one field of a cron expression, e.g. "*/15", "1-5" or "0,30".
+
+    Args:
+        spec: The field text.
+        name: Field name for error messages.
+        low: Smallest allowed value.
+        high: Largest allowed value.
+
+    Returns:
+        The set of matching values.
+
+    Raises:
+        ValueError: If the field is malformed or out of range.
+    """
+    values = set()
+    for part in spec.split(","):
+        value_range, _, step = part.partition("/")
+        if value_range == "*":
+            start, end = low, high
+        elif "-" in value_range:
+            start, end = (int(value) for value in value_range.split("-", 1))
+        else:
+            start = end = int(value_range)
+            if step:
+                end = high  # "5/10" means every 10 starting at 5
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron {name} out of range: {part}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    if name == "day of week" and 7 in values:
+        values.discard(7)
+        values.add(0)  # 7 is Sunday too
+    return values
+
+class CronSchedule:
+    """
+    A standard five-field cron expression: minute, hour, day of month, month and day of week.
+
+    As in cron, when both day of month and day of week are restricted, a day matching
+    either one is scheduled. The aliases @hourly, @daily, @weekly and @monthly are accepted.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Args:
+            expression: The cron expression, in local time.
+
+        Raises:
+            ValueError: If the expression is malformed.
+        """
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression}")
+        try:
+            self.minutes, self.hours, self.days, self.months, self.weekdays = (
+                parse_cron_field(spec, name, low, high) for spec, (name, low, high) in zip(fields, CRON_FIELDS)
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}")
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def day_matches(self, moment: datetime) -> bool:
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays  # cron counts from Sunday
+        if self._any_day or self._any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Get the first scheduled minute after a moment.
+
+        Args:
+            moment: A naive local datetime.
+
+        Returns:
+            The next scheduled datetime, strictly after moment.
+
+        Raises:
+            ValueError: If the expression never matches, like "0 0 31 2 *".
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self.day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+class RunLock:
+    """
+    An exclusive, non-blocking lock on a file that keeps two syncs from running at once.
+
+    The lock belongs to the process holding the file open, so it is released even if that
+    process crashes. Use it as a context manager and check `acquired`.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: The lock file.
+        """
+        self.path = path
+        self.acquired = False
+        self._file = None
+
+    def __enter__(self) -> "RunLock":
+        self._file = open(self.path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            self.acquired = True
+        except OSError:
+            self._file.close()
+            self._file = None
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._file is not None:
+            if fcntl is None:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()  # Closing releases the flock
+            self._file = None
+        self.acquired = False
+
+class Scheduler:
+    """
+    Run a job on a cron schedule inside this process.
+
+    Each start is delayed by a random jitter. Scheduled times that passed while the machine
+    was asleep are covered by the one run that starts on waking. Scheduled times that passed
+    while the job was running are coalesced into a single catch-up run right after it. The
+    clock and sleep functions can be replaced, so the schedule can be tested without waiting.
+    """
+
+    def __init__(self, schedule: CronSchedule, job, jitter: float = SCHEDULE_JITTER, lock_path: str = SCHEDULER_LOCK_PATH, now=datetime.now, sleep=time.sleep):
+        """
+        Args:
+            schedule: When to run the job.
+            job: Callable run at each scheduled time.
+            jitter: Maximum random delay in seconds added to each start.
+            lock_path: Lock file that prevents overlapping runs, also with runs started elsewhere.
+            now: Callable returning the current naive local datetime.
+            sleep: Callable sleeping for a number of seconds.
+        """
+        self.schedule = schedule
+        self.job = job
+        self.jitter = jitter
+        self.lock_path = lock_path
+        self.now = now
+        self.sleep = sleep
+
+    def sleep_until(self, moment: datetime) -> None:
+        """
+        Sleep until a moment, waking up every minute so clock jumps after a suspend are noticed.
+
+        Args:
+            moment: When to wake up.
+        """
+        while True:
+            remaining = (moment - self.now()).total_seconds()
+            if remaining <= 0:
+                return
+            self.sleep(min(remaining, 60))
+
+    def run_once(self) -> bool:
+        """
+        Run the job unless another run holds the lock.
+
+        Returns:
+            True if the job ran, False if it was skipped.
+        """
+        with RunLock(self.lock_path) as lock:
+            if not lock.acquired:
+                logging.warning("Another sync is still running, skipping this scheduled run.")
+                return False
+            try:
+                self.job()
+            except Exception as e:
+                logging.exception(f"Scheduled run failed: {e}")
+            return True
+
+    def run(self, max_runs: int = None) -> int:
+        """
+        Run the job at every scheduled time.
+
+        Args:
+            max_runs: Stop after this many scheduled runs, or run forever if None.
+
+        Returns:
+            The number of scheduled runs, including skipped ones.
+        """
+        runs = 0
+        catch_up = False
+        due = self.schedule.next_after(self.now())
+        while max_runs is None or runs < max_runs:
+            if catch_up:
+                logging.info("Starting the catch-up run now.")
+            else:
+                start_at = due + timedelta(seconds=random.uniform(0, self.jitter)) if self.jitter else due
+                logging.info(f"Next run at {start_at.isoformat(timespec='seconds')} ({self.schedule.expression}).")
+                self.sleep_until(start_at)
+
+            started = self.now()
+            self.run_once()
+            runs += 1
+
+            # Times that passed before the run started are covered by it, the ones during it get one catch-up run
+            now = self.now()
+            if not catch_up:
+                due = self.schedule.next_after(due)  # A catch-up run leaves the next scheduled time pending
+            covered = missed = 0
+            while due <= now:
+                if due <= started:
+                    covered += 1
+                else:
+                    missed += 1
+                due = self.schedule.next_after(due)
+            if covered:
+                logging.info(f"Coalesced {covered} missed scheduled run(s) into the last run.")
+            catch_up = missed > 0
+            if catch_up:
+                logging.info(f"{missed} scheduled run(s) came due while the last run was going, coalescing them into one catch-up run.")
+        return runs
+
+class WarmSync:
+    """
+    The scheduled sync job, keeping the browser open between runs.
+
+    The browser is checked before each run and restarted if it stopped responding.
+    """
+
+    def __init__(self):
+        self.driver = None
+
+    def __call__(self) -> bool:
+        account = default_account()
+        metrics = RunMetrics(account.name)
+        os.makedirs(account.download_dir, exist_ok=True)
+        if self.driver is not None:
+            try:
+                self.driver.current_url  # Cheap round trip to check the browser is alive
+            except WebDriverException:
+                logging.warning("The kept browser stopped responding, starting a new one.")
+                self.close()
+        if self.driver is None:
+            with metrics.stage("setup_driver"):
+                self.driver = setup_driver(account.download_dir)
+        return sync_account(self.driver, account, metrics)
+
+    def close(self) -> None:
+        """
+        Quit the kept browser.
+        """
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+def run_scheduler(expression: str = SCHEDULE_CRON, jitter: float = SCHEDULE_JITTER) -> None:
+    """
+    Run the sync on a cron schedule until interrupted.
+
+    Args:
+        expression: Cron expression of the run times, in local time.
+        jitter: Maximum random delay in seconds added to each start.
+    """
+    job = WarmSync()
+    try:
+        Scheduler(CronSchedule(expression), job, jitter).run()
+    except KeyboardInterrupt:
+        logging.info("Scheduler stopped.")
+    finally:
+        job.close()
+
+# Run Checkpoints
+# Letterboxd's import page does not survive between runs, so the upload and matching are not
+# stages of their own: a resumed run always uploads again from the normalized file.
+PIPELINE_STAGES = ("exported", "downloaded", "normalized", "imported")
+
+class RunCheckpoint:
+    """
+    The pipeline stages an account's current run has finished, persisted after each stage.
+
+    A stage may carry the file it produced. A stage only counts as done while it is younger
+    than CHECKPOINT_MAX_AGE and its file still exists, so stale exports are redone.
+    """
+
+    def __init__(self, account: AccountConfig, path: str):
+        """
+        Args:
+            account: The account the run belongs to.
+            path: The checkpoint file, shared by all accounts. None disables checkpoints.
+        """
+        self.account_name = account.name
+        self.path = path
+        self.stages = {}
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.stages = dict(json.load(f).get(account.name, {}))
+            except (OSError, ValueError, AttributeError, TypeError):
+                self.stages = {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+
+        def update(checkpoints):
+            if self.stages:
+                checkpoints[self.account_name] = dict(self.stages)
+            else:
+                checkpoints.pop(self.account_name, None)
+
+        try:
+            update_state_file(self.path, update)
+        except OSError as e:
+            logging.error(f"Error saving run checkpoint: {e}")
 
-        # Verify successful login by checking for an element on the account settings page
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, "//h1[@class='title-hero -textleft js-hide-in-app' and text()='Account Settings']"))
-        )
+    def done(self, stage: str) -> bool:
+        """
+        Check whether a stage finished recently enough to be skipped.
 
-        logging.info("Successfully logged into Letterboxd")
+        Args:
+            stage: One of PIPELINE_STAGES.
 
-        # Navigate to the import page after successful login
-        driver.get("https://letterboxd.com/import/")
-        logging.info("Navigated to Letterboxd import page.")
+        Returns:
+            True if the stage is done and its file, if any, still exists.
+        """
+        entry = self.stages.get(stage)
+        if not entry or time.time() - entry.get("at", 0) > CHECKPOINT_MAX_AGE:
+            return False
+        return not entry.get("file") or os.path.exists(entry["file"])
+
+    def file(self, stage: str) -> str or None:
+        """
+        Get the file a finished stage produced.
+
+        Args:
+            stage: One of PIPELINE_STAGES.
+
+        Returns:
+            The file path, or None if the stage is not done or produced no file.
+        """
+        return self.stages[stage].get("file") if self.done(stage) else None
+
+    def first_incomplete(self) -> str or None:
+        """
+        Returns:
+            The first stage that still has to run, or None if the run is complete.
+        """
+        return next((stage for stage in PIPELINE_STAGES if not self.done(stage)), None)
+
+    def mark(self, stage: str, file: str = None) -> None:
+        """
+        Record a finished stage and persist the checkpoint.
+
+        Args:
+            stage: One of PIPELINE_STAGES.
+            file: The file the stage produced, if any.
+        """
+        self.stages[stage] = {"at": time.time(), "file": os.path.abspath(file) if file else None}
+        self._save()
+
+    def clear(self, remove_files: bool = True) -> None:
+        """
+        Forget the run, deleting the files it produced.
+
+        Args:
+            remove_files: Whether to delete the stage files.
+        """
+        if remove_files:
+            for entry in self.stages.values():
+                if entry.get("file") and os.path.exists(entry["file"]):
+                    try:
+                        os.remove(entry["file"])
+                        logging.info(f"Deleted downloaded file: {entry['file']}")
+                    except OSError as e:
+                        logging.error(f"Error deleting file: {e}")
+        self.stages = {}
+        self._save()
+
+def sync_account(driver: webdriver.Firefox, account: AccountConfig, metrics: RunMetrics = None, resume: bool = False, pool: DriverPool = None) -> bool:
+    """
+    Run the IMDb export and Letterboxd import for one account on an already started driver.
+
+    Each finished stage is checkpointed. If the run fails, the export and the normalized file
+    are kept so a resumed run can continue from the first incomplete stage.
+
+    With OVERLAP_LETTERBOXD_LOGIN, Letterboxd is logged into in a second browser while IMDb
+    prepares the export, and the upload is handed to that browser as soon as it is ready. If
+    the run turns out to have nothing to import, the second browser is closed right away. If
+    that login fails, the run logs in on its own.
+
+    The account's extra lists are exported in the same IMDb session, polled together with the
+    ratings and imported through their Letterboxd importers after the ratings. They are not
+    checkpointed, a resumed run leaves them to the next full run.
+
+    Args:
+        driver: The Selenium WebDriver instance.
+        account: The account to sync.
+        metrics: Metrics to record the stages in. A new RunMetrics is used if not given.
+        resume: Continue the account's last failed run instead of starting over.
+        pool: The batch's driver pool, which lends the second browser of OVERLAP_LETTERBOXD_LOGIN.
+
+    Returns:
+        True if the account was synced successfully, False otherwise.
+    """
+    os.makedirs(account.download_dir, exist_ok=True)  # Ensure the download directory exists
+    downloaded_file = None  # Initialize to handle potential errors
+    normalized_file = None
+    delta_file = None
+    preflight_file = None
+    list_files = {}  # Downloaded exports of the account's extra lists, by list
+    missing_lists = []
+    state_conn = None
+    match_conn = None
+    background_login = None
+    success = False
+    metrics = metrics or RunMetrics(account.name)
+    metrics_token = current_metrics.set(metrics)
+    engine = WaitEngine()
+    engine_token = current_wait_engine.set(engine)
+    checkpoint = RunCheckpoint(account, CHECKPOINT_PATH)
+    if not resume:
+        checkpoint.clear()
+    elif checkpoint.first_incomplete() == PIPELINE_STAGES[0]:
+        logging.info("Nothing to resume, starting a new run.")
+    else:
+        logging.info(f"Resuming the last run, which stopped before the '{checkpoint.first_incomplete()}' stage.")
+
+    try:
+        # Fail before exporting anything if an extra list is misspelled
+        if any(imdb_list_kind(source) == "ratings" for source in account.extra_lists):
+            raise ValueError("The ratings are always exported, remove them from the extra lists")
+
+        if OVERLAP_LETTERBOXD_LOGIN:
+            # Log in to Letterboxd while IMDb prepares the export
+            background_login = BackgroundLetterboxdLogin(account, pool).start()
+
+        # Part 1: IMDb Export
+        downloaded_file = checkpoint.file("downloaded")
+        if downloaded_file:
+            logging.info(f"Reusing the downloaded export: {downloaded_file}")
+        else:
+            logging.info("Starting IMDb Export process...")
+            with timed_stage("imdb_login"):
+                if not login_to_imdb(driver, account):
+                    raise Exception("IMDb login failed")
+
+            export_reused = checkpoint.done("exported")
+            exports = {"ratings": IMDB_EXPORT_LABELS["ratings"]}  # Name the exports page shows for each list
+            if export_reused:
+                logging.info("Reusing the export started by the last run.")
+            else:
+                with timed_stage("imdb_ratings_page"):
+                    navigate_to_imdb_ratings(driver, account)
+                    exports["ratings"] = read_imdb_list_title(driver, "ratings")
 
+                with timed_stage("imdb_initiate_export"):
+                    if not initiate_imdb_export(driver):
+                        raise Exception("Failed to initiate IMDb export")
+                checkpoint.mark("exported")
+
+            if account.extra_lists and not export_reused:
+                # Start the other exports right away so IMDb prepares them alongside the ratings
+                with timed_stage("imdb_initiate_list_exports"):
+                    for source in account.extra_lists:
+                        navigate_to_imdb_list(driver, account, source)
+                        title = read_imdb_list_title(driver, source)
+                        if initiate_imdb_export(driver):
+                            exports[source] = title
+                        else:
+                            logging.error(f"Failed to initiate the export of IMDb {source}, skipping it.")
+
+                with timed_stage("imdb_export"):
+                    list_files = monitor_imdb_exports(driver, account, exports)
+                    downloaded_file = list_files.pop("ratings", None)
+                    if not downloaded_file:
+                        raise Exception("Failed to download IMDb export file")
+                missing_lists = [source for source in account.extra_lists if source not in list_files]
+            elif account.extra_lists:
+                # The last run may have started the extra lists after the ratings, so pick the ratings out by name
+                with timed_stage("imdb_export"):
+                    downloaded_file = monitor_imdb_exports(driver, account, exports, window=1 + len(account.extra_lists)).get("ratings")
+                    if not downloaded_file:
+                        raise Exception("Failed to download IMDb export file")
+            else:
+                with timed_stage("imdb_export"):
+                    downloaded_file = monitor_imdb_export_status(driver, account)
+                    if not downloaded_file:
+                        raise Exception("Failed to download IMDb export file")
+            checkpoint.mark("downloaded", downloaded_file)
+
+        logging.info(f"IMDb ratings downloaded to: {downloaded_file}")
+        if resume and account.extra_lists and not list_files and not missing_lists:
+            logging.info("The resumed run reuses the ratings export, the extra lists are synced by the next full run.")
+
+        upload_file = downloaded_file
+        if NORMALIZE_UPLOAD:
+            normalized_file = checkpoint.file("normalized")
+            if normalized_file:
+                logging.info(f"Reusing the normalized export: {normalized_file}")
+                upload_file = normalized_file
+            else:
+                normalized_file = os.path.splitext(downloaded_file)[0] + "_normalized.csv"
+                with timed_stage("normalize"):
+                    written = normalize_imdb_export(downloaded_file, normalized_file)["written"]
+                if written == 0:
+                    logging.info("The export contains no ratings that Letterboxd can import.")
+                    upload_file = None
+                else:
+                    checkpoint.mark("normalized", normalized_file)
+                    upload_file = normalized_file
+        else:
+            checkpoint.mark("normalized")
+
+        if upload_file and INCREMENTAL_SYNC:
+            # Only upload what changed since the last successful import
+            state_conn = open_state_store(account.state_db_path)
+            delta_file = os.path.splitext(downloaded_file)[0] + "_delta.csv"
+            with timed_stage("delta"):
+                pending = write_rating_delta(state_conn, upload_file, delta_file)
+            if pending == 0:
+                logging.info("No new or changed ratings since the last import.")
+                upload_file = None
+            else:
+                upload_file = delta_file
+
+        if upload_file and MATCH_CACHE_PATH:
+            # Don't make Letterboxd match titles it could not match recently
+            match_conn = open_match_cache(MATCH_CACHE_PATH)
+            preflight_file = os.path.splitext(downloaded_file)[0] + "_preflight.csv"
+            with timed_stage("preflight"):
+                pending, _ = preflight_unmatched(match_conn, upload_file, preflight_file, UNMATCHED_REPORT_PATH)
+            if pending == 0:
+                logging.info("Only titles that Letterboxd cannot match are left.")
+                upload_file = None
+            else:
+                upload_file = preflight_file
+
+        if not upload_file and not list_files:
+            logging.info("Nothing to import. Skipping Letterboxd.")
+            if background_login:
+                background_login.close()
+            success = not missing_lists
+            return success
+
+        # Part 2: Letterboxd Import
+        logging.info("Starting Letterboxd Import process...")
+        letterboxd_driver = None
+        if background_login:
+            # Whatever is left of the background login is on the critical path
+            with timed_stage("letterboxd_login_wait"):
+                letterboxd_driver = background_login.driver()
+            if not letterboxd_driver:
+                logging.info("Logging in to Letterboxd in the IMDb browser instead.")
+        if not letterboxd_driver:
+            letterboxd_driver = driver
+            with timed_stage("letterboxd_login"):
+                if not login_to_letterboxd(driver, account):
+                    raise Exception("Failed to log in to Letterboxd")
+
+        def record_import(imported_file):
+            if state_conn:
+                record_imported_ratings(state_conn, imported_file)
+
+        def record_matches(results):
+            if match_conn:
+                record_match_results(match_conn, results)
+
+        if upload_file:
+            with timed_stage("letterboxd_import"):
+                if IMPORT_CHUNK_SIZE > 0:
+                    if not import_in_chunks(letterboxd_driver, account, upload_file, IMPORT_CHUNK_SIZE, on_chunk_imported=record_import,
+                                            on_matches=record_matches):
+                        raise Exception("Failed to import ratings to Letterboxd")
+                else:
+                    if not import_to_letterboxd(letterboxd_driver, upload_file, on_matches=record_matches):
+                        raise Exception("Failed to import ratings to Letterboxd")
+                    record_import(upload_file)
+        checkpoint.mark("imported")
+
+        # The extra lists are uploaded as exported, normalization and the delta only apply to ratings
+        for source, list_file in list_files.items():
+            with timed_stage(f"letterboxd_import_{source}"):
+                if not import_to_letterboxd(letterboxd_driver, list_file, on_matches=record_matches, kind=imdb_list_kind(source)):
+                    missing_lists.append(source)
+        if missing_lists:
+            raise Exception(f"Failed to sync IMDb {', '.join(missing_lists)} to Letterboxd")
+
+        logging.info("Successfully completed the entire import process!")
+        success = True
         return True
 
     except Exception as e:
-        logging.exception(f"Failed to login to Letterboxd: {e}")
+        logging.error(f"An error occurred during the process: {e}")
         return False
 
-def get_latest_csv_from_downloads() -> str or None:
+    finally:
+        if background_login:
+            background_login.close()
+        metrics.success = success
+        for temp_file in (delta_file, preflight_file, *list_files.values()):
+            if temp_file and os.path.exists(temp_file):
+                try:
+                    os.remove(temp_file)
+                except OSError as e:
+                    logging.error(f"Error deleting file: {e}")
+        if success or not CHECKPOINT_PATH or checkpoint.first_incomplete() is None:
+            # Without checkpoints nothing can resume, so the files of a failed run go too.
+            # The same goes for a run whose ratings went through and only extra lists failed.
+            for temp_file in (downloaded_file, normalized_file):
+                if temp_file and os.path.exists(temp_file):
+                    try:
+                        os.remove(temp_file)
+                        logging.info(f"Deleted downloaded file: {temp_file}")
+                    except OSError as e:
+                        logging.error(f"Error deleting file: {e}")
+            checkpoint.clear(remove_files=False)
+        else:
+            logging.info(f"Kept the files of this run, continue it with the resume command (stage '{checkpoint.first_incomplete()}').")
+        if state_conn:
+            state_conn.close()
+        if match_conn:
+            match_conn.close()
+        current_wait_engine.reset(engine_token)
+        current_metrics.reset(metrics_token)
+        metrics.waits = engine.report()
+        write_run_reports(metrics)
+
+def main(resume: bool = False) -> bool:
     """
-    Get the path of the most recently downloaded CSV file from the downloads directory.
+    Main function to execute the IMDb to Letterboxd ratings import process.
+
+    Args:
+        resume: Continue the last failed run from its first incomplete stage.
 
     Returns:
-        The path to the latest CSV file, or None if no CSV files are found.
+        True if the sync succeeded, False if it failed or another sync was already running.
     """
-    try:
-        csv_files = [f for f in os.listdir(DOWNLOAD_DIR) if f.endswith('.csv')]
-        if not csv_files:
-            logging.error("No CSV files found in downloads directory")
-            return None
+    with RunLock(SCHEDULER_LOCK_PATH) as lock:
+        if not lock.acquired:
+            logging.error("Another sync is already running.")
+            return False
 
-        # Find the CSV file with the most recent modification time
-        latest_csv = max([os.path.join(DOWNLOAD_DIR, f) for f in csv_files],
-                            key=os.path.getmtime)
-        logging.info(f"Found latest CSV file: {latest_csv}")
-        return latest_csv
-    except Exception as e:
-        logging.error(f"Error finding latest CSV file: {e}")
-        return None
+        account = default_account()
+        metrics = RunMetrics(account.name)
+        os.makedirs(account.download_dir, exist_ok=True)  # Ensure the download directory exists
+        with metrics.stage("setup_driver"):
+            driver = setup_driver(account.download_dir)
+
+        try:
+            return sync_account(driver, account, metrics, resume)
+        finally:
+            logging.info("Closing the browser.")
+            driver.quit()
 
-def wait_for_element_with_text(driver: webdriver.Firefox, text: str, timeout: int = 10) -> webdriver.remote.webelement.WebElement or None:
+# Multi-Account Batch Mode
+@dataclass
+class AccountResult:
     """
-    Wait for an element containing specific text to appear.
+    Outcome of syncing one account in batch mode.
+
+    Attributes:
+        name: The account name from the manifest.
+        success: Whether the sync completed.
+        duration: Wall-clock seconds spent on the account, including waiting for a driver.
+    """
+    name: str
+    success: bool
+    duration: float
+
+def load_account_manifest(manifest_path: str) -> list:
+    """
+    Load the accounts to sync from a JSON manifest.
+
+    The manifest is either a list of account objects or an object with an "accounts" list.
+    Each account object uses the AccountConfig field names. If "state_db_path" is omitted,
+    a separate state store named after the account is used.
 
     Args:
-        driver: The Selenium WebDriver instance.
-        text: The text to search for within the element.
-        timeout: The maximum time to wait in seconds.
+        manifest_path: Path to the JSON manifest.
 
     Returns:
-        The WebElement if found, None otherwise.
+        A list of AccountConfig instances.
+
+    Raises:
+        ValueError: If the manifest is malformed or account names are not unique.
     """
-    try:
-        return WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, f"//*[contains(text(), '{text}')]"))
-        )
-    except TimeoutException:
-        return None
+    with open(manifest_path, encoding='utf-8') as f:
+        data = json.load(f)
 
-def import_to_letterboxd(driver: webdriver.Firefox, csv_path: str) -> bool:
+    entries = data.get("accounts") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError(f"Account manifest must contain a list of accounts: {manifest_path}")
+
+    accounts = []
+    for entry in entries:
+        entry = dict(entry)
+        name = entry.get("name", "")
+        entry.setdefault("state_db_path", f"sync_state_{name}.db")
+        try:
+            accounts.append(AccountConfig(**entry))
+        except TypeError as e:
+            raise ValueError(f"Invalid account entry '{name}' in {manifest_path}: {e}")
+
+    names = [account.name for account in accounts]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Account names in {manifest_path} must be unique")
+    return accounts
+
+def reset_driver_session(driver: webdriver.Firefox) -> None:
     """
-    Import ratings to Letterboxd using the downloaded CSV file.
+    Clear IMDb and Letterboxd cookies so the next account starts logged out.
 
     Args:
         driver: The Selenium WebDriver instance.
-        csv_path: The path to the downloaded IMDb ratings CSV file.
+    """
+    # delete_all_cookies only clears the domain of the current page
+    for url in (f"{IMDB_BASE_URL}/", f"{LETTERBOXD_BASE_URL}/"):
+        driver.get(url)
+        driver.delete_all_cookies()
 
-    Returns:
-        True if the import is successful, False otherwise.
+class DriverPool:
     """
-    logging.info("Starting Letterboxd import process...")
+    A bounded pool of Firefox drivers that are started lazily and reused across accounts.
 
-    try:
-        # Navigate to the IMDb import section on the import page
-        driver.get("https://letterboxd.com/import/#imdb-import")
-        random_delay(2, 3)
+    Each pooled driver has its own download directory so concurrent exports never mix.
+    """
+
+    def __init__(self, size: int, download_root: str = DOWNLOAD_DIR):
+        """
+        Args:
+            size: Maximum number of drivers to start.
+            download_root: Directory under which each driver gets its own download directory.
+        """
+        self.size = size
+        self.download_root = download_root
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._free_slots = list(range(size))
+        self._drivers = {}
+
+    def acquire(self, block: bool = True) -> tuple or None:
+        """
+        Take an idle driver, starting a new one if the pool is not full yet.
+
+        Args:
+            block: Wait for a driver to be released when the pool is full. If False, None is returned instead.
 
-        # Check for and handle an intermittent "Continue" button
+        Returns:
+            A (slot, driver, download_dir) tuple to pass back to release().
+        """
         try:
-            continue_button = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(@class, '_2Sbg_-vS') and contains(@class, '_1CPr_04v') and contains(@class, 'f5CXro_f') and contains(@class, '_9eRJjhym') and text()='Continue']"))
-            )
-            logging.info("Found the 'Continue' button. Clicking it.")
-            continue_button.click()
-            random_delay(1, 2)
-        except TimeoutException:
-            logging.info("The 'Continue' button was not found, proceeding with import.")
-        except Exception as e:
-            logging.error(f"Error while handling the 'Continue' button: {e}")
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
 
-        # Find and click the link to select the IMDb CSV file
-        select_file_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//a[contains(@href, '#imdb-import')]"))
-        )
-        select_file_button.click()
-        random_delay()
+        with self._lock:
+            slot = self._free_slots.pop(0) if self._free_slots else None
 
-        # Locate the file input element and send the path to the CSV file
-        file_input = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']"))
-        )
-        file_input.send_keys(os.path.abspath(csv_path))
-        logging.info("CSV file selected for upload")
+        if slot is None:
+            if not block:
+                return None
+            return self._idle.get()  # Pool is full, wait for a driver to be released
+
+        download_dir = os.path.join(self.download_root, f"pool-{slot}")
+        os.makedirs(download_dir, exist_ok=True)
+        try:
+            driver = setup_driver(download_dir)
+        except Exception:
+            with self._lock:
+                self._free_slots.append(slot)
+            raise
+        with self._lock:
+            self._drivers[slot] = driver
+        logging.info(f"Started pooled browser {slot + 1}/{self.size}")
+        return slot, driver, download_dir
 
-        time.sleep(2)  # Give time for the file dialog to open
-        pyautogui.press('enter')  # Simulate pressing Enter to close the file dialog
-        time.sleep(1)
-        pyautogui.press('enter')
+    def release(self, entry: tuple) -> None:
+        """
+        Return a driver to the pool, replacing it later if it no longer responds.
 
-        # Wait for the matching process to complete
-        matching_complete = WebDriverWait(driver, 300).until(
-            EC.presence_of_element_located((By.XPATH, "//strong[contains(text(), 'Matching complete')]"))
-        )
-        logging.info("Film matching process completed")
-        random_delay(2, 3)
+        Args:
+            entry: The tuple returned by acquire().
+        """
+        slot, driver, _ = entry
+        try:
+            reset_driver_session(driver)
+            self._idle.put(entry)
+        except WebDriverException as e:
+            logging.error(f"Pooled browser {slot + 1} is unusable, discarding it: {e}")
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+            with self._lock:
+                self._drivers.pop(slot, None)
+                self._free_slots.append(slot)
 
-        # Find and click the "Import Films" button
-        import_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Import Films')]"))
-        )
-        import_button.click()
-        logging.info("Started importing films")
+    def close(self) -> None:
+        """
+        Quit every driver started by the pool.
+        """
+        with self._lock:
+            drivers = list(self._drivers.values())
+            self._drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException as e:
+                logging.error(f"Error closing pooled browser: {e}")
 
-        # Wait for the import completion message
-        saved_films_element = WebDriverWait(driver, 300).until(
-            EC.presence_of_element_located((By.XPATH, "//strong[contains(text(), 'Saved')]"))
-        )
+def run_account_in_pool(pool: DriverPool, account: AccountConfig, resume: bool = False) -> AccountResult:
+    """
+    Sync one account on a driver borrowed from the pool.
 
-        # Extract the number of saved films from the completion message
-        saved_films_text = saved_films_element.text
-        num_films = ''.join(filter(str.isdigit, saved_films_text))
-        logging.info(f"Successfully imported {num_films} films to Letterboxd")
+    Args:
+        pool: The pool to borrow a driver from.
+        account: The account to sync.
+        resume: Continue the account's last failed run instead of starting over.
 
-        return True
+    Returns:
+        The AccountResult for this account.
+    """
+    threading.current_thread().name = account.name  # Shown in batch mode log lines
+    start_time = time.time()
+    success = False
+    try:
+        entry = pool.acquire()
     except Exception as e:
-        logging.error(f"Error during Letterboxd import: {e}")
-        return False
+        logging.error(f"Could not start a browser for account {account.name}: {e}")
+    else:
+        try:
+            # Downloads land in the pooled driver's directory, not the account's
+            success = sync_account(entry[1], replace(account, download_dir=entry[2]), resume=resume, pool=pool)
+        finally:
+            pool.release(entry)
+    return AccountResult(account.name, success, time.time() - start_time)
 
-def schedule_task(task_name: str, python_path: str, script_path: str, scheduled_time: str, task_action: str = "create") -> None:
+def run_batch(manifest_path: str, pool_size: int = DRIVER_POOL_SIZE, resume: bool = False) -> list:
     """
-    Schedule or modify a task in Windows Task Scheduler.
+    Sync every account in a manifest concurrently through a bounded pool of reused drivers.
 
     Args:
-        task_name: The name of the scheduled task.
-        python_path: The path to the Python executable.
-        script_path: The path to the Python script.
-        scheduled_time: The time to run the task (HH:MM).
-        task_action: "create" to create, "update" to modify, "delete" to remove the task.
+        manifest_path: Path to the JSON account manifest.
+        pool_size: Maximum number of browsers (and accounts) running at once.
+        resume: Only continue the accounts whose last run failed, each from its first incomplete stage.
+
+    Returns:
+        A list of AccountResult, in manifest order.
     """
-    if task_action == "create":
-        command = f'schtasks /create /tn "{task_name}" /tr "{python_path} {script_path}" /sc daily /st {scheduled_time} /f'
-    elif task_action == "update":
-        command = f'schtasks /change /tn "{task_name}" /tr "{python_path} {script_path}" /sc daily /st {scheduled_time} /f'
-    elif task_action == "delete":
-        command = f'schtasks /delete /tn "{task_name}" /f'  # Command to delete the task
-    else:
-        logging.error(f"Invalid task action: {task_action}")
-        return
+    accounts = load_account_manifest(manifest_path)
+    if resume:
+        accounts = [account for account in accounts if RunCheckpoint(account, CHECKPOINT_PATH).stages]
+        if not accounts:
+            logging.info("No account of the manifest has a failed run to resume.")
+            return []
+    pool_size = max(1, min(pool_size, len(accounts)))
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s'))
 
+    logging.info(f"Syncing {len(accounts)} accounts with {pool_size} browsers...")
+    pool = DriverPool(pool_size)
+    start_time = time.time()
     try:
-        subprocess.run(command, check=True, shell=True)  # Execute the schtasks command
-        if task_action == "delete":
-            print(f"Task '{task_name}' deleted successfully.")
-        elif task_action == "create":
-            print(f"Task '{task_name}' created successfully.")
-        elif task_action == "update":
-            print(f"Task '{task_name}' updated successfully.")
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            results = list(executor.map(lambda account: run_account_in_pool(pool, account, resume), accounts))
+    finally:
+        pool.close()
+    elapsed = time.time() - start_time
 
-    except subprocess.CalledProcessError as e:
-        print(f"Error scheduling task: {e}")
-        logging.error(f"Error scheduling task: {e}")
+    for result in results:
+        status = "OK" if result.success else "FAILED"
+        logging.info(f"{result.name}: {status} in {result.duration:.1f}s")
+    succeeded = sum(result.success for result in results)
+    throughput = len(results) / elapsed * 3600 if elapsed > 0 else 0.0
+    logging.info(
+        f"Batch finished: {succeeded}/{len(results)} accounts succeeded in {elapsed:.1f}s "
+        f"({throughput:.1f} accounts/hour)"
+    )
+    return results
 
-def check_if_task_exists(task_name: str) -> bool:
+# Pipeline Benchmark
+@contextmanager
+def overridden_settings(**settings):
     """
-    Check if a scheduled task with the given name exists.
+    Temporarily replace values of the Configuration Section.
 
     Args:
-        task_name: The name of the scheduled task to check.
+        **settings: Configuration names and the values to use inside the block.
+    """
+    module_globals = globals()
+    previous = {name: module_globals[name] for name in settings}
+    module_globals.update(settings)
+    try:
+        yield
+    finally:
+        module_globals.update(previous)
+
+def benchmark_pipeline(rows: int = 1000, latency: float = 0.05, export_delay: float = 20.0, page_weight: int = 400000, resource_blocking: bool = RESOURCE_BLOCKING,
+                       overlap_login: bool = OVERLAP_LETTERBOXD_LOGIN, extra_lists: tuple = (), parse_rate: float = 1000000.0, match_rate: float = 500.0,
+                       letterboxd_format: bool = LETTERBOXD_CSV_FORMAT, http_fast_path: bool = HTTP_FAST_PATH) -> dict:
+    """
+    Run the whole export and import pipeline headless against the local stand-in sites.
+
+    Nothing touches the real sites, the local state files or the session cache, so runs
+    are reproducible and comparable.
+
+    Args:
+        rows: Number of rows in the synthetic export served by the stand-in IMDb.
+        latency: Seconds added to every stand-in response.
+        export_delay: Seconds the stand-in IMDb takes to prepare the export.
+        page_weight: Bytes of images and fonts each stand-in page references.
+        resource_blocking: Whether the browser blocks resources the automation does not need.
+        overlap_login: Whether Letterboxd is logged into in a second browser while IMDb prepares the export.
+        extra_lists: IMDb lists exported and imported along with the ratings.
+        parse_rate: Bytes per second the stand-in import page reads an upload.
+        match_rate: Rows per second the stand-in import page matches.
+        letterboxd_format: Whether uploads are converted to Letterboxd's import format.
+        http_fast_path: Whether the export is checked and downloaded over HTTP instead of through the browser.
 
     Returns:
-        True if the task exists, False otherwise.
+        The run report, with the per-stage timings, the page loads and the stand-in settings and traffic.
     """
-    try:
-        command = f'schtasks /query /tn "{task_name}"'
-        subprocess.run(command, check=True, shell=True, stdout=subprocess.DEVNULL)  # Suppress output
-        return True  # Task exists
+    from standin_sites import StandinConfig, StandinSites  # Only needed for benchmarking
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        export_path = os.path.join(temp_dir, "export.csv")
+        write_synthetic_export(export_path, rows)
+        standin_config = StandinConfig(latency=latency, export_delay=export_delay, export_csv=export_path, page_weight=page_weight,
+                                       parse_rate=parse_rate, match_rate=match_rate)
+        account = AccountConfig(
+            name="benchmark",
+            imdb_email="benchmark@example.com",
+            imdb_password="benchmark",
+            letterboxd_email="benchmark@example.com",
+            letterboxd_password="benchmark",
+            imdb_user_id="ur0000000",
+            download_dir=os.path.join(temp_dir, "downloads"),
+            state_db_path=os.path.join(temp_dir, "sync_state.db"),
+            extra_lists=tuple(extra_lists),
+        )
 
-    except subprocess.CalledProcessError:
-        return False  # Task does not exist
+        with StandinSites(standin_config) as sites, overridden_settings(
+            IMDB_BASE_URL=sites.imdb_url,
+            LETTERBOXD_BASE_URL=sites.letterboxd_url,
+            HEADLESS_MODE=True,
+            RESOURCE_BLOCKING=resource_blocking,
+            OVERLAP_LETTERBOXD_LOGIN=overlap_login,
+            LETTERBOXD_CSV_FORMAT=letterboxd_format,
+            HTTP_FAST_PATH=http_fast_path,
+            SESSION_CACHE_DIR=None,
+            EXPORT_HISTORY_PATH=os.path.join(temp_dir, "export_history.json"),
+            IMPORT_PROGRESS_PATH=os.path.join(temp_dir, "import_progress.json"),
+            IMPORT_THROUGHPUT_PATH=os.path.join(temp_dir, "import_throughput.json"),
+            CHECKPOINT_PATH=os.path.join(temp_dir, "run_checkpoint.json"),
+            MATCH_CACHE_PATH=os.path.join(temp_dir, "match_cache.db"),
+            UNMATCHED_REPORT_PATH=None,
+            METRICS_REPORT_PATH=None,
+            PROMETHEUS_TEXTFILE_PATH=None,
+        ):
+            metrics = RunMetrics(account.name)
+            os.makedirs(account.download_dir, exist_ok=True)
+            with metrics.stage("setup_driver"):
+                driver = setup_driver(account.download_dir)
+            try:
+                sync_account(driver, account, metrics)
+            finally:
+                driver.quit()
+
+            report = metrics.report()
+            report["standin"] = {
+                "rows": rows,
+                "latency": latency,
+                "export_delay": export_delay,
+                "page_weight": page_weight,
+                "resource_blocking": resource_blocking,
+                "overlap_login": overlap_login,
+                "extra_lists": list(extra_lists),
+                "parse_rate": parse_rate,
+                "match_rate": match_rate,
+                "letterboxd_format": letterboxd_format,
+                "http_fast_path": http_fast_path,
+                **sites.state.stats,
+            }
 
-def main():
+    logging.info(f"Pipeline benchmark: {json.dumps(report)}")
+    return report
+
+def post_to_standin(base_url: str, path: str, body: bytes = b"", cookie: str = None) -> "http.client.HTTPResponse":
     """
-    Main function to execute the IMDb to Letterboxd ratings import process.
+    Send a POST request to a stand-in site and read the whole response.
+
+    Args:
+        base_url: The stand-in's base URL.
+        path: The request path.
+        body: The request body.
+        cookie: Optional Cookie header.
+
+    Returns:
+        The response, already read, with its body in the data attribute.
     """
-    os.makedirs(DOWNLOAD_DIR, exist_ok=True)  # Ensure the download directory exists
-    driver = setup_driver()
-    downloaded_file = None  # Initialize to handle potential errors
+    import http.client  # Only needed for benchmarking
 
+    url = urlparse(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=600)
     try:
-        # Part 1: IMDb Export
-        logging.info("Starting IMDb Export process...")
-        if not login_to_imdb(driver):
-            raise Exception("IMDb login failed")
-
-        navigate_to_imdb_ratings(driver)
+        connection.request("POST", path, body, {"Cookie": cookie} if cookie else {})
+        response = connection.getresponse()
+        response.data = response.read()
+        return response
+    finally:
+        connection.close()
 
-        if not initiate_imdb_export(driver):
-            raise Exception("Failed to initiate IMDb export")
+def benchmark_upload_format(rows: int = 5000, parse_rate: float = 1000000.0, match_rate: float = 500.0) -> dict:
+    """
+    Compare uploading the IMDb export as is with uploading it in Letterboxd's import format.
 
-        downloaded_file = monitor_imdb_export_status(driver)
-        if not downloaded_file:
-            raise Exception("Failed to download IMDb export file")
+    Both files are normalized first, like in a run, and posted to the stand-in import page's
+    matching endpoint, so no browser is needed.
 
-        logging.info(f"IMDb ratings downloaded to: {downloaded_file}")
+    Args:
+        rows: Number of rows in the synthetic export.
+        parse_rate: Bytes per second the stand-in import page reads an upload.
+        match_rate: Rows per second the stand-in import page matches.
 
-        # Part 2: Letterboxd Import
-        logging.info("Starting Letterboxd Import process...")
-        if not login_to_letterboxd(driver):
-            raise Exception("Failed to log in to Letterboxd")
+    Returns:
+        A dict with the file size, conversion seconds and matching seconds of each format.
+    """
+    from standin_sites import StandinConfig, StandinSites  # Only needed for benchmarking
 
-        if not import_to_letterboxd(driver, downloaded_file):
-            raise Exception("Failed to import ratings to Letterboxd")
+    result = {"rows": rows, "parse_rate": parse_rate, "match_rate": match_rate}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        export_path = os.path.join(temp_dir, "export.csv")
+        imdb_path = os.path.join(temp_dir, "imdb.csv")
+        letterboxd_path = os.path.join(temp_dir, "letterboxd.csv")
+        write_synthetic_export(export_path, rows)
+        normalize_imdb_export(export_path, imdb_path)
 
-        logging.info("Successfully completed the entire import process!")
+        start_time = time.perf_counter()
+        convert_to_letterboxd_csv(imdb_path, letterboxd_path)
+        convert_seconds = time.perf_counter() - start_time
 
-    except Exception as e:
-        logging.error(f"An error occurred during the process: {e}")
+        with StandinSites(StandinConfig(parse_rate=parse_rate, match_rate=match_rate)) as sites:
+            login = post_to_standin(sites.letterboxd_url, "/user/login.do")
+            cookie = login.getheader("Set-Cookie").split(";")[0]
+            for upload_format, path in (("imdb", imdb_path), ("letterboxd", letterboxd_path)):
+                with open(path, 'rb') as f:
+                    body = f.read()
+                start_time = time.perf_counter()
+                response = post_to_standin(sites.letterboxd_url, "/import/match", body, cookie)
+                match_seconds = time.perf_counter() - start_time
+                if response.status != 200:
+                    raise RuntimeError(f"The stand-in import page answered {response.status}")
+                matched = json.loads(response.data)["matched"]
+                result[upload_format] = {
+                    "bytes": len(body),
+                    "convert_seconds": round(convert_seconds, 3) if upload_format == "letterboxd" else 0.0,
+                    "match_seconds": round(match_seconds, 3),
+                    "matched": matched,
+                }
 
-    finally:
-        logging.info("Closing the browser.")
-        if downloaded_file and os.path.exists(downloaded_file):
-            try:
-                os.remove(downloaded_file)
-                logging.info(f"Deleted downloaded file: {downloaded_file}")
-                logging.info("Operation successful")
-            except OSError as e:
-                logging.error(f"Error deleting file: {e}")
-        driver.quit()
+    result["size_ratio"] = round(result["letterboxd"]["bytes"] / result["imdb"]["bytes"], 3)
+    result["seconds_saved"] = round(
+        result["imdb"]["match_seconds"] - result["letterboxd"]["match_seconds"] - result["letterboxd"]["convert_seconds"], 3
+    )
+    logging.info(f"Upload format benchmark: {json.dumps(result)}")
+    return result
 
-if __name__ == "__main__":
+# Command Line
+def interactive_task_setup() -> None:
+    """
+    Create, update or delete the Windows scheduled task by asking the user, then offer to run now.
+    """
     TASK_EXISTS = check_if_task_exists(TASK_NAME)  # Check if the task already exists
 
     if TASK_EXISTS:
@@ -596,4 +4528,192 @@ if __name__ == "__main__":
     # Option to run the script directly after creating/modifying the scheduled task
     run_now = input("Do you want to run the script now? (y/n): ").lower()
     if run_now == 'y':
-        main()
\ No newline at end of file
+        main()
+
+def status_report() -> dict:
+    """
+    Collect the state of the sync without starting a browser.
+
+    Returns:
+        A dict with whether a sync is running, the Windows task, unfinished runs and the last run report.
+    """
+    with RunLock(SCHEDULER_LOCK_PATH) as lock:
+        running = not lock.acquired
+
+    try:
+        with open(CHECKPOINT_PATH, encoding='utf-8') as f:
+            unfinished = {name: [stage for stage in PIPELINE_STAGES if stage in stages] for name, stages in json.load(f).items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        unfinished = {}
+
+    try:
+        with open(METRICS_REPORT_PATH, encoding='utf-8') as f:
+            last_run = json.load(f)
+        last_run = {key: last_run.get(key) for key in ("account", "started_at", "success", "total_seconds", "humanization_seconds")}
+    except (OSError, ValueError, TypeError):
+        last_run = None
+
+    return {
+        "sync_running": running,
+        "windows_task": check_if_task_exists(TASK_NAME) if os.name == "nt" else None,
+        "unfinished_runs": unfinished,
+        "last_run": last_run,
+    }
+
+def benchmark_startup(repeats: int = 5) -> dict:
+    """
+    Measure the cold start of a management command against importing the browser dependencies.
+
+    Every measurement starts a fresh interpreter, and the median of the runs is reported.
+
+    Args:
+        repeats: Number of runs per measurement.
+
+    Returns:
+        A dict of median wall times in milliseconds. A measurement is None if it failed,
+        e.g. because Selenium is not installed.
+    """
+    import statistics
+
+    # Run as a module so the interpreter can reuse the cached bytecode of this file
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    module = os.path.splitext(os.path.basename(__file__))[0]
+
+    def median_ms(command):
+        times = []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            result = subprocess.run(command, cwd=script_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode != 0:
+                return None
+            times.append((time.perf_counter() - start_time) * 1000)
+        return round(statistics.median(times), 1)
+
+    result = {
+        "interpreter_ms": median_ms([sys.executable, "-c", "pass"]),
+        "status_command_ms": median_ms([sys.executable, "-m", module, "status"]),
+        "browser_modules_ms": median_ms([sys.executable, "-c", "import selenium.webdriver, pyautogui"]),
+    }
+    logging.info(f"Startup benchmark: {json.dumps(result)}")
+    return result
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+
+    Returns:
+        The parser, with one subcommand per operation.
+    """
+    parser = argparse.ArgumentParser(
+        description="Transfer IMDb ratings to Letterboxd. Without a command, sets up the Windows scheduled task interactively."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    run_parser = commands.add_parser("run", help="Sync once, or sync every account of a manifest.")
+    run_parser.add_argument("--manifest", default=ACCOUNTS_MANIFEST, help="JSON file listing accounts to sync in one batch.")
+    run_parser.add_argument("--pool-size", type=int, default=DRIVER_POOL_SIZE, help="Number of browsers reused across accounts.")
+
+    resume_parser = commands.add_parser("resume", help="Continue the last failed run from its first incomplete stage.")
+    resume_parser.add_argument("--manifest", default=ACCOUNTS_MANIFEST, help="JSON file of the batch whose failed accounts to continue.")
+    resume_parser.add_argument("--pool-size", type=int, default=DRIVER_POOL_SIZE, help="Number of browsers reused across accounts.")
+
+    schedule_parser = commands.add_parser("schedule", help="Keep running and sync on a cron schedule, or manage the Windows task.")
+    schedule_parser.add_argument("--cron", default=SCHEDULE_CRON, help="Cron expression of the run times, in local time.")
+    schedule_parser.add_argument("--jitter", type=float, default=SCHEDULE_JITTER, help="Maximum random delay in seconds added to each start.")
+    schedule_parser.add_argument("--windows-task", choices=("create", "update", "delete"),
+                                 help="Create, update or delete the Windows scheduled task instead of running the scheduler.")
+
+    commands.add_parser("status", help="Show whether a sync is running, unfinished runs and the last run.")
+    commands.add_parser("setup", help="Set up the Windows scheduled task interactively (the default).")
+
+    bench_parser = commands.add_parser("bench", help="Run a benchmark and print the results as JSON.")
+    bench_parser.add_argument("target", choices=("normalizer", "pipeline", "startup", "upload-format"), help="What to benchmark.")
+    bench_parser.add_argument("--rows", type=int, help="Rows in the synthetic export (100000 for normalizer, 1000 for pipeline, 5000 for upload-format).")
+    bench_parser.add_argument("--repeats", type=int, default=5, help="Runs per startup measurement.")
+    bench_parser.add_argument("--standin-latency", type=float, default=0.05, help="Seconds added to every stand-in response.")
+    bench_parser.add_argument("--standin-export-delay", type=float, default=20.0, help="Seconds the stand-in IMDb takes to prepare the export.")
+    bench_parser.add_argument("--standin-page-weight", type=int, default=400000, help="Bytes of images and fonts each stand-in page references.")
+    bench_parser.add_argument("--standin-parse-rate", type=float, default=1000000.0, help="Bytes per second the stand-in import page reads an upload.")
+    bench_parser.add_argument("--standin-match-rate", type=float, default=500.0, help="Rows per second the stand-in import page matches.")
+    bench_parser.add_argument("--imdb-format", dest="letterboxd_format", action="store_false", default=LETTERBOXD_CSV_FORMAT,
+                              help="Benchmark the pipeline uploading IMDb's columns instead of Letterboxd's import format.")
+    bench_parser.add_argument("--no-resource-blocking", dest="resource_blocking", action="store_false", default=RESOURCE_BLOCKING,
+                              help="Benchmark without blocking images, fonts and media, to compare page weight.")
+    bench_parser.add_argument("--login-overlap", dest="overlap_login", action="store_true", default=OVERLAP_LETTERBOXD_LOGIN,
+                              help="Benchmark with the Letterboxd login in a second browser while IMDb prepares the export.")
+    bench_parser.add_argument("--http-fast-path", dest="http_fast_path", action="store_true", default=HTTP_FAST_PATH,
+                              help="Benchmark with the export checked and downloaded over HTTP instead of through the browser.")
+    bench_parser.add_argument("--lists", nargs="*", default=[], metavar="LIST",
+                              help="IMDb lists to export along with the ratings (watchlist or list ids).")
+
+    commands.add_parser("build-profile", help="Build the reusable Firefox profile template.")
+    daemon_parser = commands.add_parser("browser-daemon", help="Keep a warm Firefox running for runs to attach to.")
+    daemon_parser.add_argument("port", type=int, nargs="?", default=BROWSER_DAEMON_PORT or 2828,
+                               help="Marionette port, set BROWSER_DAEMON_PORT to the same value.")
+    return parser
+
+def cli(argv: list = None) -> int:
+    """
+    Run the command line.
+
+    Args:
+        argv: The arguments, sys.argv[1:] if None.
+
+    Returns:
+        The process exit code.
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "run":
+        if args.manifest:
+            batch_results = run_batch(args.manifest, args.pool_size)
+            return 0 if all(result.success for result in batch_results) else 1
+        return 0 if main() else 1
+
+    if args.command == "resume":
+        if args.manifest:
+            batch_results = run_batch(args.manifest, args.pool_size, resume=True)
+            return 0 if all(result.success for result in batch_results) else 1
+        return 0 if main(resume=True) else 1
+
+    if args.command == "schedule":
+        if args.windows_task:
+            schedule_task(TASK_NAME, PYTHON_EXECUTABLE, SCRIPT_PATH, SCHEDULED_TIME, task_action=args.windows_task)
+        else:
+            run_scheduler(args.cron, args.jitter)
+        return 0
+
+    if args.command == "status":
+        print(json.dumps(status_report(), indent=2))
+        return 0
+
+    if args.command == "bench":
+        if args.target == "normalizer":
+            print(json.dumps(benchmark_normalizer(args.rows or 100000), indent=2))
+        elif args.target == "startup":
+            print(json.dumps(benchmark_startup(args.repeats), indent=2))
+        elif args.target == "upload-format":
+            print(json.dumps(benchmark_upload_format(args.rows or 5000, args.standin_parse_rate, args.standin_match_rate), indent=2))
+        else:
+            pipeline_report = benchmark_pipeline(
+                args.rows or 1000, args.standin_latency, args.standin_export_delay,
+                args.standin_page_weight, args.resource_blocking, args.overlap_login, args.lists,
+                args.standin_parse_rate, args.standin_match_rate, args.letterboxd_format, args.http_fast_path,
+            )
+            print(json.dumps(pipeline_report, indent=2))
+            return 0 if pipeline_report["success"] else 1
+        return 0
+
+    if args.command == "build-profile":
+        build_profile_template()
+        return 0
+
+    if args.command == "browser-daemon":
+        run_browser_daemon(args.port)
+        return 0
+
+    interactive_task_setup()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(cli())
@@ -0,0 +1,519 @@
+"""Local stand-ins for the IMDb and Letterboxd pages used by the importer
+
+Serves the sign-in, list, exports and import pages with the same IDs, classes and
+data-testid attributes that script_main.py looks for, so the whole pipeline can be run
+and timed without network access. Latency and the time IMDb takes to prepare an export
+can be injected to reproduce slow runs.
+
+Run it on its own with `python standin_sites.py` and point IMDB_BASE_URL and
+LETTERBOXD_BASE_URL at the printed addresses, or use `python script_main.py bench pipeline`.
+"""
+
+import csv
+import io
+import json
+import logging
+import re
+import threading
+import time
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SESSION_COOKIE = "standin_session"
+UNMATCHED_EVERY = 40  # The import page finds no film for IMDb ids that are multiples of this
+
+@dataclass
+class StandinConfig:
+    """
+    Behaviour of the stand-in sites.
+
+    Attributes:
+        latency: Seconds added to every response.
+        export_delay: Seconds from starting an export until it is ready.
+        match_rate: Rows per second the import page matches.
+        parse_rate: Bytes per second the import page reads an upload before matching it. 0 reads it instantly.
+        save_rate: Rows per second the import page saves.
+        show_continue: Whether the import page shows the intermittent 'Continue' button.
+        export_csv: The CSV served as the IMDb export. A small built-in export is served if None.
+        page_weight: Bytes of images and web fonts each page references, like the posters and fonts of the real sites.
+    """
+    latency: float = 0.0
+    export_delay: float = 5.0
+    match_rate: float = 500.0
+    parse_rate: float = 0.0
+    save_rate: float = 1000.0
+    show_continue: bool = False
+    export_csv: str = None
+    page_weight: int = 0
+
+DEFAULT_EXPORT = (
+    "Const,Your Rating,Date Rated,Title,Original Title,URL,Title Type,IMDb Rating,Runtime (mins),Year,"
+    "Genres,Num Votes,Release Date,Directors\n"
+    "tt0111161,9,2024-01-05,The Shawshank Redemption,The Shawshank Redemption,"
+    "https://www.imdb.com/title/tt0111161/,Movie,9.3,142,1994,Drama,2900000,1994-09-23,Frank Darabont\n"
+    "tt0068646,10,2024-02-11,The Godfather,The Godfather,"
+    "https://www.imdb.com/title/tt0068646/,Movie,9.2,175,1972,\"Crime, Drama\",2000000,1972-03-24,Francis Ford Coppola\n"
+)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>{head}</head>
+<body>
+{images}{body}
+</body></html>
+"""
+
+PAGE_FONT = """
+<style>
+@font-face {{ font-family: "Standin"; src: url("/static/{page}/font.woff2") format("woff2"); }}
+body {{ font-family: "Standin", sans-serif; }}
+</style>
+"""
+
+PAGE_IMAGES = """<img src="/static/{page}/poster-1.jpg" alt=""><img src="/static/{page}/poster-2.jpg" alt=""><img src="/static/{page}/poster-3.jpg" alt="">
+"""
+
+ASSET_TYPES = {".jpg": "image/jpeg", ".woff2": "font/woff2"}
+
+IMDB_SIGNIN_CHOICE = """
+<div class="list-group">
+  <a class="list-group-item" href="/ap/signin">Sign in with IMDb</a>
+</div>
+"""
+
+IMDB_SIGNIN_FORM = """
+<form method="post" action="/ap/signin">
+  <input type="email" id="ap_email" name="email">
+  <input type="password" id="ap_password" name="password">
+  <input type="submit" id="signInSubmit" value="Sign in">
+</form>
+"""
+
+IMDB_LIST_PAGE = """
+<h1 class="ipc-title__text">{title}</h1>
+<button type="button" id="export-list"><span>Export</span></button>
+<div id="export-toast"></div>
+<script>
+document.getElementById('export-list').addEventListener('click', () => {{
+    fetch('/exports/start', {{method: 'POST', credentials: 'include', body: '{source}'}})
+        .then(() => {{ document.getElementById('export-toast').textContent = 'Export started'; }});
+}});
+</script>
+"""
+
+IMDB_EXPORT_ITEM = """
+<li data-testid="user-ll-item">
+  <span>{title}</span> <span>Export {number}</span>
+  <button data-testid="export-status-button" class="{status}" data-url="/exports/{number}/{source}.csv"
+          onclick="if (this.classList.contains('READY')) window.location.href = this.dataset.url;">{label}</button>
+</li>
+"""
+
+LETTERBOXD_LOGIN_ERROR = '<div class="form-error">Your credentials don\'t match. Please try again.</div>'
+REJECTED_PASSWORD = "wrong-password"  # The Letterboxd stand-in refuses this password, to exercise the login error
+
+LETTERBOXD_LOGIN = """
+{error}
+<form method="post" action="/user/login.do">
+  <input type="email" id="field-username" name="username">
+  <input type="password" id="field-password" name="password">
+  <button type="submit">Sign in</button>
+</form>
+"""
+
+LETTERBOXD_SETTINGS = """
+<h1 class="title-hero -textleft js-hide-in-app">Account Settings</h1>
+<a href="/import/">Import</a>
+"""
+
+LETTERBOXD_CONTINUE = """
+<div id="interstitial">
+  <button type="button" class="_2Sbg_-vS _1CPr_04v f5CXro_f _9eRJjhym"
+          onclick="document.getElementById('interstitial').remove();">Continue</button>
+</div>
+"""
+
+LETTERBOXD_IMPORT = """
+{continue_button}
+<section id="imdb-import">
+  <a href="#imdb-import" class="button">Select a file</a>
+  <input type="file" id="imdb-file" name="file" accept=".csv">
+  <div id="import-status"></div>
+</section>
+<script>
+const importStatus = document.getElementById('import-status');
+document.getElementById('imdb-file').addEventListener('change', event => {
+    const file = event.target.files[0];
+    if (!file) { return; }
+    importStatus.innerHTML = '<p>Matching films…</p>';
+    file.text()
+        .then(text => fetch('/import/match', {method: 'POST', credentials: 'include', body: text}))
+        .then(response => response.json())
+        .then(result => {
+            importStatus.innerHTML = '<strong>Matching complete</strong>'
+                + '<p>' + result.matched + ' matched, ' + result.unmatched + ' not found</p>'
+                + '<a href="#" id="import-films">Import Films</a>'
+                + '<table class="import-table"><tbody>' + result.rows.map(row => row.slug
+                    ? '<tr class="import-film" data-imdb-id="' + row.imdb_id + '"><td class="film-title">'
+                        + '<a href="/film/' + row.slug + '/">' + row.slug + '</a></td></tr>'
+                    : '<tr class="import-film -unmatched" data-imdb-id="' + row.imdb_id + '"><td class="film-title">No match</td></tr>'
+                ).join('') + '</tbody></table>';
+            document.getElementById('import-films').addEventListener('click', click => {
+                click.preventDefault();
+                importStatus.innerHTML = '<p>Importing…</p>';
+                fetch('/import/save', {method: 'POST', credentials: 'include', body: result.token})
+                    .then(response => response.json())
+                    .then(saved => { importStatus.innerHTML = '<strong>Saved ' + saved.saved + ' films</strong>'; });
+            });
+        });
+});
+</script>
+"""
+
+def list_title(source: str) -> str:
+    """
+    Name of an IMDb list, shown as its page heading and on its exports.
+    """
+    return {"ratings": "Your Ratings", "watchlist": "Your Watchlist"}.get(source, f"List {source}")
+
+class StandinState:
+    """
+    Sessions and exports shared by the request handlers of both stand-in sites.
+    """
+
+    def __init__(self, config: StandinConfig):
+        """
+        Args:
+            config: Behaviour of the stand-in sites.
+        """
+        self.config = config
+        self.lock = threading.Lock()
+        self.sessions = set()
+        self.export_started = []  # (start time, exported list) of the exports, oldest first
+        self.pending_imports = {}  # Matched row counts waiting for 'Import Films', by token
+        self.stats = Counter()
+
+    def new_session(self) -> str:
+        """
+        Create a logged-in session.
+
+        Returns:
+            The session token to store in the cookie.
+        """
+        with self.lock:
+            token = f"s{len(self.sessions) + 1}-{time.time_ns()}"
+            self.sessions.add(token)
+        return token
+
+    def export_csv(self) -> bytes:
+        """
+        Get the body of the IMDb export download.
+
+        Returns:
+            The CSV bytes.
+        """
+        if self.config.export_csv:
+            with open(self.config.export_csv, 'rb') as f:
+                return f.read()
+        return DEFAULT_EXPORT.encode("utf-8")
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    Base handler with latency injection, session cookies and byte accounting.
+    """
+
+    state: StandinState = None
+    site = ""
+
+    def log_message(self, format: str, *args) -> None:
+        logging.debug(f"[{self.site}] {format % args}")
+
+    def logged_in(self) -> bool:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie and cookie[SESSION_COOKIE].value in self.state.sessions
+
+    def read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", headers: dict = None, cache_control: str = "no-store") -> None:
+        """
+        Send a complete response after the configured latency.
+
+        Args:
+            status: HTTP status code.
+            body: Response body.
+            content_type: Value of the Content-Type header.
+            headers: Extra headers.
+            cache_control: Value of the Cache-Control header.
+        """
+        if self.state.config.latency:
+            time.sleep(self.state.config.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.state.lock:
+            self.state.stats[f"{self.site}_requests"] += 1
+            self.state.stats[f"{self.site}_bytes"] += len(body)
+
+    def send_page(self, title: str, body: str, headers: dict = None) -> None:
+        head = images = ""
+        if self.state.config.page_weight:
+            page = urlparse(self.path).path.strip("/").replace("/", "-") or "home"
+            head, images = PAGE_FONT.format(page=page), PAGE_IMAGES.format(page=page)
+        page_html = PAGE_TEMPLATE.format(title=title, head=head, images=images, body=body)
+        self.send(200, page_html.encode("utf-8"), headers=headers)
+
+    def send_asset(self, path: str) -> None:
+        """
+        Serve a cacheable image or font of page_weight / 4 bytes.
+        """
+        extension = path[path.rfind("."):]
+        if extension not in ASSET_TYPES:
+            self.not_found()
+            return
+        with self.state.lock:
+            self.state.stats[f"{self.site}_asset_requests"] += 1
+        self.send(200, b"\0" * (self.state.config.page_weight // 4), ASSET_TYPES[extension], cache_control="max-age=3600")
+
+    def send_json(self, data: dict) -> None:
+        self.send(200, json.dumps(data).encode("utf-8"), "application/json")
+
+    def redirect(self, location: str, headers: dict = None) -> None:
+        self.send(303, b"", headers={"Location": location, **(headers or {})})
+
+    def login_cookie(self) -> dict:
+        return {"Set-Cookie": f"{SESSION_COOKIE}={self.state.new_session()}; Path=/; HttpOnly"}
+
+    def not_found(self) -> None:
+        self.send(404, b"Not found", "text/plain")
+
+class ImdbHandler(StandinHandler):
+    """
+    Stand-in for the IMDb sign-in, ratings, watchlist, list and exports pages.
+    """
+
+    site = "imdb"
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path.startswith("/static/"):
+            self.send_asset(path)
+        elif path == "/":
+            self.send_page("IMDb", "<h1>IMDb</h1>")
+        elif path == "/registration/signin":
+            self.send_page("Sign in", IMDB_SIGNIN_CHOICE)
+        elif path == "/ap/signin":
+            self.send_page("Sign in", IMDB_SIGNIN_FORM)
+        elif not self.logged_in():
+            self.redirect("/registration/signin")
+        elif path.startswith("/user/") and path.endswith("/ratings/"):
+            self.send_page(list_title("ratings"), IMDB_LIST_PAGE.format(title=list_title("ratings"), source="ratings"))
+        elif path.startswith("/user/") and path.endswith("/watchlist/"):
+            self.send_page(list_title("watchlist"), IMDB_LIST_PAGE.format(title=list_title("watchlist"), source="watchlist"))
+        elif re.fullmatch(r"/list/ls\d+/", path):
+            source = path.split("/")[2]
+            self.send_page(list_title(source), IMDB_LIST_PAGE.format(title=list_title(source), source=source))
+        elif path == "/exports/":
+            self.send_page("Exports", self.exports_body())
+        elif path.startswith("/exports/") and path.endswith(".csv"):
+            self.send_export(path)
+        else:
+            self.not_found()
+
+    def do_POST(self) -> None:
+        path = urlparse(self.path).path
+        body = self.read_body()
+        if path == "/ap/signin":
+            self.redirect("/", self.login_cookie())
+        elif not self.logged_in():
+            self.send(401, b"Not signed in", "text/plain")
+        elif path == "/exports/start":
+            with self.state.lock:
+                self.state.export_started.append((time.time(), body.decode("utf-8", "replace") or "ratings"))
+            self.send_json({"started": True})
+        else:
+            self.not_found()
+
+    def export_ready(self, number: int) -> bool:
+        return time.time() - self.state.export_started[number - 1][0] >= self.state.config.export_delay
+
+    def exports_body(self) -> str:
+        """
+        Render the exports list, newest first, the way IMDb lists them.
+        """
+        items = []
+        for number in range(len(self.state.export_started), 0, -1):
+            ready = self.export_ready(number)
+            items.append(IMDB_EXPORT_ITEM.format(
+                number=number,
+                source=self.state.export_started[number - 1][1],
+                title=list_title(self.state.export_started[number - 1][1]),
+                status="READY" if ready else "PROCESSING",
+                label="Ready" if ready else "In progress",
+            ))
+        return f'<h1>Exports</h1>\n<div data-testid="list-page-mc-list-content"><ul>{"".join(items)}</ul></div>'
+
+    def send_export(self, path: str) -> None:
+        try:
+            number = int(path.split("/")[2])
+            ready = 1 <= number <= len(self.state.export_started) and self.export_ready(number)
+        except ValueError:
+            ready = False
+        if not ready:
+            self.not_found()
+            return
+        source = self.state.export_started[number - 1][1]
+        self.send(200, self.state.export_csv(), "text/csv", {
+            "Content-Disposition": f'attachment; filename="{source}_{number}.csv"',
+        })
+
+class LetterboxdHandler(StandinHandler):
+    """
+    Stand-in for the Letterboxd sign-in, settings and import pages.
+    """
+
+    site = "letterboxd"
+
+    def do_GET(self) -> None:
+        path = urlparse(self.path).path
+        if path.startswith("/static/"):
+            self.send_asset(path)
+        elif path == "/":
+            self.send_page("Letterboxd", "<h1>Letterboxd</h1>")
+        elif path == "/settings/data/":
+            if self.logged_in():
+                self.send_page("Account Settings", LETTERBOXD_SETTINGS)
+            else:
+                self.send_page("Sign in", LETTERBOXD_LOGIN.format(error=""))
+        elif not self.logged_in():
+            self.redirect("/settings/data/")
+        elif path in ("/import/", "/watchlist/import/", "/list/import/"):
+            continue_button = LETTERBOXD_CONTINUE if self.state.config.show_continue else ""
+            # Not str.format, the page script is full of braces
+            self.send_page("Import", LETTERBOXD_IMPORT.replace("{continue_button}", continue_button))
+        else:
+            self.not_found()
+
+    def do_POST(self) -> None:
+        path = urlparse(self.path).path
+        body = self.read_body()
+        if path == "/user/login.do":
+            if parse_qs(body.decode("utf-8", "replace")).get("password") == [REJECTED_PASSWORD]:
+                self.send_page("Sign in", LETTERBOXD_LOGIN.format(error=LETTERBOXD_LOGIN_ERROR))
+            else:
+                self.redirect("/settings/data/", self.login_cookie())
+        elif not self.logged_in():
+            self.send(401, b"Not signed in", "text/plain")
+        elif path == "/import/match":
+            self.match(body)
+        elif path == "/import/save":
+            with self.state.lock:
+                rows = self.state.pending_imports.pop(body.decode("utf-8", "replace"), 0)
+            time.sleep(rows / self.state.config.save_rate)
+            self.send_json({"saved": rows})
+        else:
+            self.not_found()
+
+    def match(self, body: bytes) -> None:
+        """
+        Match an uploaded CSV, taking time proportional to its size and row count.
+
+        Both IMDb's export columns and Letterboxd's own import columns are accepted.
+        Every title whose IMDb id is a multiple of UNMATCHED_EVERY has no match.
+        """
+        with self.state.lock:
+            self.state.stats["letterboxd_upload_bytes"] += len(body)
+        if self.state.config.parse_rate:
+            time.sleep(len(body) / self.state.config.parse_rate)
+        rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig", "replace"))))
+        time.sleep(len(rows) / self.state.config.match_rate)
+        results = []
+        for row in rows:
+            imdb_id = (row.get("Const") or row.get("imdbID") or "").strip()
+            matched = imdb_id.startswith("tt") and imdb_id[2:].isdigit() and int(imdb_id[2:]) % UNMATCHED_EVERY != 0
+            results.append({"imdb_id": imdb_id, "slug": f"film-{imdb_id[2:].lstrip('0') or '0'}" if matched else None})
+        matched_count = sum(1 for result in results if result["slug"])
+        with self.state.lock:
+            token = f"import-{time.time_ns()}"
+            self.state.pending_imports[token] = matched_count
+        self.send_json({"matched": matched_count, "unmatched": len(rows) - matched_count, "token": token, "rows": results})
+
+class StandinSites:
+    """
+    Run the IMDb and Letterboxd stand-ins on local ports in background threads.
+
+    IMDb is served on 127.0.0.1 and Letterboxd on localhost, so the browser keeps the
+    cookies of the two sites apart like it does on the real domains.
+
+    Use it as a context manager to shut both servers down.
+    """
+
+    def __init__(self, config: StandinConfig = None, port: int = 0):
+        """
+        Args:
+            config: Behaviour of the stand-in sites.
+            port: Port of the IMDb stand-in, Letterboxd uses the next one. 0 picks free ports.
+        """
+        self.config = config or StandinConfig()
+        self.state = StandinState(self.config)
+        self._servers = []
+        for handler, site_port in ((ImdbHandler, port), (LetterboxdHandler, port + 1 if port else 0)):
+            handler_class = type(handler.__name__, (handler,), {"state": self.state})
+            server = ThreadingHTTPServer(("127.0.0.1", site_port), handler_class)
+            server.daemon_threads = True
+            self._servers.append(server)
+        self.imdb_url = f"http://127.0.0.1:{self._servers[0].server_port}"
+        self.letterboxd_url = f"http://localhost:{self._servers[1].server_port}"
+
+    def __enter__(self) -> "StandinSites":
+        for server in self._servers:
+            threading.Thread(target=server.serve_forever, name=f"standin-{server.server_port}", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop both servers.
+        """
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Serve local stand-ins for the IMDb and Letterboxd pages.")
+    parser.add_argument("--port", type=int, default=8480, help="Port of the IMDb stand-in, Letterboxd uses the next one.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--export-delay", type=float, default=5.0, help="Seconds until a started export is ready.")
+    parser.add_argument("--parse-rate", type=float, default=0.0, help="Bytes per second the import page reads an upload, 0 for instantly.")
+    parser.add_argument("--show-continue", action="store_true", help="Show the 'Continue' button on the import page.")
+    parser.add_argument("--export-csv", help="CSV file to serve as the IMDb export.")
+    parser.add_argument("--page-weight", type=int, default=0, help="Bytes of images and fonts each page references.")
+    args = parser.parse_args()
+
+    standin_config = StandinConfig(
+        latency=args.latency,
+        export_delay=args.export_delay,
+        parse_rate=args.parse_rate,
+        show_continue=args.show_continue,
+        export_csv=args.export_csv,
+        page_weight=args.page_weight,
+    )
+    with StandinSites(standin_config, args.port) as sites:
+        print(f'IMDB_BASE_URL = "{sites.imdb_url}"')
+        print(f'LETTERBOXD_BASE_URL = "{sites.letterboxd_url}"')
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+
+import pytest
+
+import script_main
+
+ROWS = [f"tt{i:07d},{i % 10 + 1},2024-01-01\n" for i in range(2000)]
+
+
+def write_like_firefox(directory, name):
+    """Write a download the way Firefox does: an empty placeholder, the data in a .part file, then a rename."""
+    path = os.path.join(directory, name)
+    open(path, "w").close()
+    with open(path + ".part", "w") as f:
+        f.write("Const,Your Rating,Date Rated\n")
+        for start in range(0, len(ROWS), 500):
+            f.writelines(ROWS[start:start + 500])
+            f.flush()
+            time.sleep(0.05)
+    os.replace(path + ".part", path)
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher_mode(request, monkeypatch):
+    if request.param == "polling":
+        monkeypatch.setattr(script_main, "open_inotify_watch", lambda directory: None)
+    return request.param
+
+
+def test_reports_only_the_finished_file(tmp_path, watcher_mode):
+    old_export = tmp_path / "old_export.csv"
+    old_export.write_text("Const\ntt0000001\n")
+
+    with script_main.DownloadWatcher(str(tmp_path)) as watcher:
+        writer = threading.Thread(target=write_like_firefox, args=(str(tmp_path), "ratings.csv"))
+        writer.start()
+        try:
+            path = watcher.wait(timeout=10)
+            # Checked before the writer is joined, so a report of the placeholder or a partial file would show
+            part_left = os.path.exists(path + ".part")
+            with open(path) as f:
+                lines = f.readlines()
+        finally:
+            writer.join()
+
+    assert path == str(tmp_path / "ratings.csv")
+    assert not part_left
+    assert len(lines) == len(ROWS) + 1
+
+
+def test_ignores_files_that_were_already_there(tmp_path, watcher_mode):
+    (tmp_path / "old_export.csv").write_text("Const\ntt0000001\n")
+    (tmp_path / "unfinished.csv").touch()
+    (tmp_path / "unfinished.csv.part").write_text("Const\n")
+
+    with script_main.DownloadWatcher(str(tmp_path)) as watcher:
+        with pytest.raises(TimeoutError):
+            watcher.wait(timeout=1)
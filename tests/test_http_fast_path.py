@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+import script_main
+from standin_sites import StandinConfig, StandinSites
+
+
+class BrokenStream:
+    """A CSV response whose connection drops after the first chunk."""
+
+    headers = {"Content-Disposition": 'attachment; filename="ratings.csv"'}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield b"Const,Your Rating\n"
+        raise ConnectionResetError("Connection reset by peer")
+
+
+class BrokenSession:
+    def get(self, url, **kwargs):
+        return BrokenStream()
+
+
+def test_failed_download_removes_its_part_file(tmp_path):
+    with pytest.raises(ConnectionResetError):
+        script_main.stream_download(BrokenSession(), "https://example.com/exports/1/ratings.csv", str(tmp_path))
+
+    assert os.listdir(tmp_path) == []
+
+
+def signed_in_session(sites):
+    requests = pytest.importorskip("requests")
+    session = requests.Session()
+    session.post(f"{sites.imdb_url}/ap/signin", data={"email": "imdb@example.com"}, allow_redirects=False)
+    session.post(f"{sites.imdb_url}/exports/start", data=b"ratings").raise_for_status()
+    return session
+
+
+def test_ready_export_is_downloaded_over_http(tmp_path):
+    with StandinSites(StandinConfig(export_delay=0)) as sites:
+        session = signed_in_session(sites)
+
+        status, path = script_main.check_export_over_http(session, f"{sites.imdb_url}/exports/", str(tmp_path))
+
+    assert status == "READY"
+    assert os.path.basename(path) == "ratings_1.csv"
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == sites.state.export_csv().decode("utf-8")
+    assert os.listdir(tmp_path) == ["ratings_1.csv"]
+
+
+def test_pending_export_is_not_downloaded(tmp_path):
+    with StandinSites(StandinConfig(export_delay=60)) as sites:
+        session = signed_in_session(sites)
+
+        assert script_main.check_export_over_http(session, f"{sites.imdb_url}/exports/", str(tmp_path)) == ("PENDING", None)
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,19 @@
+import script_main
+
+
+def test_exports_are_matched_by_list_name_not_position():
+    texts = ["Your Ratings Export 3 In progress", "List ls0001 Export 2 Ready", "Your Watchlist Export 1 Ready"]
+    exports = {"ratings": "Your Ratings", "watchlist": "Your Watchlist", "ls0001": "List ls0001"}
+
+    assert script_main.match_exports(texts, exports) == {"ratings": 0, "ls0001": 1, "watchlist": 2}
+
+
+def test_longer_names_pick_first():
+    texts = ["Ratings 2024 Export 2 Ready", "Your Ratings Export 1 Ready"]
+    exports = {"ratings": "Ratings", "ls0001": "Ratings 2024"}
+
+    assert script_main.match_exports(texts, exports) == {"ls0001": 0, "ratings": 1}
+
+
+def test_lists_without_an_entry_are_left_out():
+    assert script_main.match_exports(["Your Watchlist Export 1 Ready"], {"ratings": "Your Ratings"}) == {}
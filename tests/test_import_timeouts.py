@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+import script_main
+
+import_timeouts = script_main.import_timeouts
+
+
+class FakeTimeoutException(Exception):
+    pass
+
+
+class FakeWebDriverException(Exception):
+    pass
+
+
+class FakeElement:
+    text = "Matching complete"
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+class ImportPage:
+    """An import page whose progress indicators and finishing element are scripted over time."""
+
+    def __init__(self, signatures, done_after=None):
+        self.signatures = list(signatures)
+        self.done_after = done_after
+        self.start = time.perf_counter()
+
+    def execute_script(self, script, *args):
+        if script == script_main.IMPORT_PROGRESS_SCRIPT:
+            return self.signatures.pop(0) if len(self.signatures) > 1 else self.signatures[0]
+        return self.find_elements(None, None)
+
+    def find_elements(self, by, selector):
+        done = self.done_after is not None and time.perf_counter() - self.start >= self.done_after
+        return [FakeElement()] if done else []
+
+
+@pytest.fixture(autouse=True)
+def fast_import_waits(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "TimeoutException", FakeTimeoutException)
+    monkeypatch.setattr(script_main, "WebDriverException", FakeWebDriverException)
+    monkeypatch.setattr(script_main, "IMPORT_THROUGHPUT_PATH", str(tmp_path / "import_throughput.json"))
+    monkeypatch.setattr(script_main, "IMPORT_STALL_TIMEOUT", 0.2)
+    monkeypatch.setattr(script_main, "import_timeouts", lambda phase, rows: (0.1, 3.0))
+
+
+def test_page_without_progress_indicators_waits_for_the_full_timeout():
+    page = ImportPage(["||"], done_after=1.5)
+
+    element = script_main.wait_for_import_phase(page, "letterboxd_matching_complete", "matching", 100)
+
+    assert element.text == "Matching complete"
+
+
+def test_page_without_progress_indicators_times_out_normally():
+    page = ImportPage(["||"])
+
+    with pytest.raises(FakeTimeoutException):
+        script_main.wait_for_import_phase(page, "letterboxd_matching_complete", "matching", 100)
+
+
+def test_progress_that_stops_changing_is_a_stall():
+    page = ImportPage(["Matching films…||", "Matching films…|10|"])
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        script_main.wait_for_import_phase(page, "letterboxd_matching_complete", "matching", 100)
+    assert time.perf_counter() - start < 3.0
+
+
+def test_small_uploads_do_not_inflate_the_timeout_of_a_large_one(monkeypatch):
+    monkeypatch.setattr(script_main, "IMPORT_TIMEOUT_MARGIN", 3)
+    # Each run takes about 20s of page overhead plus 0.05s per row
+    for rows, seconds in [(5, 20.3), (10, 20.4), (8, 20.5), (12, 20.6), (1000, 70.0), (2000, 120.0)]:
+        script_main.record_import_throughput("matching", rows, seconds)
+
+    expected, timeout = import_timeouts("matching", 5000)
+
+    assert 250 <= expected <= 300
+    assert timeout == expected * 3
+
+
+def test_timeouts_use_the_default_speed_without_history(monkeypatch):
+    monkeypatch.setattr(script_main, "IMPORT_DEFAULT_ROWS_PER_SECOND", 20)
+    monkeypatch.setattr(script_main, "IMPORT_TIMEOUT_MIN", 60)
+
+    assert import_timeouts("saving", 10) == (0.5, 60)
+    assert import_timeouts("saving", 2000) == (100.0, 300.0)
@@ -0,0 +1,101 @@
+import csv
+import os
+
+import pytest
+
+import script_main
+
+HEADER = ["Const", "Your Rating", "Date Rated", "Title", "Year", "Title Type"]
+
+
+def write_export(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+def read_consts(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["Const"] for row in csv.DictReader(f)]
+
+
+@pytest.fixture
+def state_store(tmp_path):
+    conn = script_main.open_state_store(str(tmp_path / "sync_state.db"))
+    yield conn
+    conn.close()
+
+
+RATINGS = [
+    ["tt0000001", "8", "2024-01-01", "First", "2001", "Movie"],
+    ["tt0000002", "6", "2024-01-02", "Second", "2002", "Movie"],
+]
+
+
+def test_first_run_uploads_everything(tmp_path, state_store):
+    export, delta = tmp_path / "export.csv", tmp_path / "delta.csv"
+    write_export(export, RATINGS)
+
+    assert script_main.write_rating_delta(state_store, str(export), str(delta)) == 2
+    assert read_consts(delta) == ["tt0000001", "tt0000002"]
+
+
+def test_unchanged_rerun_uploads_nothing(tmp_path, state_store):
+    export, delta = tmp_path / "export.csv", tmp_path / "delta.csv"
+    write_export(export, RATINGS)
+    script_main.record_imported_ratings(state_store, str(export))
+
+    assert script_main.write_rating_delta(state_store, str(export), str(delta)) == 0
+    assert read_consts(delta) == []
+
+
+def test_changed_rating_and_new_title_are_picked_up(tmp_path, state_store):
+    export, delta = tmp_path / "export.csv", tmp_path / "delta.csv"
+    write_export(export, RATINGS)
+    script_main.record_imported_ratings(state_store, str(export))
+    write_export(export, [
+        RATINGS[0],
+        ["tt0000002", "7", "2024-03-01", "Second", "2002", "Movie"],
+        ["tt0000003", "9", "2024-03-02", "Third", "2003", "Movie"],
+    ])
+
+    assert script_main.write_rating_delta(state_store, str(export), str(delta)) == 2
+    assert read_consts(delta) == ["tt0000002", "tt0000003"]
+
+
+def test_title_changes_alone_do_not_trigger_a_reimport():
+    row = dict(zip(HEADER, RATINGS[0]))
+
+    assert script_main.rating_fingerprint(row) == script_main.rating_fingerprint({**row, "Title": "Renamed"})
+    assert script_main.rating_fingerprint(row) != script_main.rating_fingerprint({**row, "Your Rating": "9"})
+
+
+@pytest.mark.parametrize("import_succeeds", [False, True])
+def test_state_is_only_recorded_after_a_successful_import(tmp_path, monkeypatch, import_succeeds):
+    monkeypatch.setattr(script_main, "CHECKPOINT_PATH", str(tmp_path / "run_checkpoint.json"))
+    monkeypatch.setattr(script_main, "INCREMENTAL_SYNC", True)
+    monkeypatch.setattr(script_main, "MATCH_CACHE_PATH", None)
+    monkeypatch.setattr(script_main, "METRICS_REPORT_PATH", None)
+    monkeypatch.setattr(script_main, "OVERLAP_LETTERBOXD_LOGIN", False)
+    monkeypatch.setattr(script_main, "IMPORT_CHUNK_SIZE", 0)
+    monkeypatch.setattr(script_main, "login_to_letterboxd", lambda driver, account: True)
+    monkeypatch.setattr(script_main, "import_to_letterboxd", lambda driver, csv_path, **kwargs: import_succeeds)
+    account = script_main.AccountConfig("default", "imdb@example.com", "secret", "letterboxd@example.com", "secret", "ur0000000",
+                                        download_dir=str(tmp_path / "downloads"), state_db_path=str(tmp_path / "sync_state.db"))
+    os.makedirs(account.download_dir)
+    # Resume from a downloaded export, so the run goes straight to the upload
+    export = os.path.join(account.download_dir, "ratings.csv")
+    write_export(export, RATINGS)
+    checkpoint = script_main.RunCheckpoint(account, script_main.CHECKPOINT_PATH)
+    checkpoint.mark("exported")
+    checkpoint.mark("downloaded", export)
+
+    assert script_main.sync_account(object(), account, resume=True) is import_succeeds
+
+    conn = script_main.open_state_store(account.state_db_path)
+    try:
+        recorded = sorted(const for const, in conn.execute("SELECT const FROM imported_ratings"))
+    finally:
+        conn.close()
+    assert recorded == (["tt0000001", "tt0000002"] if import_succeeds else [])
@@ -0,0 +1,45 @@
+import csv
+
+import pytest
+
+import script_main
+
+HEADER = ["Const", "Your Rating", "Date Rated", "Title", "URL", "Title Type", "Year", "Directors"]
+ROW = ["tt0111161", "9", "2024-01-05", "The Shawshank Redemption", "https://www.imdb.com/title/tt0111161/", "Movie", "1994", "Frank Darabont"]
+
+
+def convert(tmp_path, ratings, header=HEADER, rows=(ROW,)):
+    export, output = tmp_path / "export.csv", tmp_path / "letterboxd.csv"
+    with open(export, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    written = script_main.convert_to_letterboxd_csv(str(export), str(output), ratings=ratings)
+    with open(output, newline="", encoding="utf-8") as f:
+        return written, list(csv.reader(f))
+
+
+def test_ratings_map_to_rating10_and_watched_date(tmp_path):
+    assert convert(tmp_path, ratings=True) == (1, [
+        ["imdbID", "Title", "Year", "Rating10", "WatchedDate"],
+        ["tt0111161", "The Shawshank Redemption", "1994", "9", "2024-01-05"],
+    ])
+
+
+def test_lists_carry_no_rating_columns(tmp_path):
+    assert convert(tmp_path, ratings=False) == (1, [
+        ["imdbID", "Title", "Year"],
+        ["tt0111161", "The Shawshank Redemption", "1994"],
+    ])
+
+
+def test_missing_export_columns_are_left_empty(tmp_path):
+    # Watchlist exports have no rating columns
+    written, rows = convert(tmp_path, ratings=True, header=["Const", "Title", "Year"], rows=[["tt0068646", "The Godfather", "1972"]])
+
+    assert rows[1] == ["tt0068646", "The Godfather", "1972", "", ""]
+
+
+def test_export_without_const_column_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        convert(tmp_path, ratings=True, header=["Title"], rows=[["The Godfather"]])
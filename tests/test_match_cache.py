@@ -0,0 +1,123 @@
+import csv
+import time
+
+import pytest
+
+import script_main
+
+
+class FakeTimeoutException(Exception):
+    pass
+
+
+class FakeWebDriverException(Exception):
+    pass
+
+
+class MatchedImportPage:
+    """An import page listing match results, answering only the registered selector it is given."""
+
+    def __init__(self, results, selector=".import-table tr.import-film"):
+        self.results = results
+        self.selector = selector
+
+    def find_elements(self, by, selector):
+        return [object() for _ in self.results] if selector == self.selector else []
+
+    def execute_script(self, script, *args):
+        assert script == script_main.MATCH_RESULTS_SCRIPT
+        return [list(result) for result in self.results]
+
+
+@pytest.fixture(autouse=True)
+def fake_selenium(monkeypatch):
+    monkeypatch.setattr(script_main, "TimeoutException", FakeTimeoutException)
+    monkeypatch.setattr(script_main, "WebDriverException", FakeWebDriverException)
+
+
+@pytest.fixture
+def match_cache(tmp_path):
+    conn = script_main.open_match_cache(str(tmp_path / "match_cache.db"))
+    yield conn
+    conn.close()
+
+
+def write_upload(path, consts):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Const", "Your Rating", "Title", "Year"])
+        for index, const in enumerate(consts):
+            writer.writerow([const, 7, f"Title {index}", 2000 + index])
+
+
+def read_consts(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["Const"] for row in csv.DictReader(f)]
+
+
+def test_preflight_holds_back_recently_unmatched_titles(tmp_path, match_cache):
+    script_main.record_match_results(match_cache, [("tt0000001", None), ("tt0000003", "some-film")])
+    with match_cache:
+        match_cache.execute("INSERT INTO match_cache VALUES (?, NULL, ?)", ("tt0000002", time.time() - script_main.MATCH_CACHE_MAX_AGE - 60))
+    upload, output, report = tmp_path / "upload.csv", tmp_path / "preflight.csv", tmp_path / "unmatched.csv"
+    write_upload(upload, ["tt0000001", "tt0000002", "tt0000003", "tt0000004"])
+
+    written, held_back = script_main.preflight_unmatched(match_cache, str(upload), str(output), str(report))
+
+    assert (written, held_back) == (3, 1)
+    # The stale miss is offered to Letterboxd again, matched and unknown titles always are
+    assert read_consts(output) == ["tt0000002", "tt0000003", "tt0000004"]
+    with open(report, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Const", "Title", "Year", "Last Checked"]
+    assert rows[1][:3] == ["tt0000001", "Title 0", "2000"]
+    assert len(rows) == 2
+
+
+def test_preflight_without_unmatched_titles_writes_no_report(tmp_path, match_cache):
+    upload, output, report = tmp_path / "upload.csv", tmp_path / "preflight.csv", tmp_path / "unmatched.csv"
+    write_upload(upload, ["tt0000001", "tt0000002"])
+
+    assert script_main.preflight_unmatched(match_cache, str(upload), str(output), str(report)) == (2, 0)
+    assert read_consts(output) == ["tt0000001", "tt0000002"]
+    assert not report.exists()
+
+
+def test_rows_without_imdb_ids_are_paired_with_the_upload_by_position(tmp_path):
+    upload = tmp_path / "upload.csv"
+    write_upload(upload, ["tt0000001", "tt0000002", "tt0000003"])
+    page = MatchedImportPage([(None, "first-film"), (None, None), ("tt0000003", "third-film")])
+
+    assert script_main.scrape_match_results(page, str(upload)) == [
+        ("tt0000001", "first-film"), ("tt0000002", None), ("tt0000003", "third-film"),
+    ]
+
+
+def test_rows_that_do_not_line_up_with_the_upload_are_not_paired(tmp_path):
+    upload = tmp_path / "upload.csv"
+    write_upload(upload, ["tt0000001", "tt0000002", "tt0000003"])
+    page = MatchedImportPage([(None, "first-film"), ("tt0000003", "third-film")])
+
+    assert script_main.scrape_match_results(page, str(upload)) == [("tt0000003", "third-film")]
+
+
+def test_fallback_selector_finds_the_rows_and_is_reported(tmp_path):
+    upload = tmp_path / "upload.csv"
+    write_upload(upload, ["tt0000001"])
+    page = MatchedImportPage([("tt0000001", "first-film")], selector="[data-imdb-id]")
+    metrics = script_main.RunMetrics("default")
+    token = script_main.current_metrics.set(metrics)
+    try:
+        assert script_main.scrape_match_results(page, str(upload)) == [("tt0000001", "first-film")]
+    finally:
+        script_main.current_metrics.reset(token)
+
+    assert metrics.locator_report()["letterboxd_match_rows"]["fallback_hits"] == 1
+
+
+def test_page_without_match_rows_is_reported(tmp_path, caplog):
+    upload = tmp_path / "upload.csv"
+    write_upload(upload, ["tt0000001"])
+
+    assert script_main.scrape_match_results(MatchedImportPage([], selector=None), str(upload)) == []
+    assert "letterboxd_match_rows" in caplog.text
@@ -0,0 +1,77 @@
+import csv
+
+import pytest
+
+import script_main
+
+HEADER = ["Const", "Your Rating", "Date Rated", "Title", "Year", "Title Type"]
+
+
+def write_export(path, rows, header=HEADER):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_disallowed_title_types_are_dropped(tmp_path):
+    export, output = tmp_path / "export.csv", tmp_path / "normalized.csv"
+    write_export(export, [
+        ["tt0000001", "8", "2024-01-01", "A Film", "2001", "Movie"],
+        ["tt0000002", "7", "2024-01-02", "A Series", "2002", "TV Series"],
+        ["tt0000003", "6", "2024-01-03", "A Game", "2003", "videoGame"],
+        ["tt0000004", "9", "2024-01-04", "A TV Film", "2004", "tvMovie"],
+    ])
+
+    stats = script_main.normalize_imdb_export(str(export), str(output))
+
+    assert [row[0] for row in read_rows(output)[1:]] == ["tt0000001", "tt0000004"]
+    assert (stats["read"], stats["written"], stats["wrong_title_type"]) == (4, 2, 2)
+
+
+def test_duplicate_consts_keep_the_first_row(tmp_path):
+    export, output = tmp_path / "export.csv", tmp_path / "normalized.csv"
+    write_export(export, [
+        ["tt0000001", "8", "2024-01-01", "A Film", "2001", "Movie"],
+        ["tt0000002", "7", "2024-01-02", "Another Film", "2002", "Movie"],
+        [" tt0000001 ", "5", "2024-02-01", "A Film", "2001", "Movie"],
+    ])
+
+    stats = script_main.normalize_imdb_export(str(export), str(output))
+
+    assert read_rows(output)[1:] == [
+        ["tt0000001", "8", "2024-01-01", "A Film", "2001", "Movie"],
+        ["tt0000002", "7", "2024-01-02", "Another Film", "2002", "Movie"],
+    ]
+    assert stats["duplicate"] == 1
+
+
+@pytest.mark.parametrize("row", [
+    ["nm0000001", "8", "2024-01-01", "Not a title id", "2001", "Movie"],
+    ["tt0000002", "11", "2024-01-01", "Rating out of range", "2001", "Movie"],
+    ["tt0000003", "n/a", "2024-01-01", "Rating not a number", "2001", "Movie"],
+    ["tt0000004", "8", "2024-13-01", "Invalid date", "2001", "Movie"],
+    ["tt0000005"],
+])
+def test_malformed_rows_are_dropped(tmp_path, row):
+    export, output = tmp_path / "export.csv", tmp_path / "normalized.csv"
+    write_export(export, [row, [" tt0000009 ", " 7 ", "", "Valid", "2009", "Movie"]])
+
+    stats = script_main.normalize_imdb_export(str(export), str(output))
+
+    # Surrounding whitespace is trimmed and an empty rating date is allowed
+    assert read_rows(output)[1:] == [["tt0000009", "7", "", "Valid", "2009", "Movie"]]
+    assert (stats["malformed"], stats["written"]) == (1, 1)
+
+
+def test_export_without_const_column_is_rejected(tmp_path):
+    export = tmp_path / "export.csv"
+    write_export(export, [["8", "A Film"]], header=["Your Rating", "Title"])
+
+    with pytest.raises(ValueError):
+        script_main.normalize_imdb_export(str(export), str(tmp_path / "normalized.csv"))
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+
+import script_main
+
+
+def make_account(name):
+    return script_main.AccountConfig(name, "imdb@example.com", "secret", "letterboxd@example.com", "secret", "ur0000000")
+
+
+def test_concurrent_accounts_keep_their_checkpoints(tmp_path):
+    path = str(tmp_path / "run_checkpoint.json")
+    accounts = [make_account(f"account{i}") for i in range(8)]
+    errors = []
+    start = threading.Barrier(len(accounts))
+
+    def run(account):
+        try:
+            checkpoint = script_main.RunCheckpoint(account, path)
+            start.wait()
+            for stage in script_main.PIPELINE_STAGES:
+                checkpoint.mark(stage)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(account,)) for account in accounts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(path, encoding="utf-8") as f:
+        checkpoints = json.load(f)
+    assert sorted(checkpoints) == sorted(account.name for account in accounts)
+    for account in accounts:
+        assert script_main.RunCheckpoint(account, path).first_incomplete() is None
+    assert os.listdir(tmp_path) == ["run_checkpoint.json"]
+
+
+def test_clear_only_drops_its_own_account(tmp_path):
+    path = str(tmp_path / "run_checkpoint.json")
+    first = script_main.RunCheckpoint(make_account("first"), path)
+    second = script_main.RunCheckpoint(make_account("second"), path)
+    first.mark("exported")
+    second.mark("exported")
+
+    first.clear(remove_files=False)
+
+    assert script_main.RunCheckpoint(make_account("first"), path).first_incomplete() == "exported"
+    assert script_main.RunCheckpoint(make_account("second"), path).done("exported")
+
+
+def fail_if_called(name):
+    def fail(*args, **kwargs):
+        raise AssertionError(f"{name} must not run on a resumed run")
+    return fail
+
+
+def test_resume_with_a_fresh_download_skips_the_export(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "CHECKPOINT_PATH", str(tmp_path / "run_checkpoint.json"))
+    monkeypatch.setattr(script_main, "INCREMENTAL_SYNC", False)
+    monkeypatch.setattr(script_main, "MATCH_CACHE_PATH", None)
+    monkeypatch.setattr(script_main, "METRICS_REPORT_PATH", None)
+    monkeypatch.setattr(script_main, "OVERLAP_LETTERBOXD_LOGIN", False)
+    monkeypatch.setattr(script_main, "IMPORT_CHUNK_SIZE", 0)
+    for name in ("login_to_imdb", "initiate_imdb_export", "monitor_imdb_export_status", "monitor_imdb_exports"):
+        monkeypatch.setattr(script_main, name, fail_if_called(name))
+    monkeypatch.setattr(script_main, "login_to_letterboxd", lambda driver, account: True)
+    uploads = []
+
+    def import_to_letterboxd(driver, csv_path, **kwargs):
+        with open(csv_path, encoding="utf-8") as f:
+            uploads.append(f.read())
+        return True
+
+    monkeypatch.setattr(script_main, "import_to_letterboxd", import_to_letterboxd)
+    account = script_main.replace(make_account("default"), download_dir=str(tmp_path / "downloads"))
+    os.makedirs(account.download_dir)
+    kept_file = os.path.join(account.download_dir, "ratings.csv")
+    script_main.write_synthetic_export(kept_file, 20)
+    checkpoint = script_main.RunCheckpoint(account, script_main.CHECKPOINT_PATH)
+    checkpoint.mark("exported")
+    checkpoint.mark("downloaded", kept_file)
+
+    assert script_main.sync_account(object(), account, resume=True)
+
+    assert len(uploads) == 1 and "tt0000000" in uploads[0]
+    assert not os.path.exists(kept_file)
+    assert script_main.RunCheckpoint(account, script_main.CHECKPOINT_PATH).stages == {}
+
+
+def test_batch_resume_only_continues_failed_accounts(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "CHECKPOINT_PATH", str(tmp_path / "run_checkpoint.json"))
+    manifest = tmp_path / "accounts.json"
+    manifest.write_text(json.dumps([
+        {"name": name, "imdb_email": f"{name}@example.com", "imdb_password": "secret", "letterboxd_email": f"{name}@example.com",
+         "letterboxd_password": "secret", "imdb_user_id": "ur0000000"} for name in ("first", "second", "third")
+    ]), encoding="utf-8")
+    script_main.RunCheckpoint(make_account("second"), script_main.CHECKPOINT_PATH).mark("exported")
+    resumed = []
+
+    def run_account_in_pool(pool, account, resume=False):
+        resumed.append((account.name, resume))
+        return script_main.AccountResult(account.name, True, 0.0)
+
+    monkeypatch.setattr(script_main, "run_account_in_pool", run_account_in_pool)
+
+    results = script_main.run_batch(str(manifest), pool_size=2, resume=True)
+
+    assert resumed == [("second", True)]
+    assert [result.name for result in results] == ["second"]
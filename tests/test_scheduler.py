@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import script_main
+
+
+class FakeClock:
+    """A clock that only moves when something sleeps or a job takes time."""
+
+    def __init__(self, start):
+        self.current = start
+        self.asleep_for = timedelta(0)
+
+    def now(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += timedelta(seconds=seconds) + self.asleep_for
+        self.asleep_for = timedelta(0)
+
+
+def run_schedule(tmp_path, expression, start, durations, max_runs, asleep_for=timedelta(0)):
+    clock = FakeClock(start)
+    clock.asleep_for = asleep_for
+    started = []
+
+    def job():
+        started.append(clock.now())
+        clock.current += durations[min(len(started), len(durations)) - 1]
+
+    scheduler = script_main.Scheduler(
+        script_main.CronSchedule(expression), job, jitter=0, lock_path=str(tmp_path / "sync.lock"), now=clock.now, sleep=clock.sleep,
+    )
+    assert scheduler.run(max_runs) == max_runs
+    return started
+
+
+@pytest.mark.parametrize("expression, moment, expected", [
+    ("0 10 * * *", datetime(2026, 3, 1, 9, 0), datetime(2026, 3, 1, 10, 0)),
+    ("0 10 * * *", datetime(2026, 3, 1, 10, 0), datetime(2026, 3, 2, 10, 0)),
+    ("*/15 * * * *", datetime(2026, 3, 1, 9, 7, 30), datetime(2026, 3, 1, 9, 15)),
+    ("30 6 * * 1-5", datetime(2026, 3, 6, 7, 0), datetime(2026, 3, 9, 6, 30)),  # Friday to Monday
+    ("0 0 13 * 5", datetime(2026, 3, 1, 0, 0), datetime(2026, 3, 6, 0, 0)),  # Day of month or Friday
+    ("0 0 * * 7", datetime(2026, 3, 2, 0, 0), datetime(2026, 3, 8, 0, 0)),  # 7 is Sunday
+    ("@monthly", datetime(2026, 12, 15, 12, 0), datetime(2027, 1, 1, 0, 0)),
+    ("0 12 29 2 *", datetime(2026, 3, 1, 0, 0), datetime(2028, 2, 29, 12, 0)),
+])
+def test_next_after(expression, moment, expected):
+    assert script_main.CronSchedule(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize("expression", ["0 10 * *", "60 * * * *", "0 0 31 2 *"])
+def test_invalid_or_impossible_expressions(expression):
+    with pytest.raises(ValueError):
+        script_main.CronSchedule(expression).next_after(datetime(2026, 1, 1))
+
+
+def test_runs_on_schedule(tmp_path):
+    started = run_schedule(tmp_path, "0 * * * *", datetime(2026, 3, 1, 9, 30), [timedelta(minutes=5)], 3)
+
+    assert started == [datetime(2026, 3, 1, 10, 0), datetime(2026, 3, 1, 11, 0), datetime(2026, 3, 1, 12, 0)]
+
+
+def test_times_missed_during_a_run_get_one_catch_up_run(tmp_path):
+    durations = [timedelta(minutes=150), timedelta(minutes=1)]
+    started = run_schedule(tmp_path, "0 * * * *", datetime(2026, 3, 1, 9, 30), durations, 3)
+
+    # 11:00 and 12:00 passed during the first run and are coalesced into one run at 12:30
+    assert started == [datetime(2026, 3, 1, 10, 0), datetime(2026, 3, 1, 12, 30), datetime(2026, 3, 1, 13, 0)]
+
+
+def test_times_missed_while_asleep_are_covered_by_the_run_on_waking(tmp_path):
+    started = run_schedule(
+        tmp_path, "0 * * * *", datetime(2026, 3, 1, 9, 30), [timedelta(minutes=1)], 2, asleep_for=timedelta(hours=3),
+    )
+
+    assert started == [datetime(2026, 3, 1, 12, 31), datetime(2026, 3, 1, 13, 0)]  # Woke a minute into the sleep, 3 hours later
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+import script_main
+from test_state_files import run_concurrently
+
+fernet = pytest.importorskip("cryptography.fernet")
+
+
+@pytest.fixture(autouse=True)
+def session_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "SESSION_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv(script_main.SESSION_CACHE_KEY_ENV, raising=False)
+    return tmp_path
+
+
+def test_accounts_starting_together_share_one_key(session_cache_dir):
+    ciphers = [None] * 8
+
+    def get_cipher(index):
+        ciphers[index] = script_main.get_session_cipher()
+
+    assert run_concurrently(get_cipher, len(ciphers)) == []
+    token = ciphers[0].encrypt(b"cookies")
+    assert all(cipher.decrypt(token) == b"cookies" for cipher in ciphers)
+    assert os.listdir(session_cache_dir) == ["session.key"]
+
+
+def test_corrupt_key_file_disables_the_cache(session_cache_dir):
+    (session_cache_dir / "session.key").write_bytes(b"")
+
+    assert script_main.get_session_cipher() is None
+
+
+def test_invalid_key_in_the_environment_disables_the_cache(monkeypatch):
+    monkeypatch.setenv(script_main.SESSION_CACHE_KEY_ENV, "not-a-key")
+
+    assert script_main.get_session_cipher() is None
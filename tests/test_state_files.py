@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+
+import script_main
+
+
+def make_account(name):
+    return script_main.AccountConfig(name, "imdb@example.com", "secret", "letterboxd@example.com", "secret", "ur0000000")
+
+
+def run_concurrently(target, count):
+    errors = []
+    start = threading.Barrier(count)
+
+    def run(index):
+        try:
+            start.wait()
+            target(index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_concurrent_chunk_progress_is_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "IMPORT_PROGRESS_PATH", str(tmp_path / "import_progress.json"))
+    accounts = [make_account(f"account{i}") for i in range(8)]
+
+    def import_chunks(index):
+        for chunk in range(5):
+            script_main.mark_chunk_imported(accounts[index], f"chunk{chunk}")
+
+    assert run_concurrently(import_chunks, len(accounts)) == []
+    for account in accounts:
+        assert script_main.load_import_progress(account) == {f"chunk{chunk}" for chunk in range(5)}
+    assert os.listdir(tmp_path) == ["import_progress.json"]
+
+
+def test_concurrent_export_durations_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "EXPORT_HISTORY_PATH", str(tmp_path / "export_history.json"))
+    accounts = [make_account(f"account{i}") for i in range(8)]
+
+    assert run_concurrently(lambda index: script_main.record_export_duration(accounts[index], 30 + index), len(accounts)) == []
+    for index, account in enumerate(accounts):
+        assert script_main.load_export_history(account) == [30 + index]
+
+
+def test_concurrent_import_speeds_are_kept(tmp_path, monkeypatch):
+    path = tmp_path / "import_throughput.json"
+    monkeypatch.setattr(script_main, "IMPORT_THROUGHPUT_PATH", str(path))
+
+    assert run_concurrently(lambda index: script_main.record_import_throughput("matching", 100, 1 + index), 8) == []
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)["matching"]) == 8
@@ -0,0 +1,53 @@
+import pytest
+
+import script_main
+
+
+def test_timed_sleeps_are_reported_apart_from_humanization():
+    engine = script_main.WaitEngine(budget=0)
+
+    engine.sleep(0.05)
+    engine.sleep(0.05)
+    engine.pause(1, 2)  # Over the budget, so skipped
+    report = engine.report()
+
+    assert report["sleeps"] == 2
+    assert 0.1 <= report["sleep_seconds"] < 0.5
+    assert report["humanization_seconds"] == 0
+
+
+def test_export_backoff_goes_through_the_run_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(script_main, "EXPORT_POLL_TIMEOUT", 0.3)
+    monkeypatch.setattr(script_main, "find_ready_export_button", lambda driver: None)
+    monkeypatch.setattr(script_main, "fetch_export_status", lambda driver: "PENDING")
+    account = script_main.AccountConfig("default", "imdb@example.com", "secret", "letterboxd@example.com", "secret", "ur0000000",
+                                        download_dir=str(tmp_path))
+    engine = script_main.WaitEngine()
+    token = script_main.current_wait_engine.set(engine)
+    try:
+        assert script_main.poll_export_until_ready(object(), account, "http://imdb.invalid/exports/", script_main.FixedPollStrategy()) is None
+    finally:
+        script_main.current_wait_engine.reset(token)
+
+    assert engine.sleeps >= 1
+    assert engine.sleep_seconds >= 0.25
+
+
+def test_waits_work_before_selenium_is_loaded():
+    # A run loads Selenium when it starts the browser, a wait before that must not depend on it
+    if script_main.webdriver is not None:
+        pytest.skip("Selenium was loaded by another test")
+    engine = script_main.WaitEngine()
+    attempts = iter([KeyError("not ready"), None, "ready"])
+
+    def condition():
+        result = next(attempts)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with pytest.raises(KeyError):
+        engine.until(condition, timeout=1, poll_interval=0.01)
+    assert engine.until(condition, timeout=1, poll_interval=0.01) == "ready"
+    with pytest.raises(script_main.TimeoutException):
+        engine.until(lambda: None, timeout=0.05, poll_interval=0.01)